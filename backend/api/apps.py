@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Compile (et valide) la matrice des rôles au démarrage plutôt qu'à la première requête
+        from . import permissions  # noqa: F401
+        # Signaux du registre des règles Berry (rechargé quand une version est publiée)
+        from .services import berry_rules  # noqa: F401
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import LazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# Claims ajoutés au jeton d'accès par api.serializers.add_user_claims
+CLAIM_ATTRIBUTES = ('role', 'member_id', 'is_superuser')
+
+
+class ClaimsUser(LazyObject):
+    """
+    Utilisateur construit à partir des claims du jeton, sans requête en base.
+
+    `id`, `pk`, `role`, `member_id` et `is_superuser` sont lus dans le jeton.
+    Tout autre attribut (nom, email, has_perm, save...) charge la ligne User
+    à la première utilisation, comme request.user de Django. Rôle et statut
+    actif restent ceux du jeton jusqu'à son expiration (ACCESS_TOKEN_LIFETIME) :
+    le renouvellement relit la ligne User et refuse un compte désactivé.
+    """
+
+    def __init__(self, validated_token):
+        super().__init__()
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        # Écriture directe dans __dict__ : LazyObject.__setattr__ chargerait l'objet
+        self.__dict__.update({
+            'id': user_id,
+            'pk': user_id,
+            'is_active': True,
+            'is_authenticated': True,
+            'is_anonymous': False,
+            **{claim: validated_token[claim] for claim in CLAIM_ATTRIBUTES},
+        })
+
+    def _setup(self):
+        self._set_wrapped(User.objects.get(pk=self.__dict__['pk']))
+
+    async def aload(self):
+        """Charge la ligne User depuis une vue asynchrone."""
+        if self._wrapped is empty:
+            self._set_wrapped(await User.objects.aget(pk=self.__dict__['pk']))
+        return self._wrapped
+
+    def _set_wrapped(self, user):
+        self._wrapped = user
+        # Une fois chargé, l'objet réel fait foi (ex. rôle modifié pendant la requête)
+        for claim in ('id', 'pk', 'is_active', *CLAIM_ATTRIBUTES):
+            self.__dict__.pop(claim, None)
+
+    def __bool__(self):
+        # IsAuthenticated teste `request.user and ...` : ne pas charger la ligne pour ça
+        return True
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def has_user_claims(validated_token):
+    return all(claim in validated_token for claim in CLAIM_ATTRIBUTES)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans requête User par appel.
+    Les jetons émis avant l'ajout des claims retombent sur le chargement classique.
+    """
+
+    def get_user(self, validated_token):
+        if not has_user_claims(validated_token):
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise AuthenticationFailed('Le jeton ne contient pas d\'identifiant utilisateur.')
+        return ClaimsUser(validated_token)
@@ -0,0 +1,75 @@
+"""
+Contrôle de concurrence optimiste pour les objets versionnés (Member, LoanRequest,
+Sanction, Vote : voir VersionedModel).
+
+Les réponses portent un ETag construit sur la version de la ligne ; une
+modification doit renvoyer cet ETag dans If-Match. La sauvegarde est alors un
+seul `UPDATE ... WHERE version = n` : si quelqu'un a modifié l'objet entre-temps,
+aucune ligne n'est touchée et le client reçoit 412, sans verrou posé en base.
+"""
+import re
+
+from rest_framework.exceptions import APIException
+
+from .models import StaleVersionError
+
+ETAG_PATTERN = re.compile(r'^(?:W/)?"v(\d+)"$')
+
+
+class PreconditionRequired(APIException):
+    status_code = 428
+    default_detail = "En-tête If-Match requis : relisez l'objet et renvoyez son ETag."
+    default_code = 'precondition_required'
+
+
+class PreconditionFailed(APIException):
+    status_code = 412
+    default_detail = "L'objet a été modifié entre-temps : rechargez-le avant de réessayer."
+    default_code = 'precondition_failed'
+
+
+def format_etag(version):
+    return f'"v{version}"'
+
+
+def expected_version(request):
+    """
+    Version attendue d'après If-Match : 428 si l'en-tête manque, 412 s'il ne
+    désigne aucune version. `*` (toute version) retourne None : pas de condition.
+    """
+    header = request.headers.get('If-Match', '').strip()
+    if not header:
+        raise PreconditionRequired()
+    if header == '*':
+        return None
+    for tag in header.split(','):
+        match = ETAG_PATTERN.match(tag.strip())
+        if match:
+            return int(match.group(1))
+    raise PreconditionFailed()
+
+
+class VersionedObjectMixin:
+    """
+    Vues de détail d'un objet versionné : ETag sur les réponses, If-Match
+    obligatoire en PUT/PATCH, 412 si la version a changé.
+    """
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.request.method in ('PUT', 'PATCH'):
+            obj.expected_version = expected_version(self.request)
+        return obj
+
+    def perform_update(self, serializer):
+        try:
+            super().perform_update(serializer)
+        except StaleVersionError:
+            raise PreconditionFailed()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        data = getattr(response, 'data', None)
+        if response.status_code < 300 and isinstance(data, dict) and 'version' in data:
+            response['ETag'] = format_etag(data['version'])
+        return response
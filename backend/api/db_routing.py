@@ -0,0 +1,177 @@
+"""
+Lectures sur réplique (optionnelle : DATABASE_REPLICA_URL).
+
+Les lectures des requêtes GET/HEAD/OPTIONS et des commandes de rapport
+(read_from_replica()) vont sur l'alias 'replica' ; tout le reste, et toutes les
+écritures, sur la base principale. Pour qu'un utilisateur relise ce qu'il vient
+d'écrire malgré le retard de réplication, ses requêtes restent sur la principale
+pendant REPLICA_STICKY_SECONDS après une écriture (marque dans le cache).
+
+Sans réplique configurée, tout va sur 'default' et le middleware ne fait rien.
+"""
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+PRIMARY = DEFAULT_DB_ALIAS
+REPLICA = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReadState:
+    """
+    Cible des lectures du contexte courant. Objet mutable : une écriture faite
+    dans un thread sync_to_async bascule aussi la suite de la requête sur la principale.
+    """
+    __slots__ = ('use_replica', 'wrote')
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+_read_state = ContextVar('db_read_state', default=None)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica():
+    """Lectures du bloc sur la réplique (commandes de rapport, tâches en lecture seule)."""
+    token = _read_state.set(ReadState(replica_configured()))
+    try:
+        yield
+    finally:
+        _read_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _read_state.get()
+        # Dans une transaction, on lit la principale : la réplique ne voit pas les lignes non validées
+        if state is not None and state.use_replica and not connections[PRIMARY].in_atomic_block:
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _read_state.get()
+        if state is not None:
+            state.use_replica = False
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Mêmes données des deux côtés
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplique reçoit le schéma par réplication
+        return db != REPLICA
+
+
+# ----------------------------------------------------------------------
+# Lecture de ses propres écritures
+# ----------------------------------------------------------------------
+
+def _pin_key(user_id):
+    return f'db-primary-pin:{user_id}'
+
+
+def _pin_cache():
+    return caches[getattr(settings, 'REPLICA_PIN_CACHE', 'default')]
+
+
+def request_user_id(request):
+    """Utilisateur de la requête, sans accès base : claim du JWT, sinon session."""
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Bearer '):
+        try:
+            return AccessToken(header[7:]).get(jwt_settings.USER_ID_CLAIM)
+        except TokenError:
+            return None
+    if settings.SESSION_COOKIE_NAME in request.COOKIES and hasattr(request, 'session'):
+        return request.session.get(SESSION_KEY)
+    return None
+
+
+def _stream_with_state(state, chunks):
+    token = _read_state.set(state)
+    try:
+        yield from chunks
+    finally:
+        with suppress(ValueError):
+            _read_state.reset(token)
+
+
+async def _astream_with_state(state, chunks):
+    token = _read_state.set(state)
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        with suppress(ValueError):
+            _read_state.reset(token)
+
+
+class ReplicaRoutingMiddleware:
+    """Choisit la cible des lectures de la requête et pose la marque après une écriture."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_configured():
+            return self.get_response(request)
+
+        user_id = request_user_id(request)
+        pinned = user_id is not None and _pin_cache().get(_pin_key(user_id))
+        state = ReadState(request.method in SAFE_METHODS and not pinned)
+        token = _read_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_state.reset(token)
+        if (state.wrote or request.method not in SAFE_METHODS) and user_id is not None:
+            _pin_cache().set(_pin_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+        if response.streaming:
+            # Le contenu est lu après la sortie du middleware
+            response.streaming_content = _stream_with_state(state, response.streaming_content)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_configured():
+            return await self.get_response(request)
+
+        user_id = request_user_id(request)
+        pinned = user_id is not None and await _pin_cache().aget(_pin_key(user_id))
+        state = ReadState(request.method in SAFE_METHODS and not pinned)
+        token = _read_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_state.reset(token)
+        if (state.wrote or request.method not in SAFE_METHODS) and user_id is not None:
+            await _pin_cache().aset(_pin_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+        if response.streaming:
+            response.streaming_content = (
+                _astream_with_state(state, response.streaming_content) if response.is_async
+                else _stream_with_state(state, response.streaming_content)
+            )
+        return response
@@ -0,0 +1,153 @@
+"""
+Journalisation non bloquante et structurée.
+
+Les threads de requête ne font qu'ajouter l'enregistrement à une file en
+mémoire (QueueLogHandler) ; un QueueListener, dans son propre thread, l'écrit
+sur la console et dans un fichier à rotation par taille, au format JSON.
+RedactionFilter masque les secrets (mots de passe, jetons) avant la mise en file.
+
+Configuré par settings.LOGGING. Le listener démarre à la configuration du
+logging : avec gunicorn, dans chaque worker (ne pas utiliser preload_app).
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+from datetime import datetime, timezone
+
+REDACTED = '[REDACTED]'
+
+# Attributs standard d'un LogRecord : tout le reste vient de `extra=`
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+SENSITIVE_KEY = re.compile(r'pass(word|wd)?|mot_de_passe|secret|token|authorization|api_?key|verification_code|otp', re.IGNORECASE)
+SENSITIVE_PATTERNS = (
+    # « mot de passe: xxx », « password=xxx », « token : xxx »...
+    (re.compile(r'(?i)\b(mot de passe|password|passwd|secret|token|api[_ ]?key)(\s*[:=]\s*|\s+est\s*:?\s*)(\S+)'), rf'\1\2{REDACTED}'),
+    (re.compile(r'(?i)\bBearer\s+[\w\-.~+/]+=*'), f'Bearer {REDACTED}'),
+    # JWT (en-tête.charge.signature)
+    (re.compile(r'\beyJ[\w-]+\.[\w-]+\.[\w-]+'), REDACTED),
+)
+
+
+def redact_text(text):
+    for pattern, replacement in SENSITIVE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def redact_value(key, value):
+    """Masque la valeur si la clé est sensible ; parcourt les dictionnaires imbriqués."""
+    if SENSITIVE_KEY.search(str(key)):
+        return REDACTED
+    if isinstance(value, dict):
+        return {k: redact_value(k, v) for k, v in value.items()}
+    return value
+
+
+class RedactionFilter(logging.Filter):
+    """Masque les secrets du message, de ses arguments et des champs `extra`."""
+
+    def filter(self, record):
+        if isinstance(record.args, dict):
+            record.args = redact_value('', record.args)
+        message = record.getMessage()
+        redacted = redact_text(message)
+        if redacted != message:
+            record.msg, record.args = redacted, None
+        for key in set(vars(record)) - RESERVED_ATTRS:
+            setattr(record, key, redact_value(key, getattr(record, key)))
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement, champs `extra` compris."""
+
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'process': record.process,
+        }
+        for key in sorted(set(vars(record)) - RESERVED_ATTRS):
+            payload[key] = getattr(record, key)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        if record.stack_info:
+            payload['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class ExcludeLoggersFilter(logging.Filter):
+    def __init__(self, names):
+        super().__init__()
+        self.names = tuple(names)
+
+    def filter(self, record):
+        return not any(record.name == name or record.name.startswith(f'{name}.') for name in self.names)
+
+
+class QueueLogHandler(logging.handlers.QueueHandler):
+    """
+    Met les enregistrements en file ; le listener associé les écrit sur la
+    console (sauf `console_exclude`) et, si `filename`, dans un fichier à rotation.
+    """
+
+    def __init__(self, filename=None, max_bytes=10 * 1024 * 1024, backup_count=5, file_level=logging.INFO,
+                 console=True, console_format='json', console_exclude=()):
+        super().__init__(queue.SimpleQueue())
+        targets = []
+        if console:
+            console_handler = logging.StreamHandler(sys.stderr)
+            console_handler.setFormatter(
+                JsonFormatter() if console_format == 'json'
+                else logging.Formatter('{levelname} {asctime} {module}: {message}', style='{')
+            )
+            if console_exclude:
+                console_handler.addFilter(ExcludeLoggersFilter(console_exclude))
+            targets.append(console_handler)
+        if filename:
+            file_handler = logging.handlers.RotatingFileHandler(
+                filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True,
+            )
+            file_handler.setLevel(file_level)
+            file_handler.setFormatter(JsonFormatter())
+            targets.append(file_handler)
+
+        self.targets = targets
+        self.listener = logging.handlers.QueueListener(self.queue, *targets, respect_handler_level=True)
+        self.listener.start()
+        # Vide la file à l'arrêt du processus
+        atexit.register(self.stop)
+
+    def prepare(self, record):
+        """
+        Fige le message (arguments %-style appliqués ici, une seule fois) et la
+        trace d'exception ; le formatage JSON se fait dans le thread du listener.
+        """
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(vars(record))
+        record.msg, record.args, record.exc_info = message, None, None
+        record.message = message
+        return record
+
+    def stop(self):
+        """Écrit les enregistrements en attente puis arrête le listener (idempotent)."""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        for target in self.targets:
+            target.close()
+
+    def close(self):
+        self.stop()
+        super().close()
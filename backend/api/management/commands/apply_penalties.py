@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from api.models import PenaltyAssessment
+from api.services.penalty_service import PenaltyService
+
+
+def _parse_day(value, option):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise CommandError(f'{option} : date invalide (format AAAA-MM-JJ).')
+    return day
+
+
+class Command(BaseCommand):
+    help = (
+        "Applique les pénalités automatiques : contributions en retard (par membre et par mois) et "
+        "prêts échus non remboursés (par membre, chaque mois de retard). Sans effet sur ce qui est déjà pénalisé."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--as-of', help="Date de référence AAAA-MM-JJ (défaut : aujourd'hui).")
+        parser.add_argument('--since', help='Ignore les contributions antérieures à cette date (AAAA-MM-JJ).')
+        parser.add_argument('--dry-run', action='store_true', help='Compte les pénalités dues sans rien écrire.')
+
+    def handle(self, *args, **options):
+        as_of = _parse_day(options['as_of'], '--as-of') if options['as_of'] else None
+        since = _parse_day(options['since'], '--since') if options['since'] else None
+
+        summary = PenaltyService.apply(as_of=as_of, since=since, dry_run=options['dry_run'])
+        labels = dict(PenaltyAssessment.RULES)
+        for rule, count in summary.counts.items():
+            self.stdout.write(f'{labels[rule]:<34}{count:>8} membre(s)-mois{summary.amounts[rule]:>14}')
+        verb = 'à appliquer' if summary.dry_run else 'appliquée(s)'
+        self.stdout.write(self.style.SUCCESS(f'{summary.total} pénalité(s) {verb} au {summary.as_of}'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import Contribution, LoanRequest, TransactionLog, Sanction
+from api.services.ledger_service import LedgerService
+
+
+class Command(BaseCommand):
+    help = (
+        "Passe au journal les contributions, prêts, transactions et amendes existants. "
+        "Sans effet sur les objets déjà comptabilisés : la commande peut être relancée."
+    )
+
+    def handle(self, *args, **options):
+        sources = (
+            ('contributions', Contribution.objects.order_by('pk'), LedgerService.post_contribution),
+            ('prêts', LoanRequest.objects.order_by('pk'), LedgerService.post_loan_disbursement),
+            ('transactions', TransactionLog.objects.order_by('pk'), LedgerService.post_transaction),
+            ('amendes', Sanction.objects.filter(type='Amende').order_by('pk'), LedgerService.post_fine),
+        )
+        for label, queryset, post in sources:
+            count = 0
+            with transaction.atomic():
+                for obj in queryset.iterator(chunk_size=500):
+                    post(obj)
+                    count += 1
+            self.stdout.write(f'{count} {label} traités')
+
+        balance = LedgerService.trial_balance()
+        style = self.style.SUCCESS if balance['balanced'] else self.style.ERROR
+        self.stdout.write(style(f"Balance : débit {balance['total_debit']}, crédit {balance['total_credit']}"))
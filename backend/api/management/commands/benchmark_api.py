@@ -0,0 +1,219 @@
+import io
+import json
+import platform
+import statistics
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from api.models import Contribution, LoanRequest, Sanction, Vote
+from api.serializers import ClaimsTokenObtainPairSerializer
+from api.services.request_metrics import RequestTiming
+from api.services.synthetic_data import SyntheticDataGenerator
+
+User = get_user_model()
+
+BENCHMARK_PREFIX = 'bench-'
+FORMAT_VERSION = 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure latence et nombre de requêtes SQL de chaque endpoint de lecture (listes, détails, "
+        "tableau de bord, rapports) et de recalculate_berry_points, sur des associations synthétiques "
+        "de plusieurs tailles. Les données sont créées dans une transaction annulée à la fin de chaque taille. "
+        "Le résultat JSON peut être comparé à une exécution précédente (--baseline)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[100, 10_000, 100_000], help='Nombres de membres à tester.')
+        parser.add_argument('--months', type=int, default=12, help='Mois de contributions par membre.')
+        parser.add_argument('--repeat', type=int, default=5, help='Mesures par endpoint (hors requête de chauffe).')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Fichier JSON des résultats.')
+        parser.add_argument('--baseline', help="Résultats JSON d'une exécution précédente, à comparer.")
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Hausse de latence médiane tolérée (0.2 = +20 %%).')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Échoue si une régression est détectée.')
+        parser.add_argument('--skip-commands', action='store_true', help='Ne mesure pas recalculate_berry_points.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat doit être positif.')
+        baseline = self._load_baseline(options['baseline']) if options['baseline'] else None
+
+        results = {
+            'format': FORMAT_VERSION,
+            'started_at': timezone.now().isoformat(),
+            'database': connections['default'].vendor,
+            'python': platform.python_version(),
+            'repeat': options['repeat'],
+            'months': options['months'],
+            'scales': {},
+        }
+        # Les clients de test s'annoncent comme 'testserver' ; un dépassement de budget est mesuré, pas levé
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], QUERY_BUDGET_STRICT=False):
+            for scale in options['scales']:
+                results['scales'][str(scale)] = self._run_scale(scale, options)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Résultats écrits dans {options['output']}"))
+
+        if baseline is not None:
+            regressions = self._compare(baseline, results, options['tolerance'])
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'{len(regressions)} régression(s) : ' + ', '.join(regressions))
+        return None
+
+    # ------------------------------------------------------------------
+    # Mesures
+    # ------------------------------------------------------------------
+
+    def _run_scale(self, scale, options):
+        self.stdout.write(self.style.SUCCESS(f'--- {scale} membres ---'))
+        with transaction.atomic():
+            start = time.perf_counter()
+            summary = SyntheticDataGenerator(
+                scale, months=options['months'], seed=options['seed'], prefix=BENCHMARK_PREFIX,
+            ).generate()
+            generation = time.perf_counter() - start
+            admin = User.objects.create(username=f'{BENCHMARK_PREFIX}admin', role='admin', is_staff=True, is_superuser=True)
+            self.stdout.write(f'Génération : {generation:.1f} s {summary.as_dict()}')
+
+            result = {
+                'rows': summary.as_dict(),
+                'generation_s': round(generation, 3),
+                'endpoints': self._bench_endpoints(admin, summary, options['repeat']),
+                'commands': {} if options['skip_commands'] else self._bench_commands(),
+            }
+            # Rien n'est conservé : chaque taille repart de la base d'origine
+            transaction.set_rollback(True)
+        return result
+
+    def _endpoints(self, summary):
+        member_id = summary.member_ids[0]
+        loan = LoanRequest.objects.filter(member__user__username__startswith=BENCHMARK_PREFIX).order_by('pk').first()
+        contribution = Contribution.objects.filter(member_id=member_id).order_by('pk').first()
+        vote = Vote.objects.filter(title__startswith=BENCHMARK_PREFIX).order_by('pk').first()
+        sanction = Sanction.objects.filter(member__user__username__startswith=BENCHMARK_PREFIX).order_by('pk').first()
+        last_month = (timezone.localdate().replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
+
+        endpoints = [
+            ('member-list', []), ('member-detail', [member_id]),
+            ('contribution-list', []), ('loanrequest-list', []),
+            ('vote-list', []), ('sanction-list', []),
+            ('transactionlog-list', []), ('committee-list', []), ('user-list', []),
+            ('dashboard-stats', []), ('user-profile', []), ('berry_score', [member_id]),
+            ('trial-balance', []), ('period-report', [last_month]), ('fund-history', []),
+        ]
+        for name, obj in (('contribution-detail', contribution), ('loanrequest-detail', loan),
+                          ('vote-detail', vote), ('sanction-detail', sanction)):
+            if obj is not None:
+                endpoints.append((name, [obj.pk]))
+        return endpoints
+
+    def _bench_endpoints(self, user, summary, repeat):
+        client = Client()
+        # Jeton tel qu'émis à la connexion (avec les claims : pas de lecture de l'utilisateur)
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        headers = {'Authorization': f'Bearer {token}'}
+        results = {}
+        self.stdout.write(f"{'Endpoint':<28}{'p50 ms':>10}{'p95 ms':>10}{'SQL':>6}{'Ko':>10}")
+        for name, args in self._endpoints(summary):
+            url = reverse(name, args=args)
+            client.get(url, headers=headers)  # chauffe (caches, compilation des requêtes)
+            durations = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = client.get(url, headers=headers)
+                durations.append((time.perf_counter() - start) * 1000)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+            if response.status_code != 200:
+                raise CommandError(f'{url} a répondu {response.status_code}')
+
+            row = {
+                'url': url,
+                'status': response.status_code,
+                'queries': response.wsgi_request.request_timing.queries,
+                'bytes': len(body),
+                **_latency_stats(durations),
+            }
+            results[f'GET {name}'] = row
+            self.stdout.write(f"{name:<28}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['queries']:>6}{row['bytes'] / 1024:>10.1f}")
+        return results
+
+    def _bench_commands(self):
+        results = {}
+        for name in ('recalculate_berry_points',):
+            timing = RequestTiming()
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timing))
+                call_command(name, stdout=io.StringIO())
+            timing.stop()
+            results[name] = {'duration_ms': round(timing.total_time * 1000, 2), 'queries': timing.queries}
+            self.stdout.write(f"{name:<28}{results[name]['duration_ms']:>10.1f} ms {timing.queries:>8} requêtes SQL")
+        return results
+
+    # ------------------------------------------------------------------
+    # Comparaison
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_baseline(path):
+        try:
+            with open(path, encoding='utf-8') as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Référence illisible ({path}) : {exc}')
+
+    def _compare(self, baseline, results, tolerance):
+        """Affiche les écarts avec la référence et retourne les régressions détectées."""
+        regressions = []
+        self.stdout.write(self.style.SUCCESS('--- Comparaison avec la référence ---'))
+        for scale, current in results['scales'].items():
+            previous = baseline.get('scales', {}).get(scale)
+            if previous is None:
+                self.stdout.write(f'{scale} membres : absent de la référence')
+                continue
+            measures = [(key, row['p50_ms'], row['queries'], previous['endpoints'].get(key))
+                        for key, row in current['endpoints'].items()]
+            measures += [(key, row['duration_ms'], row['queries'], previous.get('commands', {}).get(key))
+                         for key, row in current['commands'].items()]
+            for key, duration, queries, before in measures:
+                if before is None:
+                    continue
+                before_duration = before.get('p50_ms', before.get('duration_ms'))
+                ratio = duration / before_duration if before_duration else 1.0
+                slower = ratio > 1 + tolerance
+                more_queries = queries > before['queries']
+                line = f"{scale:>7} {key:<34}{before_duration:>10.1f} -> {duration:>8.1f} ms ({ratio - 1:+.0%})  SQL {before['queries']} -> {queries}"
+                if slower or more_queries:
+                    regressions.append(f'{key} @ {scale}')
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('Aucune régression.'))
+        return regressions
+
+
+def _latency_stats(durations):
+    ordered = sorted(durations)
+    return {
+        'p50_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'min_ms': round(ordered[0], 3),
+        'max_ms': round(ordered[-1], 3),
+    }
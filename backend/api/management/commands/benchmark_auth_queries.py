@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import Member, Vote
+from api.serializers import ClaimsTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compte les requêtes SQL par appel API avec un jeton JWT classique (chargement du User) '
+        'puis avec un jeton portant les claims rôle/membre/superuser.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help="Utilisateur au nom duquel les requêtes sont faites (défaut : premier membre).")
+
+    def handle(self, *args, **options):
+        # Le client de test s'annonce comme 'testserver'
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            self._benchmark(options)
+
+    def _benchmark(self, options):
+        user = self._get_user(options['username'])
+        legacy_token = AccessToken.for_user(user)
+        claims_token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+
+        urls = [
+            reverse('member-list'),
+            reverse('contribution-list'),
+            reverse('loanrequest-list'),
+            reverse('transactionlog-list'),
+            reverse('meeting-list'),
+            reverse('vote-list'),
+            reverse('sanction-list'),
+            reverse('dashboard-stats'),
+            reverse('user-profile'),
+        ]
+        member = Member.objects.first()
+        if member is not None:
+            urls.append(reverse('berry_score', args=[member.id]))
+        vote = Vote.objects.first()
+        if vote is not None:
+            urls.append(reverse('vote-detail', args=[vote.id]))
+
+        self.stdout.write(self.style.SUCCESS(f'Requêtes SQL par appel, utilisateur {user.username}'))
+        self.stdout.write(f"{'Endpoint':<40}{'Avant':>8}{'Après':>8}{'Gain':>8}")
+        for url in urls:
+            before = self._count_queries(url, legacy_token)
+            after = self._count_queries(url, claims_token)
+            self.stdout.write(f'{url:<40}{before:>8}{after:>8}{before - after:>8}')
+
+    def _get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"Utilisateur '{username}' introuvable.")
+        member = Member.objects.select_related('user').first()
+        if member is None:
+            raise CommandError('Aucun membre en base : créez des données avant de lancer le benchmark.')
+        return member.user
+
+    def _count_queries(self, url, token):
+        client = Client()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, headers={'Authorization': f'Bearer {token}'})
+        if response.status_code != 200:
+            raise CommandError(f'{url} a répondu {response.status_code}')
+        return len(queries)
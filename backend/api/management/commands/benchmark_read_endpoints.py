@@ -0,0 +1,97 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import Member
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare le débit (requêtes/s) des lectures principales servies par le gestionnaire '
+        'WSGI (pool de threads) et par le gestionnaire ASGI (coroutines concurrentes).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Nombre de requêtes par endpoint et par mode.')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requêtes simultanées (threads ou coroutines).')
+        parser.add_argument('--username', help="Utilisateur au nom duquel les requêtes sont faites (défaut : premier membre).")
+
+    def handle(self, *args, **options):
+        # Les clients de test s'annoncent comme 'testserver'
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            self._benchmark(options)
+
+    def _benchmark(self, options):
+        user = self._get_user(options['username'])
+        member = Member.objects.filter(user=user).first() or Member.objects.first()
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+        urls = [
+            reverse('dashboard-stats'),
+            reverse('user-profile'),
+            reverse('vote-list'),
+            reverse('sanction-list'),
+        ]
+        if member is not None:
+            urls.append(reverse('berry_score', args=[member.id]))
+
+        total, concurrency = options['requests'], options['concurrency']
+        self.stdout.write(self.style.SUCCESS(
+            f'Benchmark : {total} requêtes par endpoint, concurrence {concurrency}, utilisateur {user.username}'
+        ))
+        self.stdout.write(f"{'Endpoint':<40}{'WSGI req/s':>14}{'ASGI req/s':>14}")
+        for url in urls:
+            wsgi_rate = self._run_wsgi(url, headers, total, concurrency)
+            asgi_rate = self._run_asgi(url, headers, total, concurrency)
+            self.stdout.write(f'{url:<40}{wsgi_rate:>14.1f}{asgi_rate:>14.1f}')
+
+    def _get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"Utilisateur '{username}' introuvable.")
+        member = Member.objects.select_related('user').first()
+        if member is None:
+            raise CommandError('Aucun membre en base : créez des données avant de lancer le benchmark.')
+        return member.user
+
+    def _run_wsgi(self, url, headers, total, concurrency):
+        def worker(count):
+            client = Client()
+            for _ in range(count):
+                response = client.get(url, headers=headers)
+                if response.status_code != 200:
+                    raise CommandError(f'{url} a répondu {response.status_code} (WSGI)')
+
+        shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, shares))
+        return total / (time.perf_counter() - start)
+
+    def _run_asgi(self, url, headers, total, concurrency):
+        async def run():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one():
+                async with semaphore:
+                    response = await client.get(url, headers=headers)
+                if response.status_code != 200:
+                    raise CommandError(f'{url} a répondu {response.status_code} (ASGI)')
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            return total / (time.perf_counter() - start)
+
+        return asyncio.run(run())
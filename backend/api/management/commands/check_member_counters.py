@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Member
+from api.services.member_counters import MemberCounterService
+
+MAX_LISTED = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Vérifie les compteurs de contributions des membres (nombre, total, dernière date, retards) "
+        "contre la table des contributions ; --repair les recalcule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--member', type=int, action='append', dest='members', help='Membre à vérifier (répétable).')
+        parser.add_argument('--repair', action='store_true', help='Corrige les compteurs en écart.')
+
+    def handle(self, *args, **options):
+        members = Member.objects.filter(pk__in=options['members']) if options['members'] else None
+        drift = MemberCounterService.find_drift(members)
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Compteurs des membres cohérents.'))
+            return
+
+        for item in drift[:MAX_LISTED]:
+            self.stdout.write(f'Membre #{item.member_id} {item.field} : {item.stored} (attendu {item.expected})')
+        if len(drift) > MAX_LISTED:
+            self.stdout.write(f'... {len(drift) - MAX_LISTED} autre(s) écart(s)')
+
+        drifted = Member.objects.filter(pk__in={item.member_id for item in drift})
+        if not options['repair']:
+            raise CommandError(f'{drifted.count()} membre(s) en écart : relancer avec --repair.')
+        repaired = MemberCounterService.repair(drifted)
+        self.stdout.write(self.style.SUCCESS(f'{repaired} membre(s) corrigé(s).'))
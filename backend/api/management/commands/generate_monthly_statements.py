@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.db_routing import read_from_replica
+from api.services.statement_service import (
+    STATEMENT_FORMATS, MonthlyStatementService, parse_period, previous_month,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère les relevés mensuels (HTML/PDF) de tous les membres dans MEDIA_ROOT/statements/. "
+        "Les relevés dont les données n'ont pas changé depuis la dernière exécution sont ignorés."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='Mois à traiter, AAAA-MM (défaut : mois précédent).')
+        parser.add_argument('--workers', type=int, help='Processus de rendu (défaut : nombre de cœurs, 1 = sans pool).')
+        parser.add_argument('--format', action='append', choices=STATEMENT_FORMATS, dest='formats',
+                            help='Format à produire (répétable, défaut : html et pdf).')
+        parser.add_argument('--force', action='store_true', help='Régénère même les relevés inchangés.')
+
+    def handle(self, *args, **options):
+        try:
+            period = parse_period(options['month']) if options['month'] else previous_month()
+        except ValueError:
+            raise CommandError(f"Mois invalide '{options['month']}' (format attendu : AAAA-MM).")
+
+        service = MonthlyStatementService(
+            period,
+            formats=options['formats'] or STATEMENT_FORMATS,
+            workers=options['workers'],
+            force=options['force'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Relevés de {period:%Y-%m} ({service.workers} processus)...'))
+
+        def progress(done, total):
+            self.stdout.write(f'  {done}/{total} relevés générés')
+
+        # Lectures sur la réplique si elle existe ; les relevés sont enregistrés sur la principale
+        with read_from_replica():
+            generated, skipped = service.generate(progress=progress)
+        self.stdout.write(self.style.SUCCESS(f'Terminé : {generated} générés, {skipped} inchangés.'))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.synthetic_data import DEFAULT_PASSWORD, DEFAULT_PREFIX, SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Crée une association synthétique : membres, contributions mensuelles, prêts avec garants, "
+        "remboursements, sanctions et votes. Le journal n'est pas alimenté : lancer ensuite backfill_ledger si besoin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=100, help='Nombre de membres à créer.')
+        parser.add_argument('--months', type=int, default=12, help='Mois de contributions par membre.')
+        parser.add_argument('--votes', type=int, help='Propositions de vote (défaut : un pour 50 membres).')
+        parser.add_argument('--seed', type=int, default=0, help='Graine du tirage (même graine, mêmes données).')
+        parser.add_argument('--prefix', default=DEFAULT_PREFIX, help="Préfixe des noms d'utilisateur créés.")
+        parser.add_argument('--clear', action='store_true', help='Supprime d\'abord les données portant ce préfixe.')
+
+    def handle(self, *args, **options):
+        if options['members'] < 1 or options['months'] < 1:
+            raise CommandError('--members et --months doivent être positifs.')
+        prefix = options['prefix']
+        if options['clear']:
+            deleted = SyntheticDataGenerator.clear(prefix)
+            self.stdout.write(f'{deleted} lignes supprimées')
+
+        generator = SyntheticDataGenerator(
+            options['members'], months=options['months'], votes=options['votes'], seed=options['seed'], prefix=prefix,
+        )
+        start = time.perf_counter()
+        summary = generator.generate()
+        elapsed = time.perf_counter() - start
+
+        for name, count in summary.as_dict().items():
+            self.stdout.write(f'{name:<15}{count:>10}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Données générées en {elapsed:.1f} s (mot de passe des comptes : '{DEFAULT_PASSWORD}')"
+        ))
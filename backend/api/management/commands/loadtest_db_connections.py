@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from api.models import Member
+from api.serializers import ClaimsTokenObtainPairSerializer
+from api.services.prometheus_metrics import database_pools
+
+User = get_user_model()
+
+MONITOR_INTERVAL = 0.05  # secondes entre deux relevés des connexions côté serveur
+
+
+class Command(BaseCommand):
+    help = (
+        "Charge l'API avec un nombre croissant de threads concurrents (comme les threads d'un worker) "
+        "et vérifie que les connexions à la base restent bornées : une par thread en connexions "
+        "persistantes, au plus DB_POOL_MAX_SIZE avec le pool. Sur PostgreSQL, le pic de connexions "
+        "vues par le serveur (pg_stat_activity) est aussi relevé. Pour N workers gunicorn, le total "
+        "du serveur est N fois la borne mesurée ici."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='Niveaux de concurrence.')
+        parser.add_argument('--requests', type=int, default=200, help='Requêtes par niveau.')
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help="Nom d'URL à appeler (répétable, défaut : dashboard-stats et contribution-list).")
+        parser.add_argument('--username', help="Utilisateur des requêtes (défaut : premier membre).")
+        parser.add_argument('--output', help='Fichier JSON des résultats.')
+
+    def handle(self, *args, **options):
+        user = self._get_user(options['username'])
+        urls = [reverse(name) for name in options['endpoints'] or ('dashboard-stats', 'contribution-list')]
+        headers = {'Authorization': f'Bearer {ClaimsTokenObtainPairSerializer.get_token(user).access_token}'}
+
+        pool_max = None
+        pool_options = settings.DATABASES['default'].get('OPTIONS', {}).get('pool')
+        if pool_options:
+            pool_max = pool_options.get('max_size') if isinstance(pool_options, dict) else None
+
+        self.stdout.write(f"{'Threads':>8}{'req/s':>10}{'Connexions':>12}{'Pic serveur':>13}{'Borne':>8}")
+        results = []
+        # Les clients de test s'annoncent comme 'testserver' ; seul le nombre de connexions compte ici
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], QUERY_BUDGET_STRICT=False):
+            for threads in options['threads']:
+                row = self._run_level(threads, options['requests'], urls, headers, pool_max)
+                results.append(row)
+                self.stdout.write(
+                    f"{threads:>8}{row['requests_per_second']:>10.1f}{row['connections_opened']:>12}"
+                    f"{row['peak_server_connections'] if row['peak_server_connections'] is not None else '-':>13}{row['bound']:>8}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump({'vendor': connections['default'].vendor, 'pool_max': pool_max, 'levels': results}, output, indent=2)
+
+        over = [row for row in results if not row['bounded']]
+        if over:
+            raise CommandError(
+                'Connexions non bornées à ' + ', '.join(f"{row['threads']} threads ({row['connections_opened']})" for row in over)
+            )
+        self.stdout.write(self.style.SUCCESS('Connexions bornées à tous les niveaux.'))
+
+    def _get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"Utilisateur '{username}' introuvable.")
+        member = Member.objects.select_related('user').first()
+        if member is None:
+            raise CommandError('Aucun membre en base : lancez generate_synthetic_data avant le test de charge.')
+        return member.user
+
+    def _run_level(self, threads, total, urls, headers, pool_max):
+        # Chaque niveau part sans connexion ouverte
+        connections.close_all()
+        lock = threading.Lock()
+        opened_count = [0]
+
+        stop = threading.Event()
+        peak = [None]
+        monitor = threading.Thread(target=self._monitor, args=(stop, peak), daemon=True)
+
+        def on_connection(sender, connection, **kwargs):
+            # La connexion du relevé pg_stat_activity ne compte pas
+            if connection.alias == 'default' and threading.current_thread() is not monitor:
+                with lock:
+                    opened_count[0] += 1
+
+        errors = []
+
+        def worker(count):
+            client = Client()
+            try:
+                for index in range(count):
+                    response = client.get(urls[index % len(urls)], headers=headers)
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+            finally:
+                # Fin du « thread de worker » : sa connexion est rendue
+                connections.close_all()
+
+        connection_created.connect(on_connection, weak=False, dispatch_uid='loadtest_db_connections')
+        try:
+            monitor.start()
+            shares = [total // threads + (1 if i < total % threads else 0) for i in range(threads)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(worker, shares))
+            elapsed = time.perf_counter() - start
+        finally:
+            stop.set()
+            monitor.join()
+            connection_created.disconnect(dispatch_uid='loadtest_db_connections')
+        if errors:
+            raise CommandError(f'{len(errors)} requêtes en échec (codes {sorted(set(errors))})')
+
+        pooled = bool(database_pools())
+        bound = pool_max if pooled and pool_max else threads
+        # Avec le pool, chaque requête emprunte une connexion : on borne le pic du pool, pas les emprunts
+        measured = peak[0] if pooled and peak[0] is not None else opened_count[0]
+        return {
+            'threads': threads,
+            'requests': total,
+            'requests_per_second': round(total / elapsed, 1),
+            'connections_opened': opened_count[0],
+            'peak_server_connections': peak[0],
+            'bound': bound,
+            'bounded': measured <= bound,
+        }
+
+    @staticmethod
+    def _monitor(stop, peak):
+        """Relève le pic de connexions : pool du processus, sinon pg_stat_activity (PostgreSQL)."""
+        vendor = connections['default'].vendor
+        try:
+            while not stop.wait(MONITOR_INTERVAL):
+                pools = dict(database_pools())
+                if 'default' in pools:
+                    current = pools['default'].get_stats().get('pool_size', 0)
+                elif vendor == 'postgresql':
+                    with connections['default'].cursor() as cursor:
+                        cursor.execute(
+                            "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND pid <> pg_backend_pid()"
+                        )
+                        current = cursor.fetchone()[0]
+                else:
+                    return
+                peak[0] = max(peak[0] or 0, current)
+        finally:
+            connections.close_all()
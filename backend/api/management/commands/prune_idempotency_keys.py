@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.services.idempotency_service import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = "Supprime les clés d'idempotence plus anciennes que IDEMPOTENCY_KEY_TTL."
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.prune()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} clé(s) d'idempotence supprimée(s)"))
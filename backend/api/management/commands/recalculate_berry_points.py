@@ -1,6 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from api.models import Contribution, Member
+from django.db.models import Sum
+from api.models import Contribution, Member, PenaltyAssessment
+from api.services.member_counters import MemberCounterService
 
 class Command(BaseCommand):
     help = 'Recalcule les points Berry pour toutes les contributions existantes et met à jour le score des membres.'
@@ -13,8 +15,14 @@ class Command(BaseCommand):
             Member.objects.all().update(berry_score=20)
             self.stdout.write(self.style.WARNING('Scores de tous les membres réinitialisés à 20.'))
 
+            # Points retirés par les pénalités automatiques, conservés par le recalcul
+            penalty_points = dict(
+                PenaltyAssessment.objects.values('member_id').annotate(total=Sum('berry_points')).values_list('member_id', 'total')
+            )
+
             # Parcourir chaque membre individuellement
             for member in Member.objects.all():
+                member.berry_score -= penalty_points.get(member.id, 0)
                 # Récupérer toutes les contributions de ce membre, triées par date
                 member_contributions = Contribution.objects.filter(member=member).order_by('date', 'id')
                 
@@ -31,7 +39,7 @@ class Command(BaseCommand):
                     # pour éviter de recalculer le score du membre à chaque fois
                     contrib.is_late = impact['is_late']
                     contrib.points_berry = impact['points_berry']
-                    contrib.save(update_fields=['is_late', 'points_berry'])
+                    Contribution.objects.filter(pk=contrib.pk).update(is_late=contrib.is_late, points_berry=contrib.points_berry)
                     
                     # On ajoute les points au score total du membre
                     member.berry_score += contrib.points_berry
@@ -48,4 +56,7 @@ class Command(BaseCommand):
                 member.save(update_fields=['berry_score'])
                 self.stdout.write(self.style.SUCCESS(f'Score final pour Membre #{member.id}: {member.berry_score}'))
 
+            # Les retards ont pu changer : compteurs des membres recalculés
+            MemberCounterService.repair()
+
             self.stdout.write(self.style.SUCCESS('Recalcul terminé avec succès !'))
\ No newline at end of file
@@ -0,0 +1,63 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import ScheduledJob
+from api.services.scheduled_tasks import JOBS
+from api.services.scheduler import Scheduler, SchedulerError
+
+
+class Command(BaseCommand):
+    help = (
+        "Démon du planificateur : exécute les tâches récurrentes (votes échus, rappels, pénalités, "
+        "purges...) à leur échéance. Plusieurs démons peuvent tourner : chaque tâche n'est lancée que par un seul."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Une seule passe sur les tâches dues, puis arrêt.')
+        parser.add_argument('--run', metavar='TÂCHE', help='Exécute immédiatement une tâche, hors planification.')
+        parser.add_argument('--list', action='store_true', help='Affiche les tâches et leur prochaine échéance.')
+        parser.add_argument('--tick', type=int, help='Secondes entre deux passes (défaut : SCHEDULER_TICK_SECONDS).')
+
+    def handle(self, *args, **options):
+        scheduler = Scheduler(JOBS)
+        if options['list']:
+            return self._list(scheduler)
+        if options['run']:
+            try:
+                run = scheduler.run(options['run'], force=True)
+            except SchedulerError as exc:
+                raise CommandError(str(exc))
+            if run is None:
+                raise CommandError(f"{options['run']} est en cours sur un autre worker.")
+            return self._report(run)
+        if options['once']:
+            for run in scheduler.run_pending():
+                self._report(run)
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        self.stdout.write(self.style.SUCCESS(f'Planificateur démarré ({scheduler.worker}, {len(JOBS)} tâches)'))
+        scheduler.run_forever(tick=options['tick'], stop=stop)
+        self.stdout.write('Planificateur arrêté.')
+
+    def _report(self, run):
+        line = f'{run.job} : {run.status} en {run.duration_ms} ms'
+        if run.error:
+            self.stdout.write(self.style.ERROR(f'{line} ({run.error})'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{line} {run.result}'))
+
+    def _list(self, scheduler):
+        scheduler.sync()
+        states = {row.name: row for row in ScheduledJob.objects.filter(name__in=scheduler.jobs)}
+        for job in JOBS:
+            state = states[job.name]
+            last = f'{timezone.localtime(state.last_run_at):%Y-%m-%d %H:%M} {state.last_status}' if state.last_run_at else '-'
+            self.stdout.write(
+                f'{job.name:<26}{job.schedule:<16}{timezone.localtime(state.next_run_at):%Y-%m-%d %H:%M}   {last}'
+            )
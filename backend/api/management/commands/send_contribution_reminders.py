@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from api.services.reminder_service import ContributionReminderService
+
+
+class Command(BaseCommand):
+    help = (
+        "Envoie les rappels de contribution du mois aux membres qui n'ont pas encore versé la leur. "
+        "Les membres déjà rappelés ce mois-ci sont ignorés ; les envois en échec sont retentés."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Date de référence AAAA-MM-JJ (défaut : aujourd'hui).")
+        parser.add_argument('--time-budget', type=int, help="Durée maximale d'envoi en secondes.")
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = parse_date(options['date'])
+            except ValueError:
+                today = None
+            if today is None:
+                raise CommandError('--date : date invalide (format AAAA-MM-JJ).')
+
+        summary = ContributionReminderService.send(today, time_budget=options['time_budget'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rappels {summary.period:%Y-%m} : {summary.sent} envoyé(s), {summary.failed} en échec, "
+            f"{summary.deferred} reporté(s) sur {summary.selected}"
+        ))
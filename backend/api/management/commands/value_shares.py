@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from api.services.share_valuation_service import ShareValuationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Évalue les parts des membres (contributions, intérêts perçus, pénalités) à une date, "
+        "enregistre l'évaluation dans l'historique et, pour une date non passée, met à jour Member.shares."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--as-of', help="Date d'évaluation AAAA-MM-JJ (défaut : aujourd'hui).")
+
+    def handle(self, *args, **options):
+        as_of = None
+        if options['as_of']:
+            try:
+                as_of = parse_date(options['as_of'])
+            except ValueError:
+                as_of = None
+            if as_of is None:
+                raise CommandError('Date invalide (format AAAA-MM-JJ).')
+
+        valuation = ShareValuationService.value(as_of=as_of)
+        self.stdout.write(
+            f'Fonds au {valuation.as_of} : {valuation.fund_value} (contributions {valuation.total_contributions}, '
+            f'intérêts {valuation.interest_earned}, pénalités {valuation.penalties})'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{valuation.member_count} membres, {valuation.total_shares} parts à {valuation.share_value} '
+            f'(évaluation #{valuation.pk})'
+        ))
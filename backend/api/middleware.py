@@ -0,0 +1,116 @@
+"""
+Instrumentation des requêtes : nombre de requêtes SQL, temps base, temps de
+rendu et latence totale, renvoyés dans l'en-tête Server-Timing, journalisés
+(logger 'api.requests'), agrégés par route (services/request_metrics.py) et
+exportés pour Prometheus (services/prometheus_metrics.py).
+
+Les routes ayant un budget de requêtes SQL (settings.QUERY_BUDGETS, clé
+'MÉTHODE nom-d-url') sont contrôlées : dépassement journalisé, et refusé (QueryBudgetExceeded)
+quand QUERY_BUDGET_STRICT est actif, comme pendant les tests.
+"""
+from contextlib import ExitStack
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .services.prometheus_metrics import observe_request, sample_db_pools
+from .services.request_metrics import RequestTiming, request_metrics
+
+logger = logging.getLogger('api.requests')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Une route a exécuté plus de requêtes SQL que son budget déclaré."""
+
+
+def route_of(request):
+    """Clé d'agrégation : méthode et motif d'URL (pas l'URL elle-même, pour borner le nombre de routes)."""
+    match = getattr(request, 'resolver_match', None)
+    return f"{request.method} {match.route if match else '<non résolue>'}"
+
+
+def query_budget_of(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None or match.url_name is None:
+        return None
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(f"{request.method} {match.url_name}")
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = self._start(request)
+        with self._capture_queries(timing):
+            response = self.get_response(request)
+        return self._finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = self._start(request)
+        # Les vues synchrones et l'ORM asynchrone partagent la connexion du contexte de la requête
+        with self._capture_queries(timing):
+            response = await self.get_response(request)
+        return self._finish(request, response, timing)
+
+    @staticmethod
+    def _start(request):
+        timing = request.request_timing = RequestTiming()
+        return timing
+
+    @staticmethod
+    def _capture_queries(timing):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timing))
+        return stack
+
+    def process_template_response(self, request, response):
+        """Chronomètre le rendu des réponses DRF (encodage JSON), fait juste après ce hook."""
+        timing = getattr(request, 'request_timing', None)
+        if timing is not None:
+            render = response.render
+
+            def timed_render():
+                start = time.perf_counter()
+                try:
+                    return render()
+                finally:
+                    timing.render_time += time.perf_counter() - start
+
+            response.render = timed_render
+        return response
+
+    def _finish(self, request, response, timing):
+        timing.stop()
+        route = route_of(request)
+        response['Server-Timing'] = timing.server_timing()
+        request_metrics.observe(route, timing, response.status_code)
+        match = getattr(request, 'resolver_match', None)
+        observe_request(request.method, match.url_name if match else None, response.status_code, timing)
+        sample_db_pools()
+
+        measures = timing.as_dict()
+        logger.info(
+            "%s %s queries=%d db=%.2fms render=%.2fms total=%.2fms",
+            route, response.status_code, timing.queries, measures['db_ms'], measures['render_ms'], measures['total_ms'],
+            extra={'route': route, 'status': response.status_code, **measures},
+        )
+
+        budget = query_budget_of(request)
+        if budget is not None and timing.queries > budget:
+            message = f"{route} : {timing.queries} requêtes SQL pour un budget de {budget}"
+            logger.warning(message, extra={'route': route, 'queries': timing.queries, 'query_budget': budget})
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+        return response
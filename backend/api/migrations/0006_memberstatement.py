@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_meeting_vote_voterecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberStatement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='Premier jour du mois couvert.')),
+                ('data_hash', models.CharField(max_length=64)),
+                ('html_file', models.CharField(blank=True, max_length=255)),
+                ('pdf_file', models.CharField(blank=True, max_length=255)),
+                ('generated_at', models.DateTimeField(auto_now=True)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statements', to='api.member')),
+            ],
+            options={
+                'unique_together': {('member', 'period')},
+            },
+        ),
+    ]
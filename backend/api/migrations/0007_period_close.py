@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_memberstatement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodClose',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='Premier jour du mois clôturé.', unique=True)),
+                ('closed_at', models.DateTimeField(auto_now_add=True)),
+                ('total_fund', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('monthly_contributions', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('active_members', models.IntegerField()),
+                ('loans_outstanding', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('closed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='closed_periods', to=settings.AUTH_USER_MODEL)),
+                ('meeting', models.OneToOneField(on_delete=django.db.models.deletion.PROTECT, related_name='period_close', to='api.meeting')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MemberPeriodSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('balance', models.DecimalField(decimal_places=2, help_text='Cumul des contributions à la fin du mois.', max_digits=12)),
+                ('monthly_contributions', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('berry_score', models.IntegerField()),
+                ('loan_balance', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='period_snapshots', to='api.member')),
+                ('period_close', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_snapshots', to='api.periodclose')),
+            ],
+            options={
+                'unique_together': {('period_close', 'member')},
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.3 on 2026-10-19 00:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Plan de comptes de la tontine (numérotation du plan comptable général)
+CHART_OF_ACCOUNTS = (
+    ('101', 'Cotisations des membres', 'equity'),
+    ('274', 'Prêts aux membres', 'asset'),
+    ('4671', 'Amendes à recevoir', 'asset'),
+    ('512', 'Caisse', 'asset'),
+    ('758', 'Produits des amendes', 'income'),
+)
+
+
+def create_chart_of_accounts(apps, schema_editor):
+    LedgerAccount = apps.get_model('api', 'LedgerAccount')
+    for code, name, account_type in CHART_OF_ACCOUNTS:
+        LedgerAccount.objects.get_or_create(code=code, defaults={'name': name, 'type': account_type})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_period_close'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=10, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('type', models.CharField(choices=[('asset', 'Actif'), ('liability', 'Passif'), ('equity', 'Capitaux propres'), ('income', 'Produit'), ('expense', 'Charge')], max_length=10)),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='sanction',
+            name='amount',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text="Montant d'une amende.", max_digits=10, null=True),
+        ),
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('description', models.CharField(max_length=255)),
+                ('source_type', models.CharField(max_length=20)),
+                ('source_id', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reversal_of', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='reversal', to='api.journalentry')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Posting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='postings', to='api.ledgeraccount')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='postings', to='api.journalentry')),
+                ('member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='postings', to='api.member')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['source_type', 'source_id'], name='api_journal_source__69518b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posting',
+            index=models.Index(fields=['account', 'date', 'id'], name='api_posting_account_45a5b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posting',
+            index=models.Index(fields=['account', 'member', 'date'], name='api_posting_account_e444aa_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='posting',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('credit', 0), ('debit__gt', 0)), models.Q(('credit__gt', 0), ('debit', 0)), _connector='OR'), name='posting_single_positive_side'),
+        ),
+        migrations.RunPython(create_chart_of_accounts, migrations.RunPython.noop),
+    ]
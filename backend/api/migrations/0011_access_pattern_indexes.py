@@ -0,0 +1,49 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_row_versions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(fields=['date'], name='contribution_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(fields=['member', 'date', 'id'], name='contribution_member_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loanrequest',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['date_requested'], name='loan_approved_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['-date', '-time'], name='meeting_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sanction',
+            index=models.Index(fields=['-date'], name='sanction_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transactionlog',
+            index=models.Index(fields=['transaction_type', 'date'], name='transaction_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['-created_at'], name='vote_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(condition=models.Q(('status', 'En cours')), fields=['end_date'], name='vote_open_end_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voterecord',
+            index=models.Index(fields=['vote_proposal', 'choice'], name='voterecord_choice_idx'),
+        ),
+    ]
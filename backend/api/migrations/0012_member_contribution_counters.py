@@ -0,0 +1,52 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:10
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Member = apps.get_model('api', 'Member')
+    Contribution = apps.get_model('api', 'Contribution')
+    own = Contribution.objects.filter(member=OuterRef('pk')).order_by().values('member')
+    Member.objects.update(
+        contribution_count=Coalesce(Subquery(own.annotate(n=Count('pk')).values('n')), 0, output_field=IntegerField()),
+        total_contributed=Coalesce(Subquery(own.annotate(total=Sum('amount')).values('total')), Value(Decimal('0'))),
+        last_contribution_date=Subquery(own.annotate(last=Max('date')).values('last')),
+        late_count=Coalesce(
+            Subquery(own.filter(is_late=True).annotate(n=Count('pk')).values('n')), 0, output_field=IntegerField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='contribution_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='last_contribution_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='late_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='total_contributed',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
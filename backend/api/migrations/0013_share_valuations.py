@@ -0,0 +1,52 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_member_contribution_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShareValuation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('total_contributions', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('interest_earned', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('penalties', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('fund_value', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('total_shares', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('share_value', models.DecimalField(decimal_places=4, max_digits=14)),
+                ('member_count', models.IntegerField()),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='share_valuations', to=settings.AUTH_USER_MODEL)),
+                ('period_close', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='share_valuation', to='api.periodclose')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MemberShareValuation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contributions', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('shares', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('income', models.DecimalField(decimal_places=2, help_text='Quote-part des intérêts et pénalités.', max_digits=12)),
+                ('value', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='share_valuations', to='api.member')),
+                ('valuation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_valuations', to='api.sharevaluation')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='sharevaluation',
+            index=models.Index(fields=['-as_of', '-id'], name='share_valuation_latest_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='membersharevaluation',
+            unique_together={('valuation', 'member')},
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_share_valuations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='transactionlog',
+            name='transaction_type',
+            field=models.CharField(choices=[('contribution', 'Contribution'), ('loan_disbursement', 'Décaissement de prêt'), ('loan_repayment', 'Remboursement de prêt'), ('penalty', 'Pénalité'), ('penalty_charge', 'Pénalité appliquée'), ('other', 'Autre')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='PenaltyAssessment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='Premier jour du mois pénalisé.')),
+                ('rule', models.CharField(choices=[('late_contribution', 'Contribution en retard'), ('overdue_loan', 'Prêt en retard de remboursement')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('berry_points', models.IntegerField(default=0, help_text='Points Berry retirés.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='penalty_assessments', to='api.member')),
+                ('transaction', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='penalty_assessment', to='api.transactionlog')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('member', 'period', 'rule'), name='unique_penalty_per_member_period_rule')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_penalty_assessments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BerryRuleSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(unique=True)),
+                ('effective_from', models.DateField(db_index=True)),
+                ('due_day', models.PositiveSmallIntegerField(help_text='Contribution en retard après ce jour du mois.')),
+                ('rules', models.JSONField()),
+                ('description', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='berry_rule_sets', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
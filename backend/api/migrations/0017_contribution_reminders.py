@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 01:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_scheduled_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributionReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='Premier jour du mois rappelé.')),
+                ('channel', models.CharField(choices=[('email', 'Email')], default='email', max_length=20)),
+                ('recipient', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('sent', 'Envoyé'), ('failed', 'En échec')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contribution_reminders', to='api.member')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'channel', 'status'], name='reminder_period_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('member', 'period', 'channel'), name='unique_reminder_per_member_period_channel')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_contribution_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contributionreminder',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contributionreminder',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='contributionreminder',
+            name='status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('sending', "En cours d'envoi"), ('sent', 'Envoyé'), ('failed', 'En échec')], default='pending', max_length=10),
+        ),
+    ]
@@ -1,7 +1,9 @@
 # backend/api/models.py
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Greatest
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 import random
 import string
@@ -78,15 +80,87 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
 
+class StaleVersionError(Exception):
+    """La ligne a été modifiée (ou supprimée) depuis la version lue par le client."""
+
+class VersionedModel(models.Model):
+    """
+    Ligne versionnée pour le contrôle de concurrence optimiste.
+    Chaque UPDATE incrémente `version` (exposée en ETag). Si `expected_version` est
+    renseignée, l'UPDATE porte aussi la condition `WHERE version = n` : une écriture
+    concurrente fait échouer la sauvegarde (StaleVersionError) au lieu d'être écrasée.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    expected_version = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = self.expected_version
+        if expected is not None:
+            base_qs = base_qs.filter(version=expected)
+        version_field = self._meta.get_field('version')
+        values = [value for value in values if value[0] is not version_field]
+        values.append((version_field, None, models.F('version') + 1))
+
+        updated = super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if updated:
+            self.version = (expected if expected is not None else self.version) + 1
+            self.expected_version = None
+        elif expected is not None:
+            raise StaleVersionError(f"{self._meta.object_name} #{pk_val} : version {expected} périmée.")
+        return updated
+
 # ... Le reste de vos modèles (Member, Contribution, etc.) reste identique car il est déjà correct.
-class Member(models.Model):
+class Member(VersionedModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='member_profile')
     berry_score = models.IntegerField(default=20)  # Initial score at joining
     shares = models.DecimalField(max_digits=10, decimal_places=2, default=0)  # Parts d'actions
+    # Compteurs dénormalisés, tenus à jour par Contribution.save/delete (vérifiés par check_member_counters)
+    contribution_count = models.PositiveIntegerField(default=0, editable=False)
+    total_contributed = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    last_contribution_date = models.DateField(null=True, blank=True, editable=False)
+    late_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ('contribution_count', 'total_contributed', 'last_contribution_date', 'late_count')
 
     def __str__(self):
         return self.user.get_full_name() or self.user.username
 
+    def apply_contribution_change(self, count=0, amount=0, late=0, points=0, last_date=None, recompute_last=False):
+        """
+        Applique la variation d'une écriture de contribution en un seul UPDATE par
+        expressions F (pas d'écrasement entre deux écritures concurrentes), et
+        reporte la même variation sur l'instance en mémoire.
+        """
+        values = {
+            'contribution_count': models.F('contribution_count') + count,
+            'total_contributed': models.F('total_contributed') + amount,
+            'late_count': models.F('late_count') + late,
+            'berry_score': models.F('berry_score') + points,
+            'version': models.F('version') + 1,
+        }
+        if recompute_last:
+            # Suppression ou changement de date : la dernière date se relit dans les contributions
+            values['last_contribution_date'] = models.Subquery(
+                Contribution.objects.filter(member=models.OuterRef('pk')).order_by('-date').values('date')[:1]
+            )
+        elif last_date is not None:
+            values['last_contribution_date'] = Greatest(Coalesce('last_contribution_date', models.Value(last_date)), models.Value(last_date))
+        Member.objects.filter(pk=self.pk).update(**values)
+
+        self.contribution_count += count
+        self.total_contributed += amount
+        self.late_count += late
+        self.berry_score += points
+        self.version += 1
+        if recompute_last:
+            self.refresh_from_db(fields=['last_contribution_date'])
+        elif last_date is not None:
+            self.last_contribution_date = max(filter(None, (self.last_contribution_date, last_date)))
+
 class Contribution(models.Model):
     member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='contributions')
     amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -94,59 +168,72 @@ class Contribution(models.Model):
     is_late = models.BooleanField(default=False)
     points_berry = models.IntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            # Totaux du mois (tableau de bord) : plage de dates
+            models.Index(fields=['date'], name='contribution_date_idx'),
+            # Historique d'un membre dans l'ordre (recalcul du score, relevés)
+            models.Index(fields=['member', 'date', 'id'], name='contribution_member_date_idx'),
+        ]
+
     def __str__(self):
         return f"Contribution {self.amount} by {self.member} on {self.date}"
 
     def calculate_impact(self, is_first_contribution_ever):
-        from decimal import Decimal
+        """Retard et points Berry selon le jeu de règles en vigueur à la date de la contribution."""
+        from .services.berry_rules import berry_rules
 
-        CONTRIBUTION_DUE_DAY = 25
-        BONUS_THRESHOLD = Decimal('6800.00')
-        
-        is_late = self.date.day > CONTRIBUTION_DUE_DAY
-        points_awarded = 0
-        
-        # La récompense ne s'applique jamais à la première contribution
-        if not is_first_contribution_ever:
-            if is_late:
-                points_awarded -= 15
-            else:
-                points_awarded += 5
-        
-        # Le bonus, lui, s'applique même à la première contribution
-        if self.amount >= BONUS_THRESHOLD:
-            points_awarded += 5
-            
-        return {'is_late': is_late, 'points_berry': points_awarded}
+        return berry_rules.for_date(self.date).impact(self.date, self.amount, is_first_contribution_ever)
 
+    @transaction.atomic
     def save(self, *args, **kwargs):
+        from .services.ledger_service import LedgerService
+
         is_new = self._state.adding
-        old_points = 0
+        old = None
         if not is_new:
-            old_contribution = Contribution.objects.get(pk=self.pk)
-            old_points = old_contribution.points_berry
-
-        # Pour savoir si c'est la 1ère, on vérifie s'il existe d'autres contributions
-        # pour ce membre EN DEHORS de celle-ci.
-        other_contributions_exist = self.member.contributions.exclude(pk=self.pk).exists()
-        is_first_contribution = not other_contributions_exist
+            old = Contribution.objects.get(pk=self.pk)
 
-        impact = self.calculate_impact(is_first_contribution_ever=is_first_contribution)
+        # Première contribution : aucune autre que celle-ci au compteur du membre
+        other_contributions = self.member.contribution_count - (0 if old is None or old.member_id != self.member_id else 1)
+        impact = self.calculate_impact(is_first_contribution_ever=other_contributions <= 0)
         self.is_late = impact['is_late']
         self.points_berry = impact['points_berry']
-        
-        points_diff = self.points_berry - old_points
-        self.member.berry_score += points_diff
-        self.member.save()
-        
+
         super().save(*args, **kwargs)
 
+        if old is None or old.member_id != self.member_id:
+            if old is not None:
+                # Contribution déplacée vers un autre membre : retirée de l'ancien
+                old.member.apply_contribution_change(
+                    count=-1, amount=-old.amount, late=-int(old.is_late), points=-old.points_berry, recompute_last=True,
+                )
+            self.member.apply_contribution_change(
+                count=1, amount=self.amount, late=int(self.is_late), points=self.points_berry, last_date=self.date,
+            )
+        else:
+            self.member.apply_contribution_change(
+                amount=self.amount - old.amount,
+                late=int(self.is_late) - int(old.is_late),
+                points=self.points_berry - old.points_berry,
+                last_date=self.date,
+                recompute_last=self.date < old.date,
+            )
+        # Écriture comptable dans la même transaction que la contribution
+        LedgerService.post_contribution(self)
+
+    @transaction.atomic
     def delete(self, *args, **kwargs):
-        points_to_remove = self.points_berry
-        self.member.berry_score -= points_to_remove
-        self.member.save()
-        super().delete(*args, **kwargs)
-class LoanRequest(models.Model):
+        from .services.ledger_service import LedgerService
+
+        LedgerService.reverse_source(LedgerService.CONTRIBUTION, self.pk)
+        result = super().delete(*args, **kwargs)
+        self.member.apply_contribution_change(
+            count=-1, amount=-self.amount, late=-int(self.is_late), points=-self.points_berry, recompute_last=True,
+        )
+        return result
+
+class LoanRequest(VersionedModel):
     STATUS_CHOICES = (
         ('pending', 'En attente'),
         ('approved', 'Approuvé'),
@@ -162,9 +249,26 @@ class LoanRequest(models.Model):
     repayment_due_date = models.DateField(null=True, blank=True)
     guarantors = models.ManyToManyField(Member, related_name='guaranteed_loans', blank=True)
 
+    class Meta:
+        indexes = [
+            # Index partiel : prêts en cours (tableau de bord, relevés, clôtures), par date de demande
+            models.Index(
+                fields=['date_requested'], name='loan_approved_date_idx',
+                condition=models.Q(status='approved'),
+            ),
+        ]
+
     def __str__(self):
         return f"LoanRequest {self.amount} by {self.member} - {self.status}"
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        from .services.ledger_service import LedgerService
+
+        super().save(*args, **kwargs)
+        # Décaissement comptabilisé à l'approbation, annulé si le prêt est rejeté ensuite
+        LedgerService.post_loan_disbursement(self)
+
 class Committee(models.Model):
     name = models.CharField(max_length=100)
     members = models.ManyToManyField(Member, related_name='committees')
@@ -179,6 +283,7 @@ class TransactionLog(models.Model):
         ('loan_disbursement', 'Décaissement de prêt'),
         ('loan_repayment', 'Remboursement de prêt'),
         ('penalty', 'Pénalité'),
+        ('penalty_charge', 'Pénalité appliquée'),
         ('other', 'Autre'),
     )
     member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='transactions')
@@ -187,10 +292,21 @@ class TransactionLog(models.Model):
     date = models.DateTimeField(auto_now_add=True)
     description = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['transaction_type', 'date'], name='transaction_type_date_idx')]
+
     def __str__(self):
         return f"{self.transaction_type} of {self.amount} by {self.member} on {self.date}"
 
-class Sanction(models.Model):
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        from .services.ledger_service import LedgerService
+
+        super().save(*args, **kwargs)
+        # Remboursements de prêt et paiements d'amende passent au journal
+        LedgerService.post_transaction(self)
+
+class Sanction(VersionedModel):
     """
     Représente une proposition de sanction soumise au vote des membres.
     """
@@ -211,13 +327,32 @@ class Sanction(models.Model):
     reason = models.TextField()
     date = models.DateField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Vote en cours')
+    amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Montant d'une amende.")
     
     # Les votes sont maintenant gérés par le modèle SanctionVote
     # pour un suivi plus précis.
 
+    class Meta:
+        indexes = [models.Index(fields=['-date'], name='sanction_date_idx')]
+
     def __str__(self):
         return f"Sanction de type '{self.type}' pour {self.member.user.username} - Statut: {self.status}"
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        from .services.ledger_service import LedgerService
+
+        super().save(*args, **kwargs)
+        # Une amende appliquée devient une créance sur le membre
+        LedgerService.post_fine(self)
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        from .services.ledger_service import LedgerService
+
+        LedgerService.reverse_source(LedgerService.SANCTION, self.pk)
+        return super().delete(*args, **kwargs)
+
 class SanctionVote(models.Model):
     """
     Enregistre le vote d'un utilisateur pour une sanction spécifique,
@@ -261,10 +396,13 @@ class Meeting(models.Model):
     # Pour un compte-rendu simple
     decisions = models.TextField(blank=True, null=True, help_text="Décisions clés prises durant la réunion.")
 
+    class Meta:
+        indexes = [models.Index(fields=['-date', '-time'], name='meeting_date_time_idx')]
+
     def __str__(self):
         return f"Réunion '{self.title}' le {self.date}"
 
-class Vote(models.Model):
+class Vote(VersionedModel):
     """Représente une proposition soumise à un vote général."""
     VOTE_TYPES = (
         ('Modification Charte', 'Modification Charte'),
@@ -291,6 +429,13 @@ class Vote(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     end_date = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='vote_created_idx'),
+            # Votes ouverts, par échéance (index partiel : les votes clos sont la majorité)
+            models.Index(fields=['end_date'], name='vote_open_end_date_idx', condition=models.Q(status='En cours')),
+        ]
+
     def __str__(self):
         return f"Vote: {self.title} ({self.status})"
 
@@ -307,3 +452,325 @@ class VoteRecord(models.Model):
 
     class Meta:
         unique_together = ('vote_proposal', 'voter')
+        # Décomptes pour / contre d'une proposition lus dans l'index
+        indexes = [models.Index(fields=['vote_proposal', 'choice'], name='voterecord_choice_idx')]
+
+class MemberStatement(models.Model):
+    """
+    Relevé mensuel d'un membre, généré par la commande generate_monthly_statements.
+    Les fichiers sont dans MEDIA_ROOT ; data_hash permet de ne pas régénérer un
+    relevé dont les données n'ont pas changé.
+    """
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='statements')
+    period = models.DateField(help_text="Premier jour du mois couvert.")
+    data_hash = models.CharField(max_length=64)
+    html_file = models.CharField(max_length=255, blank=True)
+    pdf_file = models.CharField(max_length=255, blank=True)
+    generated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('member', 'period')
+
+    def __str__(self):
+        return f"Relevé {self.period:%Y-%m} de {self.member}"
+
+class PeriodClose(models.Model):
+    """
+    Clôture d'un mois, décidée lors d'une réunion de type 'Clôture'.
+    Fige les totaux du fonds ; les contributions du mois ne sont plus modifiables.
+    """
+    period = models.DateField(unique=True, help_text="Premier jour du mois clôturé.")
+    meeting = models.OneToOneField(Meeting, on_delete=models.PROTECT, related_name='period_close')
+    closed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='closed_periods')
+    closed_at = models.DateTimeField(auto_now_add=True)
+    total_fund = models.DecimalField(max_digits=14, decimal_places=2)
+    monthly_contributions = models.DecimalField(max_digits=14, decimal_places=2)
+    active_members = models.IntegerField()
+    loans_outstanding = models.DecimalField(max_digits=14, decimal_places=2)
+
+    def __str__(self):
+        return f"Clôture de {self.period:%Y-%m}"
+
+class MemberPeriodSnapshot(models.Model):
+    """Situation d'un membre à la fin d'un mois clôturé."""
+    period_close = models.ForeignKey(PeriodClose, on_delete=models.CASCADE, related_name='member_snapshots')
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='period_snapshots')
+    balance = models.DecimalField(max_digits=12, decimal_places=2, help_text="Cumul des contributions à la fin du mois.")
+    monthly_contributions = models.DecimalField(max_digits=12, decimal_places=2)
+    berry_score = models.IntegerField()
+    loan_balance = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        unique_together = ('period_close', 'member')
+
+    def __str__(self):
+        return f"{self.member} - {self.period_close.period:%Y-%m}"
+
+class BerryRuleSet(models.Model):
+    """
+    Version de la charte des points Berry, en vigueur à partir de `effective_from`.
+    Les règles sont des données (voir api/services/berry_rules.py) ; une version
+    publiée n'est jamais modifiée : un changement de charte en crée une nouvelle.
+    """
+    version = models.PositiveIntegerField(unique=True)
+    effective_from = models.DateField(db_index=True)
+    due_day = models.PositiveSmallIntegerField(help_text="Contribution en retard après ce jour du mois.")
+    rules = models.JSONField()
+    description = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='berry_rule_sets')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Règles Berry v{self.version} (à partir du {self.effective_from})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Un jeu de règles publié n'est pas modifiable : créez une nouvelle version.")
+        super().save(*args, **kwargs)
+
+class PenaltyAssessment(models.Model):
+    """
+    Pénalité automatique appliquée à un membre pour un mois et une règle.
+    La contrainte d'unicité (membre, mois, règle) sert de clé d'idempotence :
+    relancer le traitement ne pénalise jamais deux fois.
+    """
+    LATE_CONTRIBUTION = 'late_contribution'
+    OVERDUE_LOAN = 'overdue_loan'
+    RULES = (
+        (LATE_CONTRIBUTION, 'Contribution en retard'),
+        (OVERDUE_LOAN, 'Prêt en retard de remboursement'),
+    )
+
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='penalty_assessments')
+    period = models.DateField(help_text="Premier jour du mois pénalisé.")
+    rule = models.CharField(max_length=20, choices=RULES)
+    transaction = models.OneToOneField(
+        'TransactionLog', on_delete=models.SET_NULL, null=True, blank=True, related_name='penalty_assessment',
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    berry_points = models.IntegerField(default=0, help_text="Points Berry retirés.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['member', 'period', 'rule'], name='unique_penalty_per_member_period_rule'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_rule_display()} - {self.member} - {self.period:%Y-%m}"
+
+class ShareValuation(models.Model):
+    """
+    Évaluation des parts à une date : valeur du fonds (contributions, intérêts
+    perçus sur les prêts, pénalités encaissées) et valeur de la part.
+    Conservée pour l'historique ; la dernière sert aux simulations de distribution.
+    """
+    as_of = models.DateField()
+    period_close = models.OneToOneField(
+        PeriodClose, on_delete=models.CASCADE, null=True, blank=True, related_name='share_valuation',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='share_valuations')
+    total_contributions = models.DecimalField(max_digits=14, decimal_places=2)
+    interest_earned = models.DecimalField(max_digits=14, decimal_places=2)
+    penalties = models.DecimalField(max_digits=14, decimal_places=2)
+    fund_value = models.DecimalField(max_digits=14, decimal_places=2)
+    total_shares = models.DecimalField(max_digits=14, decimal_places=2)
+    share_value = models.DecimalField(max_digits=14, decimal_places=4)
+    member_count = models.IntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=['-as_of', '-id'], name='share_valuation_latest_idx')]
+
+    def __str__(self):
+        return f"Évaluation des parts au {self.as_of}"
+
+class MemberShareValuation(models.Model):
+    """Part d'un membre dans une évaluation."""
+    valuation = models.ForeignKey(ShareValuation, on_delete=models.CASCADE, related_name='member_valuations')
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='share_valuations')
+    contributions = models.DecimalField(max_digits=12, decimal_places=2)
+    shares = models.DecimalField(max_digits=10, decimal_places=2)
+    income = models.DecimalField(max_digits=12, decimal_places=2, help_text="Quote-part des intérêts et pénalités.")
+    value = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        unique_together = ('valuation', 'member')
+
+    def __str__(self):
+        return f"{self.member} - {self.valuation.as_of}"
+
+class LedgerAccount(models.Model):
+    """
+    Compte du journal en partie double. debit_total / credit_total sont
+    tenus à jour à chaque écriture : la balance se lit sans agrégation.
+    """
+    ACCOUNT_TYPES = (
+        ('asset', 'Actif'),
+        ('liability', 'Passif'),
+        ('equity', 'Capitaux propres'),
+        ('income', 'Produit'),
+        ('expense', 'Charge'),
+    )
+
+    code = models.CharField(max_length=10, unique=True)
+    name = models.CharField(max_length=100)
+    type = models.CharField(max_length=10, choices=ACCOUNT_TYPES)
+    debit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credit_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    @property
+    def balance(self):
+        """Solde dans le sens naturel du compte (débiteur pour actif et charges)."""
+        if self.type in ('asset', 'expense'):
+            return self.debit_total - self.credit_total
+        return self.credit_total - self.debit_total
+
+    def __str__(self):
+        return f"{self.code} {self.name}"
+
+class JournalEntry(models.Model):
+    """
+    Écriture équilibrée, rattachée à l'objet métier qui l'a produite.
+    Une écriture n'est jamais modifiée : on passe une contre-passation (reversal_of).
+    """
+    date = models.DateField()
+    description = models.CharField(max_length=255)
+    source_type = models.CharField(max_length=20)
+    source_id = models.PositiveIntegerField()
+    reversal_of = models.OneToOneField('self', on_delete=models.PROTECT, null=True, blank=True, related_name='reversal')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['source_type', 'source_id'])]
+
+    def __str__(self):
+        return f"Écriture #{self.pk} du {self.date} ({self.description})"
+
+class Posting(models.Model):
+    """Ligne d'écriture : un montant au débit ou au crédit d'un compte."""
+    entry = models.ForeignKey(JournalEntry, on_delete=models.PROTECT, related_name='postings')
+    account = models.ForeignKey(LedgerAccount, on_delete=models.PROTECT, related_name='postings')
+    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, blank=True, related_name='postings')
+    # Recopiée depuis l'écriture pour les lectures par plage (relevé de compte, balance à date)
+    date = models.DateField()
+    debit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['account', 'date', 'id']),
+            models.Index(fields=['account', 'member', 'date']),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(models.Q(debit__gt=0, credit=0) | models.Q(debit=0, credit__gt=0)),
+                name='posting_single_positive_side',
+            ),
+        ]
+
+    def __str__(self):
+        side = f"D {self.debit}" if self.debit else f"C {self.credit}"
+        return f"{self.account.code} {side}"
+
+class IdempotencyKey(models.Model):
+    """
+    Réponse mémorisée d'une requête d'écriture envoyée avec un en-tête Idempotency-Key.
+    Une nouvelle tentative avec la même clé reçoit cette réponse sans réexécution.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    # Empreinte de la méthode, du chemin et du corps : une clé ne sert qu'à une seule requête
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user')]
+
+    def __str__(self):
+        return f"{self.key} ({self.user_id})"
+
+class ContributionReminder(models.Model):
+    """
+    Rappel de contribution d'un membre pour un mois et un canal. Unique : un membre
+    déjà rappelé ne l'est pas deux fois ; le statut garde la trace de chaque envoi.
+    Une passe réserve ses rappels ('sending', claimed_by) avant de les envoyer.
+    """
+    EMAIL = 'email'
+    CHANNELS = ((EMAIL, 'Email'),)
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'En attente'),
+        (SENDING, "En cours d'envoi"),
+        (SENT, 'Envoyé'),
+        (FAILED, 'En échec'),
+    )
+
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='contribution_reminders')
+    period = models.DateField(help_text="Premier jour du mois rappelé.")
+    channel = models.CharField(max_length=20, choices=CHANNELS, default=EMAIL)
+    recipient = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    # Passe d'envoi qui tient le rappel (statut 'sending') et date de sa réservation
+    claimed_by = models.CharField(max_length=64, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['member', 'period', 'channel'], name='unique_reminder_per_member_period_channel'),
+        ]
+        # Rappels restant à envoyer pour un mois
+        indexes = [models.Index(fields=['period', 'channel', 'status'], name='reminder_period_status_idx')]
+
+    def __str__(self):
+        return f"Rappel {self.period:%Y-%m} - {self.member} ({self.status})"
+
+class ScheduledJob(models.Model):
+    """
+    État partagé d'une tâche planifiée (api/services/scheduler.py) : prochaine
+    échéance et verrou du worker qui l'exécute. Un verrou expiré (worker arrêté
+    en pleine exécution) peut être repris par un autre.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    schedule = models.CharField(max_length=100, help_text="Planification cron (minute heure jour mois jour-de-semaine).")
+    next_run_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=10, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.schedule})"
+
+class JobRun(models.Model):
+    """Historique des exécutions des tâches planifiées : durée, statut, résultat ou erreur."""
+    SUCCESS = 'success'
+    FAILED = 'failed'
+    STATUSES = (
+        (SUCCESS, 'Réussie'),
+        (FAILED, 'En échec'),
+    )
+
+    job = models.CharField(max_length=100)
+    worker = models.CharField(max_length=255)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    duration_ms = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=STATUSES)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['job', '-started_at'], name='jobrun_job_started_idx')]
+
+    def __str__(self):
+        return f"{self.job} {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
@@ -1,19 +1,128 @@
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework import permissions
 
+from .models import User
+
+# ==============================================================================
+# MATRICE RÔLE -> PERMISSIONS (mêmes noms que frontend/src/context/AuthContext.tsx)
+# ==============================================================================
+
+ROLE_PERMISSIONS = {
+    'admin': ('manage_all', 'system_admin'),
+    'president': (
+        'view_members', 'create_members', 'edit_members', 'delete_members',
+        'view_contributions', 'add_contributions', 'edit_contributions', 'manage_contributions',
+        'view_loans', 'approve_loans', 'reject_loans', 'manage_loans',
+        'view_sanctions', 'manage_sanctions', 'view_governance', 'manage_governance',
+        'organize_sessions', 'view_reports',
+    ),
+    'censeur': (
+        'view_members', 'edit_members', 'view_contributions', 'add_contributions',
+        'view_loans', 'approve_loans', 'reject_loans', 'view_sanctions',
+        'participate_in_votes', 'view_governance', 'organize_sessions', 'view_reports',
+    ),
+    'treasurer': (
+        'view_members', 'view_contributions', 'add_contributions', 'edit_contributions',
+        'manage_contributions', 'view_loans', 'add_repayments', 'view_reports',
+    ),
+    'secrecom': (
+        'view_members', 'create_members', 'edit_members', 'view_contributions',
+        'view_loans', 'view_sanctions', 'view_governance', 'organize_sessions',
+    ),
+    'accountant': (
+        'view_members', 'view_contributions', 'add_contributions', 'view_loans', 'view_reports',
+    ),
+    'member': (
+        'view_members', 'view_contributions', 'view_loans', 'add_loan_requests',
+        'view_sanctions', 'participate_in_votes', 'view_governance', 'view_reports',
+    ),
+    'guest': ('view_basic_info',),
+}
+
+# Une permission de gestion inclut les actions courantes correspondantes
+# (le frontend teste ces combinaisons avec des `||`).
+IMPLIED_PERMISSIONS = {
+    'manage_contributions': ('add_contributions', 'edit_contributions'),
+    'manage_loans': ('add_repayments',),
+    'manage_sanctions': ('participate_in_votes',),
+    'manage_governance': ('participate_in_votes', 'organize_sessions'),
+}
+
+# L'administrateur a tous les droits, comme dans hasPermission() côté frontend
+ALL_PERMISSIONS_ROLE = 'admin'
+
+
+def compile_role_permissions(matrix, implied):
+    """
+    Transforme la matrice déclarative en table figée {rôle: frozenset(permissions)}.
+    Vérifie que chaque rôle de User.ROLES est couvert, et seulement ceux-là.
+    """
+    roles = {code for code, _ in User.ROLES}
+    if set(matrix) != roles:
+        raise ImproperlyConfigured(
+            f"ROLE_PERMISSIONS doit couvrir exactement User.ROLES "
+            f"(manquants : {sorted(roles - set(matrix))}, inconnus : {sorted(set(matrix) - roles)})"
+        )
+
+    table = {}
+    for role, granted in matrix.items():
+        expanded = set(granted)
+        for permission in granted:
+            expanded.update(implied.get(permission, ()))
+        table[role] = frozenset(expanded)
+    return MappingProxyType(table)
+
+
+ROLE_PERMISSION_TABLE = compile_role_permissions(ROLE_PERMISSIONS, IMPLIED_PERMISSIONS)
+_NO_PERMISSIONS = frozenset()
+
+
+def has_role_permission(user, permission):
+    """
+    Vérifie une permission à partir du rôle, sans requête en base.
+    `permission=None` signifie « tout utilisateur authentifié ».
+    """
+    if permission is None:
+        return True
+    if user.is_superuser or user.role == ALL_PERMISSIONS_ROLE:
+        return True
+    return permission in ROLE_PERMISSION_TABLE.get(user.role, _NO_PERMISSIONS)
+
+
+def required_permissions(mapping):
+    """
+    Déclare les permissions d'une vue fonctionnelle @api_view, par méthode HTTP.
+    À placer au-dessus de @api_view.
+    """
+    def decorator(view):
+        view.cls.required_permissions = mapping
+        return view
+    return decorator
+
+
 class RoleBasedPermission(permissions.BasePermission):
     """
-    Custom permission to allow access based on user role.
+    Permission unique de l'API : chaque vue déclare `required_permissions`, un
+    dictionnaire {action du viewset ou méthode HTTP: permission}. Une action
+    absente du dictionnaire est refusée.
     """
 
     def has_permission(self, request, view):
-        # Allow safe methods for any authenticated user
-        if request.method in permissions.SAFE_METHODS:
-            return request.user and request.user.is_authenticated
+        if not (request.user and request.user.is_authenticated):
+            return False
+
+        # OPTIONS ne renvoie que les métadonnées de la vue
+        if request.method == 'OPTIONS':
+            return True
 
-        # Define role-based permissions per view or action
-        # Example: Only president and treasurer can create contributions
-        if hasattr(view, 'required_roles'):
-            return request.user.role in view.required_roles
+        mapping = getattr(view, 'required_permissions', None)
+        if mapping is None:
+            return False
 
-        # Default deny
-        return False
+        key = getattr(view, 'action', None) or ('GET' if request.method == 'HEAD' else request.method)
+        if key not in mapping:
+            # Méthode que la vue ne gère pas : on laisse DRF répondre 405
+            return not hasattr(view, request.method.lower())
+        return has_role_permission(request.user, mapping[key])
@@ -1,7 +1,13 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
-from .models import Member, Contribution, LoanRequest, Committee, TransactionLog, Sanction, SanctionVote, Meeting, Vote, VoteRecord
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .models import Member, Contribution, LoanRequest, Committee, TransactionLog, Sanction, SanctionVote, Meeting, Vote, VoteRecord, BerryRuleSet
+from .services.berry_rules import BerryRulesError, validate_due_day, validate_rules
+from .services.period_close_service import is_period_closed
 
 User = get_user_model()
 
@@ -10,6 +16,47 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'role', 'first_name', 'last_name']
 
+def add_user_claims(token, user):
+    """Ajoute au jeton d'accès les informations lues à chaque requête (rôle, membre, superuser)."""
+    token['role'] = user.role
+    token['is_superuser'] = user.is_superuser
+    token['member_id'] = Member.objects.filter(user=user).values_list('id', flat=True).first()
+    return token
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Seul le jeton d'accès porte les claims : le jeton de rafraîchissement ne
+    les recopie pas dans les jetons d'accès suivants (ClaimsTokenRefreshSerializer les relit).
+    """
+
+    def validate(self, attrs):
+        # Authentification seule (TokenObtainSerializer) : les jetons sont construits ici
+        data = super(TokenObtainPairSerializer, self).validate(attrs)
+        refresh = self.get_token(self.user)
+        data['refresh'] = str(refresh)
+        data['access'] = str(add_user_claims(refresh.access_token, self.user))
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+        return data
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Renouvelle le jeton d'accès avec les claims relus en base : un rôle retiré
+    ou un compte désactivé prend effet au renouvellement suivant.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(
+            **{jwt_settings.USER_ID_FIELD: refresh.payload.get(jwt_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        data = super().validate(attrs)
+        # Les claims d'un jeton de rafraîchissement plus ancien sont remplacés par l'état actuel
+        data['access'] = str(add_user_claims(refresh.access_token, user))
+        return data
+
 # NOUVEAU : Serializer pour le profil utilisateur
 class UserProfileSerializer(serializers.ModelSerializer):
     firstName = serializers.CharField(source='first_name', max_length=30)
@@ -49,17 +96,25 @@ class MemberSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
         model = Member
-        fields = ['id', 'user', 'berry_score', 'shares']
+        fields = ['id', 'user', 'berry_score', 'shares', 'contribution_count', 'total_contributed', 'last_contribution_date', 'late_count', 'version']
 
 class ContributionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Contribution
         fields = ['id', 'member', 'amount', 'date', 'is_late', 'points_berry']
 
+    def validate(self, attrs):
+        # Un mois clôturé (ou antérieur à une clôture) est figé : ni ajout, ni déplacement de contribution vers ou depuis ce mois
+        dates = {attrs.get('date'), self.instance.date if self.instance else None}
+        for day in dates:
+            if is_period_closed(day):
+                raise serializers.ValidationError({'date': f"Le mois {day:%Y-%m} est figé par une clôture."})
+        return attrs
+
 class LoanRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = LoanRequest
-        fields = ['id', 'member', 'amount', 'justification', 'date_requested', 'status', 'interest_rate', 'repayment_due_date', 'guarantors']
+        fields = ['id', 'member', 'amount', 'justification', 'date_requested', 'status', 'interest_rate', 'repayment_due_date', 'guarantors', 'version']
 
 class CommitteeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -90,8 +145,8 @@ class SanctionSerializer(serializers.ModelSerializer):
         model = Sanction
         # 'member' est en écriture, 'member_name' en lecture.
         fields = [
-            'id', 'member', 'member_name', 'type', 'reason', 
-            'date', 'status', 'votes_for', 'votes_against', 'has_voted'
+            'id', 'member', 'member_name', 'type', 'reason', 'amount',
+            'date', 'status', 'votes_for', 'votes_against', 'has_voted', 'version'
         ]
         read_only_fields = ['status', 'date']
 
@@ -108,7 +163,7 @@ class SanctionSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         if user.is_anonymous:
             return False
-        return obj.votes.filter(voter=user).exists()
+        return obj.votes.filter(voter_id=user.pk).exists()
 
     def create(self, validated_data):
         """Associe l'utilisateur qui propose la sanction."""
@@ -132,7 +187,7 @@ class VoteSerializer(serializers.ModelSerializer):
         model = Vote
         fields = [
             'id', 'title', 'description', 'type', 'status', 
-            'required_majority', 'end_date', 'votes_for', 'votes_against', 'has_voted'
+            'required_majority', 'end_date', 'votes_for', 'votes_against', 'has_voted', 'version'
         ]
     
     def get_votes_for(self, obj):
@@ -143,4 +198,23 @@ class VoteSerializer(serializers.ModelSerializer):
 
     def get_has_voted(self, obj):
         user = self.context['request'].user
-        return obj.records.filter(voter=user).exists()
+        return obj.records.filter(voter_id=user.pk).exists()
+
+class BerryRuleSetSerializer(serializers.ModelSerializer):
+    """Version de la charte Berry ; numéro attribué à la publication."""
+    class Meta:
+        model = BerryRuleSet
+        fields = ['version', 'effective_from', 'due_day', 'rules', 'description', 'created_at']
+        read_only_fields = ['version', 'created_at']
+
+    def validate_rules(self, value):
+        try:
+            return validate_rules(value)
+        except BerryRulesError as exc:
+            raise serializers.ValidationError(str(exc))
+
+    def validate_due_day(self, value):
+        try:
+            return validate_due_day(value)
+        except BerryRulesError as exc:
+            raise serializers.ValidationError(str(exc))
@@ -0,0 +1,241 @@
+# backend/api/services/berry_rules.py
+"""
+Moteur de règles des points Berry.
+
+La charte est une donnée : chaque BerryRuleSet (versionné, daté d'effet) porte
+le jour d'échéance des contributions et une liste de règles, par exemple :
+
+    {"name": "retard", "when": {"late": true, "first": false}, "points": -15}
+
+Conditions reconnues (toutes doivent être vraies) : `late`, `first` (booléens :
+contribution en retard, première contribution du membre) et `amount_gte`,
+`amount_lt` (montants). Les points des règles satisfaites s'additionnent.
+
+Chaque version est validée puis compilée une seule fois par processus en un
+évaluateur (tuples comparés directement, sans interprétation du JSON). Le
+registre est chargé à la première utilisation, rechargé quand une version est
+publiée dans le processus, et vérifie au plus toutes les
+BERRY_RULES_REFRESH_SECONDS qu'aucun autre processus n'en a publié une.
+Contribution.calculate_impact, le générateur en masse et
+recalculate_berry_points passent tous par berry_rules.for_date().
+
+Tant qu'aucune version n'est publiée (ou avant la première date d'effet), la
+charte d'origine s'applique (DEFAULT_RULES, jour d'échéance CONTRIBUTION_DUE_DAY).
+"""
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal, InvalidOperation
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
+from django.test.signals import setting_changed
+
+from ..models import BerryRuleSet
+
+# Charte d'origine : récompense et retard hors première contribution, bonus dès 6 800
+DEFAULT_RULES = (
+    {'name': 'contribution à temps', 'when': {'late': False, 'first': False}, 'points': 5},
+    {'name': 'contribution en retard', 'when': {'late': True, 'first': False}, 'points': -15},
+    {'name': 'bonus de montant', 'when': {'amount_gte': '6800.00'}, 'points': 5},
+)
+BOOLEAN_CONDITIONS = ('late', 'first')
+AMOUNT_CONDITIONS = ('amount_gte', 'amount_lt')
+
+
+class BerryRulesError(ValueError):
+    """Jeu de règles invalide."""
+
+
+def validate_rules(rules):
+    """Vérifie et normalise une liste de règles (montants en chaînes décimales)."""
+    if not isinstance(rules, list) or not rules:
+        raise BerryRulesError('Les règles doivent être une liste non vide.')
+    normalized = []
+    for index, rule in enumerate(rules):
+        where = f'Règle {index + 1}'
+        if not isinstance(rule, dict) or set(rule) - {'name', 'when', 'points'}:
+            raise BerryRulesError(f"{where} : champs attendus 'name', 'when', 'points'.")
+        points = rule.get('points')
+        if not isinstance(points, int) or isinstance(points, bool):
+            raise BerryRulesError(f'{where} : `points` doit être un entier.')
+        when = rule.get('when', {})
+        if not isinstance(when, dict):
+            raise BerryRulesError(f'{where} : `when` doit être un objet.')
+        unknown = set(when) - set(BOOLEAN_CONDITIONS) - set(AMOUNT_CONDITIONS)
+        if unknown:
+            raise BerryRulesError(f'{where} : condition(s) inconnue(s) {sorted(unknown)}.')
+        conditions = {}
+        for name in BOOLEAN_CONDITIONS:
+            if name in when:
+                if not isinstance(when[name], bool):
+                    raise BerryRulesError(f'{where} : `{name}` doit être un booléen.')
+                conditions[name] = when[name]
+        for name in AMOUNT_CONDITIONS:
+            if name in when:
+                try:
+                    amount = Decimal(str(when[name]))
+                except InvalidOperation:
+                    amount = None
+                if amount is None or not amount.is_finite() or amount < 0:
+                    raise BerryRulesError(f'{where} : `{name}` doit être un montant positif.')
+                conditions[name] = str(amount.quantize(Decimal('0.01')))
+        normalized.append({'name': str(rule.get('name', '')), 'when': conditions, 'points': points})
+    return normalized
+
+
+def validate_due_day(due_day):
+    if not isinstance(due_day, int) or isinstance(due_day, bool) or not 1 <= due_day <= 31:
+        raise BerryRulesError("Le jour d'échéance doit être compris entre 1 et 31.")
+    return due_day
+
+
+class CompiledRuleSet:
+    """Évaluateur d'une version : chaque règle devient (late, first, min, max, points)."""
+    __slots__ = ('version', 'effective_from', 'due_day', 'rules', '_compiled')
+
+    def __init__(self, version, effective_from, due_day, rules):
+        self.version = version
+        self.effective_from = effective_from
+        self.due_day = validate_due_day(due_day)
+        self.rules = validate_rules(list(rules))
+        compiled = []
+        for rule in self.rules:
+            when = rule['when']
+            compiled.append((
+                when.get('late'),
+                when.get('first'),
+                Decimal(when['amount_gte']) if 'amount_gte' in when else None,
+                Decimal(when['amount_lt']) if 'amount_lt' in when else None,
+                rule['points'],
+            ))
+        self._compiled = tuple(compiled)
+
+    def is_late(self, day):
+        return day.day > self.due_day
+
+    def points(self, amount, is_late, is_first):
+        total = 0
+        for late, first, minimum, maximum, points in self._compiled:
+            if late is not None and late != is_late:
+                continue
+            if first is not None and first != is_first:
+                continue
+            if minimum is not None and amount < minimum:
+                continue
+            if maximum is not None and amount >= maximum:
+                continue
+            total += points
+        return total
+
+    def impact(self, day, amount, is_first):
+        is_late = self.is_late(day)
+        return {'is_late': is_late, 'points_berry': self.points(amount, is_late, is_first)}
+
+    def as_dict(self):
+        return {
+            'version': self.version,
+            'effective_from': self.effective_from,
+            'due_day': self.due_day,
+            'rules': self.rules,
+        }
+
+
+def default_rule_set():
+    """Charte d'origine (version 0), en vigueur tant qu'aucune version n'est publiée."""
+    return CompiledRuleSet(0, None, settings.CONTRIBUTION_DUE_DAY, DEFAULT_RULES)
+
+
+class BerryRuleRegistry:
+    """Versions compilées, triées par date d'effet ; partagé par les threads du processus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (dates d'effet, versions compilées, charte d'origine, dernière version) ; None : à charger
+        self._state = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._state = None
+
+    def _load(self):
+        rows = list(BerryRuleSet.objects.order_by('effective_from', 'version').values_list(
+            'version', 'effective_from', 'due_day', 'rules',
+        ))
+        # À date d'effet égale, la version la plus récente l'emporte
+        by_date = {}
+        for version, effective_from, due_day, rules in rows:
+            by_date[effective_from] = CompiledRuleSet(version, effective_from, due_day, rules)
+        rule_sets = tuple(by_date[day] for day in sorted(by_date))
+        self._state = (
+            [rule_set.effective_from for rule_set in rule_sets],
+            rule_sets,
+            default_rule_set(),
+            max((row[0] for row in rows), default=0),
+        )
+        self._checked_at = time.monotonic()
+
+    def _current(self):
+        with self._lock:
+            if self._state is None:
+                self._load()
+            elif time.monotonic() - self._checked_at > settings.BERRY_RULES_REFRESH_SECONDS:
+                # Une version publiée par un autre processus ?
+                latest = BerryRuleSet.objects.aggregate(latest=Max('version'))['latest'] or 0
+                if latest != self._state[3]:
+                    self._load()
+                else:
+                    self._checked_at = time.monotonic()
+            return self._state
+
+    def for_date(self, day):
+        """Version en vigueur à la date `day`."""
+        dates, rule_sets, default, _ = self._current()
+        index = bisect_right(dates, day)
+        return rule_sets[index - 1] if index else default
+
+    def versions(self):
+        """Charte d'origine puis versions publiées, par date d'effet."""
+        _, rule_sets, default, _ = self._current()
+        return [default, *rule_sets]
+
+
+berry_rules = BerryRuleRegistry()
+
+
+@transaction.atomic
+def publish_rule_set(effective_from, due_day, rules, description='', user=None):
+    """Valide et enregistre une nouvelle version de la charte."""
+    rules = validate_rules(rules)
+    due_day = validate_due_day(due_day)
+    if not isinstance(effective_from, date):
+        raise BerryRulesError("Date d'effet invalide.")
+    # Verrou sur la dernière version : deux publications simultanées ne prennent pas le même numéro
+    last = BerryRuleSet.objects.select_for_update().order_by('-version').values_list('version', flat=True).first()
+    return BerryRuleSet.objects.create(
+        version=(last or 0) + 1, effective_from=effective_from, due_day=due_day, rules=rules,
+        description=description, created_by=user,
+    )
+
+
+def _rules_changed(sender, **kwargs):
+    # Tout de suite (pour la transaction en cours) et à la validation (pour les autres threads)
+    berry_rules.invalidate()
+    transaction.on_commit(berry_rules.invalidate)
+
+
+post_save.connect(_rules_changed, sender=BerryRuleSet, dispatch_uid='berry_rules_changed')
+post_delete.connect(_rules_changed, sender=BerryRuleSet, dispatch_uid='berry_rules_delete')
+
+
+def _setting_changed(setting, **kwargs):
+    # La charte d'origine dépend de CONTRIBUTION_DUE_DAY (override_settings dans les tests)
+    if setting in ('CONTRIBUTION_DUE_DAY', 'BERRY_RULES_REFRESH_SECONDS'):
+        berry_rules.invalidate()
+
+
+setting_changed.connect(_setting_changed, dispatch_uid='berry_rules_setting_changed')
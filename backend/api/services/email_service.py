@@ -4,10 +4,13 @@ from django.conf import settings
 from django.template.loader import render_to_string
 import logging
 
+from .prometheus_metrics import track_email
+
 logger = logging.getLogger(__name__)
 
 class EmailVerificationService:
     @staticmethod
+    @track_email('verification')
     def send_verification_email(user):
         """Envoie un email de vérification avec le code"""
         try:
@@ -97,14 +100,15 @@ class EmailVerificationService:
                 fail_silently=False,
             )
             
-            logger.info(f"Email de vérification envoyé à {user.email}")
+            logger.info("Email de vérification envoyé à %s", user.email)
             return True
             
         except Exception as e:
-            logger.error(f"Erreur lors de l'envoi de l'email à {user.email}: {str(e)}")
+            logger.error("Erreur lors de l'envoi de l'email à %s: %s", user.email, e)
             return False
     
     @staticmethod
+    @track_email('welcome')
     def send_welcome_email(user):
         """Envoie un email de bienvenue après vérification"""
         try:
@@ -190,9 +194,9 @@ class EmailVerificationService:
                 fail_silently=False,
             )
             
-            logger.info(f"Email de bienvenue envoyé à {user.email}")
+            logger.info("Email de bienvenue envoyé à %s", user.email)
             return True
             
         except Exception as e:
-            logger.error(f"Erreur lors de l'envoi de l'email de bienvenue à {user.email}: {str(e)}")
+            logger.error("Erreur lors de l'envoi de l'email de bienvenue à %s: %s", user.email, e)
             return False
\ No newline at end of file
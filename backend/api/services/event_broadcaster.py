@@ -0,0 +1,66 @@
+# backend/api/services/event_broadcaster.py
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+import asyncio
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroadcaster:
+    """
+    Diffuseur en mémoire des événements temps réel (votes, sanctions, fonds).
+
+    Chaque client SSE possède sa propre file asyncio. La publication se fait depuis
+    les vues synchrones (threads) : on délègue l'ajout à la boucle du client via
+    call_soon_threadsafe. Les événements ne sont visibles que des clients connectés
+    au même processus ; un client qui se reconnecte doit recharger son état.
+    """
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Crée une file pour le client courant (à appeler depuis la boucle asyncio)."""
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def publish(self, event, data):
+        """Envoie un événement à tous les clients connectés. Sûr depuis n'importe quel thread."""
+        message = f"event: {event}\ndata: {json.dumps(data, cls=JSONEncoder)}\n\n"
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, message)
+            except RuntimeError:
+                # La boucle du client est fermée : il sera retiré à sa déconnexion
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue, message):
+        # Un client trop lent perd les messages les plus anciens plutôt que de bloquer les autres
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    def publish_on_commit(self, event, data):
+        """Publie uniquement si la transaction en cours est validée."""
+        transaction.on_commit(lambda: self.publish(event, data))
+
+
+broadcaster = EventBroadcaster()
@@ -0,0 +1,159 @@
+# backend/api/services/export_service.py
+"""
+Exports CSV / XLSX / PDF générés côté serveur, ligne par ligne.
+
+Les lignes sont lues avec values_list(...).iterator(chunk_size=...) : aucun
+objet modèle n'est instancié et jamais plus d'un lot n'est en mémoire. Chaque
+format est un générateur d'octets consommé par StreamingHttpResponse, si bien
+que la mémoire reste constante quel que soit le nombre de lignes.
+"""
+from datetime import datetime
+import csv
+import tempfile
+
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+from openpyxl import Workbook
+
+from ..models import Member, Contribution, LoanRequest, TransactionLog
+from .pdf_writer import StreamingPDFWriter, display_text
+
+EXPORT_CHUNK_SIZE = 2000
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def _member_name():
+    return Concat(F('member__user__first_name'), Value(' '), F('member__user__last_name'))
+
+
+class ExportDataset:
+    """Description d'un export : colonnes, requête et permission nécessaire."""
+
+    def __init__(self, name, title, permission, columns, queryset, date_field=None, member_field='member_id'):
+        self.name = name
+        self.title = title
+        self.permission = permission
+        self.headers = [header for header, _ in columns]
+        self.expressions = [expression for _, expression in columns]
+        self.queryset = queryset
+        self.date_field = date_field
+        self.member_field = member_field
+
+    def rows(self, member_id=None, date_from=None, date_to=None):
+        """Itère sur les lignes (tuples) sans charger la table en mémoire."""
+        queryset = self.queryset()
+        if member_id is not None:
+            queryset = queryset.filter(**{self.member_field: member_id})
+        if date_from is not None:
+            queryset = queryset.filter(**{f'{self.date_field}__gte': date_from})
+        if date_to is not None:
+            queryset = queryset.filter(**{f'{self.date_field}__lte': date_to})
+
+        # Les colonnes calculées (nom du membre) sont annotées, les autres lues telles quelles
+        names, annotations = [], {}
+        for index, expression in enumerate(self.expressions):
+            if isinstance(expression, str):
+                names.append(expression)
+            else:
+                alias = f'export_col_{index}'
+                annotations[alias] = expression
+                names.append(alias)
+        return (
+            queryset.annotate(**annotations)
+            .order_by('pk')
+            .values_list(*names)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+
+EXPORT_DATASETS = {
+    dataset.name: dataset for dataset in (
+        ExportDataset(
+            'contributions', 'Contributions', 'view_contributions',
+            [('ID', 'id'), ('Membre', _member_name()), ('Montant', 'amount'), ('Date', 'date'),
+             ('En retard', 'is_late'), ('Points Berry', 'points_berry')],
+            Contribution.objects.all, date_field='date',
+        ),
+        ExportDataset(
+            'transactions', 'Transactions', 'view_reports',
+            [('ID', 'id'), ('Membre', _member_name()), ('Type', 'transaction_type'), ('Montant', 'amount'),
+             ('Date', 'date'), ('Description', 'description')],
+            TransactionLog.objects.all, date_field='date__date',
+        ),
+        ExportDataset(
+            'loans', 'Prêts', 'view_loans',
+            [('ID', 'id'), ('Membre', _member_name()), ('Montant', 'amount'), ('Statut', 'status'),
+             ('Date de demande', 'date_requested'), ("Taux d'intérêt", 'interest_rate'),
+             ('Échéance', 'repayment_due_date'), ('Justification', 'justification')],
+            LoanRequest.objects.all, date_field='date_requested',
+        ),
+        ExportDataset(
+            'members', 'Membres', 'view_members',
+            [('ID', 'id'), ("Nom d'utilisateur", 'user__username'), ('Prénom', 'user__first_name'),
+             ('Nom', 'user__last_name'), ('Email', 'user__email'), ('Rôle', 'user__role'),
+             ('Score Berry', 'berry_score'), ('Parts', 'shares')],
+            Member.objects.all, member_field='id',
+        ),
+    )
+}
+
+
+def _cell(value):
+    """Valeur native pour XLSX (openpyxl refuse les dates avec fuseau horaire)."""
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
+class _Echo:
+    """Pseudo-fichier : csv.writer écrit une ligne et on la récupère aussitôt."""
+
+    def write(self, value):
+        return value
+
+
+class ExportService:
+    """Transforme un itérateur de lignes en flux d'octets CSV, XLSX ou PDF."""
+
+    CONTENT_TYPES = {
+        'csv': 'text/csv; charset=utf-8',
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'pdf': 'application/pdf',
+    }
+
+    @classmethod
+    def render(cls, file_format, title, headers, rows):
+        renderer = {'csv': cls.iter_csv, 'xlsx': cls.iter_xlsx, 'pdf': cls.iter_pdf}[file_format]
+        return renderer(title, headers, rows)
+
+    @staticmethod
+    def iter_csv(title, headers, rows):
+        writer = csv.writer(_Echo())
+        # BOM : Excel reconnaît alors l'UTF-8 (accents des noms)
+        yield ('\ufeff' + writer.writerow(headers)).encode('utf-8')
+        for row in rows:
+            yield writer.writerow([display_text(value) for value in row]).encode('utf-8')
+
+    @staticmethod
+    def iter_xlsx(title, headers, rows):
+        """
+        Classeur en mode write_only : openpyxl écrit chaque ligne dans un fichier
+        temporaire au lieu de garder la feuille en mémoire. Le fichier final est
+        ensuite envoyé par blocs.
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title[:31])
+        sheet.append(headers)
+        for row in rows:
+            sheet.append([_cell(value) for value in row])
+
+        with tempfile.TemporaryFile() as output:
+            workbook.save(output)
+            output.seek(0)
+            while chunk := output.read(FILE_CHUNK_SIZE):
+                yield chunk
+
+    @staticmethod
+    def iter_pdf(title, headers, rows):
+        return StreamingPDFWriter(title, headers).stream(rows)
@@ -0,0 +1,117 @@
+# backend/api/services/idempotency_service.py
+"""
+Clés d'idempotence pour les écritures d'argent (contributions, prêts, membres).
+
+Un client qui envoie l'en-tête `Idempotency-Key` peut renvoyer sa requête
+autant de fois que nécessaire (réseau mobile instable) : la première exécution
+est mémorisée avec sa réponse, les suivantes reçoivent cette réponse sans rien
+réexécuter. La clé est réservée dans la même transaction que l'écriture : deux
+envois simultanés ne peuvent pas créer deux contributions.
+"""
+from datetime import timedelta
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from ..models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """Empreinte de la méthode, du chemin et du corps de la requête."""
+    body = json.dumps(request.data, sort_keys=True, cls=JSONEncoder)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode('utf-8')).hexdigest()
+
+
+class IdempotencyService:
+
+    @staticmethod
+    def ttl():
+        return timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+    @staticmethod
+    def _replay(record, fingerprint):
+        if record.request_hash != fingerprint:
+            return Response(
+                {'error': "Cette clé d'idempotence a déjà servi pour une autre requête."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if record.status_code is None:
+            return Response({'error': 'Requête déjà en cours de traitement.'}, status=status.HTTP_409_CONFLICT)
+        return Response(record.response_body, status=record.status_code, headers={'Idempotent-Replayed': 'true'})
+
+    @classmethod
+    def run(cls, request, key, execute, redact=()):
+        """Exécute `execute()` une seule fois pour (utilisateur, clé) et mémorise sa réponse."""
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f"L'en-tête {IDEMPOTENCY_HEADER} ne doit pas dépasser {MAX_KEY_LENGTH} caractères."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        user_id = request.user.pk
+        fingerprint = request_fingerprint(request)
+
+        # Cas courant d'une nouvelle tentative : une lecture, aucune écriture
+        record = IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+        if record is not None:
+            if record.created_at > timezone.now() - cls.ttl():
+                return cls._replay(record, fingerprint)
+            record.delete()
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    # Une requête concurrente avec la même clé attend ici la fin de la première
+                    record = IdempotencyKey.objects.create(user_id=user_id, key=key, request_hash=fingerprint)
+            except IntegrityError:
+                return cls._replay(IdempotencyKey.objects.get(user_id=user_id, key=key), fingerprint)
+
+            response = execute()
+            if response.status_code >= 500 or not hasattr(response, 'data'):
+                # Échec : on annule tout (écritures partielles comprises), la clé reste libre
+                transaction.set_rollback(True)
+                return response
+
+            record.status_code = response.status_code
+            body = json.loads(json.dumps(response.data, cls=JSONEncoder))
+            if redact and isinstance(body, dict):
+                body = {name: value for name, value in body.items() if name not in redact}
+            record.response_body = body
+            record.save(update_fields=['status_code', 'response_body'])
+        return response
+
+    @classmethod
+    def prune(cls):
+        """Supprime les clés expirées ; retourne le nombre de clés supprimées."""
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - cls.ttl()).delete()
+        return deleted
+
+
+def idempotent(view_func=None, *, redact=()):
+    """
+    Rend une vue d'écriture rejouable avec l'en-tête Idempotency-Key.
+    S'applique à une méthode de vue (self, request, ...) ou à une vue @api_view
+    (placé sous @api_view). Sans en-tête, la vue s'exécute normalement.
+    `redact` : clés de la réponse à ne pas conserver en base (mot de passe...).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            request = args[0] if isinstance(args[0], Request) else args[1]
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key or not request.user.is_authenticated:
+                return func(*args, **kwargs)
+            return IdempotencyService.run(request, key, lambda: func(*args, **kwargs), redact=redact)
+        return wrapper
+
+    return decorator(view_func) if view_func is not None else decorator
@@ -0,0 +1,314 @@
+# backend/api/services/ledger_service.py
+"""
+Journal en partie double.
+
+Les contributions, décaissements et remboursements de prêts, amendes et
+paiements d'amende passent automatiquement une écriture équilibrée, dans la
+transaction de l'objet métier (voir les save() des modèles). Une écriture
+n'est jamais modifiée : si l'objet change, l'ancienne est contre-passée et
+une nouvelle est passée. Les totaux débit/crédit de chaque compte sont tenus
+à jour, si bien que la balance et les relevés de compte sont des lectures
+par plage sur l'index (compte, date).
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from ..models import LedgerAccount, JournalEntry, Posting
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+
+class UnbalancedEntryError(ValueError):
+    """Écriture refusée : débits et crédits différents, ou ligne invalide."""
+
+
+def _money(value):
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+class LedgerService:
+    # Objets métier à l'origine des écritures
+    CONTRIBUTION = 'contribution'
+    LOAN = 'loan'
+    TRANSACTION = 'transaction'
+    SANCTION = 'sanction'
+
+    # Plan de comptes (créé par la migration 0008_ledger)
+    MEMBER_CONTRIBUTIONS = '101'
+    LOANS = '274'
+    FINES_RECEIVABLE = '4671'
+    CASH = '512'
+    FINE_INCOME = '758'
+    CHART_OF_ACCOUNTS = {
+        MEMBER_CONTRIBUTIONS: ('Cotisations des membres', 'equity'),
+        LOANS: ('Prêts aux membres', 'asset'),
+        FINES_RECEIVABLE: ('Amendes à recevoir', 'asset'),
+        CASH: ('Caisse', 'asset'),
+        FINE_INCOME: ('Produits des amendes', 'income'),
+    }
+
+    # ------------------------------------------------------------------
+    # Écritures
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _accounts(cls, codes):
+        accounts = {account.code: account for account in LedgerAccount.objects.filter(code__in=codes)}
+        for code in set(codes) - set(accounts):
+            name, account_type = cls.CHART_OF_ACCOUNTS[code]
+            accounts[code], _ = LedgerAccount.objects.get_or_create(code=code, defaults={'name': name, 'type': account_type})
+        return accounts
+
+    @staticmethod
+    def _normalize(lines):
+        """[(compte, membre, débit, crédit)] triés, montants au centime ; vérifie l'équilibre."""
+        normalized = sorted(
+            ((code, member_id, _money(debit), _money(credit)) for code, member_id, debit, credit in lines),
+            key=lambda line: (line[0], line[1] or 0, line[2], line[3]),
+        )
+        for code, _, debit, credit in normalized:
+            if debit < 0 or credit < 0 or (debit > 0) == (credit > 0):
+                raise UnbalancedEntryError(f"Ligne invalide sur le compte {code} : un seul côté positif attendu.")
+        total_debit = sum((line[2] for line in normalized), ZERO)
+        total_credit = sum((line[3] for line in normalized), ZERO)
+        if total_debit != total_credit:
+            raise UnbalancedEntryError(f"Écriture déséquilibrée : débit {total_debit}, crédit {total_credit}.")
+        return normalized
+
+    @classmethod
+    @transaction.atomic
+    def post(cls, date, description, source_type, source_id, lines, reversal_of=None):
+        """Passe une écriture équilibrée et met à jour les totaux des comptes."""
+        lines = cls._normalize(lines)
+        if not lines:
+            raise UnbalancedEntryError('Écriture vide.')
+        accounts = cls._accounts({code for code, *_ in lines})
+
+        entry = JournalEntry.objects.create(
+            date=date, description=description[:255], source_type=source_type, source_id=source_id, reversal_of=reversal_of,
+        )
+        Posting.objects.bulk_create([
+            Posting(entry=entry, account=accounts[code], member_id=member_id, date=date, debit=debit, credit=credit)
+            for code, member_id, debit, credit in lines
+        ])
+
+        totals = {}
+        for code, _, debit, credit in lines:
+            account_debit, account_credit = totals.get(code, (ZERO, ZERO))
+            totals[code] = (account_debit + debit, account_credit + credit)
+        for code, (debit, credit) in totals.items():
+            # F() : pas de lecture-modification-écriture, sûr en concurrence
+            LedgerAccount.objects.filter(pk=accounts[code].pk).update(
+                debit_total=F('debit_total') + debit, credit_total=F('credit_total') + credit,
+            )
+        return entry
+
+    @classmethod
+    @transaction.atomic
+    def post_many(cls, entries):
+        """
+        Passe en lot des écritures nouvelles [(date, libellé, type, id, lignes)] :
+        un INSERT par table et un UPDATE par compte, quel que soit le nombre d'écritures.
+        """
+        normalized = [(date, description, source_type, source_id, cls._normalize(lines))
+                      for date, description, source_type, source_id, lines in entries]
+        if any(not lines for *_, lines in normalized):
+            raise UnbalancedEntryError('Écriture vide.')
+        if not normalized:
+            return []
+        accounts = cls._accounts({code for *_, lines in normalized for code, *_ in lines})
+
+        journal_entries = JournalEntry.objects.bulk_create([
+            JournalEntry(date=date, description=description[:255], source_type=source_type, source_id=source_id)
+            for date, description, source_type, source_id, _ in normalized
+        ])
+        Posting.objects.bulk_create([
+            Posting(entry=entry, account=accounts[code], member_id=member_id, date=entry.date, debit=debit, credit=credit)
+            for entry, (*_, lines) in zip(journal_entries, normalized)
+            for code, member_id, debit, credit in lines
+        ])
+
+        totals = {}
+        for *_, lines in normalized:
+            for code, _, debit, credit in lines:
+                account_debit, account_credit = totals.get(code, (ZERO, ZERO))
+                totals[code] = (account_debit + debit, account_credit + credit)
+        for code, (debit, credit) in totals.items():
+            LedgerAccount.objects.filter(pk=accounts[code].pk).update(
+                debit_total=F('debit_total') + debit, credit_total=F('credit_total') + credit,
+            )
+        return journal_entries
+
+    @staticmethod
+    def _active_entry(source_type, source_id):
+        """Dernière écriture de l'objet qui n'est ni une contre-passation ni contre-passée."""
+        return (
+            JournalEntry.objects.filter(source_type=source_type, source_id=source_id, reversal_of__isnull=True, reversal__isnull=True)
+            .order_by('-id')
+            .first()
+        )
+
+    @classmethod
+    def _reverse(cls, entry):
+        lines = [
+            (code, member_id, credit, debit)
+            for code, member_id, debit, credit in entry.postings.values_list('account__code', 'member_id', 'debit', 'credit')
+        ]
+        return cls.post(entry.date, f"Contre-passation : {entry.description}", entry.source_type, entry.source_id, lines, reversal_of=entry)
+
+    @classmethod
+    def reverse_source(cls, source_type, source_id):
+        """Annule l'écriture en vigueur d'un objet (suppression, rejet...)."""
+        entry = cls._active_entry(source_type, source_id)
+        if entry is not None:
+            cls._reverse(entry)
+
+    @classmethod
+    def sync(cls, source_type, source_id, date, description, lines):
+        """
+        Aligne le journal sur l'état de l'objet : rien si l'écriture en vigueur est
+        identique, sinon contre-passation puis nouvelle écriture (si `lines`).
+        `date=None` garde la date de l'écriture en vigueur (ou aujourd'hui).
+        """
+        entry = cls._active_entry(source_type, source_id)
+        if entry is not None:
+            current = cls._normalize(entry.postings.values_list('account__code', 'member_id', 'debit', 'credit'))
+            if lines and cls._normalize(lines) == current and date in (None, entry.date):
+                return entry
+            cls._reverse(entry)
+        if not lines:
+            return None
+        if date is None:
+            date = entry.date if entry is not None else timezone.localdate()
+        return cls.post(date, description, source_type, source_id, lines)
+
+    # ------------------------------------------------------------------
+    # Objets métier
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def post_contribution(cls, contribution):
+        amount, member_id = contribution.amount, contribution.member_id
+        cls.sync(cls.CONTRIBUTION, contribution.pk, contribution.date, f"Contribution #{contribution.pk}", [
+            (cls.CASH, member_id, amount, 0),
+            (cls.MEMBER_CONTRIBUTIONS, member_id, 0, amount),
+        ])
+
+    @classmethod
+    def post_loan_disbursement(cls, loan):
+        lines = []
+        if loan.status in ('approved', 'repaid'):
+            lines = [(cls.LOANS, loan.member_id, loan.amount, 0), (cls.CASH, loan.member_id, 0, loan.amount)]
+        # Date du décaissement : celle de l'approbation (conservée ensuite)
+        cls.sync(cls.LOAN, loan.pk, None, f"Décaissement du prêt #{loan.pk}", lines)
+
+    @classmethod
+    def _transaction_entry(cls, transaction_log):
+        """(date, libellé, lignes) de l'écriture d'une transaction ; lignes vides si elle n'en produit pas."""
+        member_id, amount = transaction_log.member_id, transaction_log.amount
+        if transaction_log.transaction_type == 'loan_repayment':
+            lines = [(cls.CASH, member_id, amount, 0), (cls.LOANS, member_id, 0, amount)]
+        elif transaction_log.transaction_type == 'penalty':
+            lines = [(cls.CASH, member_id, amount, 0), (cls.FINES_RECEIVABLE, member_id, 0, amount)]
+        elif transaction_log.transaction_type == 'penalty_charge':
+            # Pénalité automatique : à recevoir, comme une amende appliquée
+            lines = [(cls.FINES_RECEIVABLE, member_id, amount, 0), (cls.FINE_INCOME, member_id, 0, amount)]
+        else:
+            # Contributions et décaissements sont passés depuis leur propre objet
+            lines = []
+        day = timezone.localdate(transaction_log.date) if timezone.is_aware(transaction_log.date) else transaction_log.date.date()
+        label = transaction_log.get_transaction_type_display()
+        return day, f"{label} #{transaction_log.pk}", lines
+
+    @classmethod
+    def post_transaction(cls, transaction_log):
+        day, description, lines = cls._transaction_entry(transaction_log)
+        cls.sync(cls.TRANSACTION, transaction_log.pk, day, description, lines)
+
+    @classmethod
+    def post_new_transactions(cls, transaction_logs):
+        """Comptabilise en lot des transactions venant d'être créées (bulk_create, sans save())."""
+        entries = []
+        for transaction_log in transaction_logs:
+            day, description, lines = cls._transaction_entry(transaction_log)
+            if lines:
+                entries.append((day, description, cls.TRANSACTION, transaction_log.pk, lines))
+        return cls.post_many(entries)
+
+    @classmethod
+    def post_fine(cls, sanction):
+        lines = []
+        if sanction.type == 'Amende' and sanction.status == 'Appliquée' and sanction.amount:
+            lines = [(cls.FINES_RECEIVABLE, sanction.member_id, sanction.amount, 0), (cls.FINE_INCOME, sanction.member_id, 0, sanction.amount)]
+        cls.sync(cls.SANCTION, sanction.pk, None, f"Amende #{sanction.pk}", lines)
+
+    # ------------------------------------------------------------------
+    # Lectures
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def trial_balance(as_of=None):
+        """
+        Balance des comptes : totaux courants lus directement ; à une date passée,
+        on retranche les lignes postérieures (lecture par plage sur (compte, date)).
+        """
+        accounts = list(LedgerAccount.objects.order_by('code').values('id', 'code', 'name', 'type', 'debit_total', 'credit_total'))
+        if as_of is not None:
+            later = dict(
+                (account_id, (debit, credit)) for account_id, debit, credit in
+                Posting.objects.filter(date__gt=as_of).values('account_id')
+                .annotate(debit=Sum('debit'), credit=Sum('credit')).values_list('account_id', 'debit', 'credit')
+            )
+            for account in accounts:
+                debit, credit = later.get(account['id'], (ZERO, ZERO))
+                account['debit_total'] -= debit
+                account['credit_total'] -= credit
+
+        rows = []
+        for account in accounts:
+            debit, credit = account['debit_total'], account['credit_total']
+            balance = debit - credit if account['type'] in ('asset', 'expense') else credit - debit
+            rows.append({'code': account['code'], 'name': account['name'], 'type': account['type'],
+                         'debit': debit, 'credit': credit, 'balance': balance})
+        total_debit = sum((row['debit'] for row in rows), ZERO)
+        total_credit = sum((row['credit'] for row in rows), ZERO)
+        return {
+            'as_of': as_of, 'accounts': rows,
+            'total_debit': total_debit, 'total_credit': total_credit, 'balanced': total_debit == total_credit,
+        }
+
+    @staticmethod
+    def account_statement(code, start=None, end=None, member_id=None):
+        """Lignes d'un compte sur une période, avec solde d'ouverture et solde courant."""
+        account = LedgerAccount.objects.get(code=code)
+        postings = Posting.objects.filter(account=account)
+        if member_id is not None:
+            postings = postings.filter(member_id=member_id)
+
+        opening = ZERO
+        if start is not None:
+            if member_id is None:
+                # Total courant du compte moins les lignes depuis `start` (plage récente, courte)
+                since = postings.filter(date__gte=start).aggregate(debit=Sum('debit'), credit=Sum('credit'))
+                opening = (account.debit_total - (since['debit'] or ZERO)) - (account.credit_total - (since['credit'] or ZERO))
+            else:
+                before = postings.filter(date__lt=start).aggregate(debit=Sum('debit'), credit=Sum('credit'))
+                opening = (before['debit'] or ZERO) - (before['credit'] or ZERO)
+            postings = postings.filter(date__gte=start)
+        if end is not None:
+            postings = postings.filter(date__lte=end)
+        sign = 1 if account.type in ('asset', 'expense') else -1
+
+        balance = sign * opening
+        lines = []
+        for row in postings.order_by('date', 'id').values('date', 'entry_id', 'entry__description', 'member_id', 'debit', 'credit'):
+            balance += sign * (row['debit'] - row['credit'])
+            lines.append({
+                'date': row['date'], 'entry': row['entry_id'], 'description': row.pop('entry__description'),
+                'member': row['member_id'], 'debit': row['debit'], 'credit': row['credit'], 'balance': balance,
+            })
+        return {'account': account.code, 'name': account.name, 'opening_balance': sign * opening, 'lines': lines, 'closing_balance': balance}
@@ -0,0 +1,72 @@
+# backend/api/services/member_counters.py
+"""
+Compteurs de contributions dénormalisés sur Member (nombre, total versé,
+dernière date, retards).
+
+Contribution.save/delete les tiennent à jour par variations (UPDATE ... SET
+x = x + n) ; ce service les recalcule depuis la table des contributions pour
+détecter une dérive (écriture en masse, modification hors ORM) et la corriger.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Contribution, Member
+
+
+@dataclass(frozen=True)
+class CounterDrift:
+    member_id: int
+    field: str
+    stored: object
+    expected: object
+
+
+def _expected_annotations():
+    return {
+        'expected_count': Count('contributions'),
+        'expected_total': Coalesce(Sum('contributions__amount'), Value(Decimal('0'))),
+        'expected_last': Max('contributions__date'),
+        'expected_late': Count('contributions', filter=Q(contributions__is_late=True)),
+    }
+
+
+class MemberCounterService:
+
+    @staticmethod
+    def find_drift(members=None):
+        """Écarts entre les compteurs stockés et les contributions, membre par membre."""
+        queryset = (members if members is not None else Member.objects.all()).order_by('pk')
+        rows = queryset.annotate(**_expected_annotations()).values(
+            'pk', *Member.COUNTER_FIELDS, 'expected_count', 'expected_total', 'expected_last', 'expected_late',
+        )
+        expected_names = {
+            'contribution_count': 'expected_count',
+            'total_contributed': 'expected_total',
+            'last_contribution_date': 'expected_last',
+            'late_count': 'expected_late',
+        }
+        drift = []
+        for row in rows.iterator():
+            for field, expected_name in expected_names.items():
+                if row[field] != row[expected_name]:
+                    drift.append(CounterDrift(row['pk'], field, row[field], row[expected_name]))
+        return drift
+
+    @staticmethod
+    @transaction.atomic
+    def repair(members=None):
+        """Recalcule les compteurs (un seul UPDATE par sous-requêtes corrélées) ; retourne le nombre de membres."""
+        own = Contribution.objects.filter(member=OuterRef('pk')).order_by().values('member')
+        queryset = members if members is not None else Member.objects.all()
+        return queryset.update(
+            contribution_count=Coalesce(Subquery(own.annotate(n=Count('pk')).values('n')), 0, output_field=IntegerField()),
+            total_contributed=Coalesce(Subquery(own.annotate(total=Sum('amount')).values('total')), Value(Decimal('0'))),
+            last_contribution_date=Subquery(own.annotate(last=Max('date')).values('last')),
+            late_count=Coalesce(
+                Subquery(own.filter(is_late=True).annotate(n=Count('pk')).values('n')), 0, output_field=IntegerField(),
+            ),
+        )
@@ -0,0 +1,262 @@
+# backend/api/services/notification_channels.py
+"""
+Canaux de notification : email, WhatsApp et SMS.
+
+WhatsApp et SMS passent par un fournisseur HTTP (WHATSAPP_API_URL, SMS_API_URL,
+jeton en Bearer) ; un canal sans URL est désactivé et ses envois sont refusés.
+Les requêtes partent par un httpx.AsyncClient partagé par tous les envois d'un
+lot (connexions keep-alive).
+
+NotificationDispatcher.send_many envoie un lot réparti sur plusieurs canaux
+dans une seule boucle asyncio : les canaux avancent en parallèle au lieu de
+l'un après l'autre. Chaque canal borne ses envois simultanés
+(NOTIFICATION_CONCURRENCY) et retente les échecs transitoires avec un délai
+doublé à chaque tentative. Un message peut contenir un mot de passe : une
+requête dont le fournisseur a pu recevoir le contenu (délai de réponse dépassé,
+5xx) n'est retentée que s'il dédoublonne par clé d'idempotence
+(*_IDEMPOTENCY_HEADER) ; sinon seuls l'échec de connexion et le 429 le sont. Un
+refus (4xx) ou une erreur d'authentification SMTP ne sont jamais retentés.
+En test, api.testing.StubProviderServer remplace le fournisseur.
+"""
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import random
+import smtplib
+import uuid
+
+from asgiref.sync import async_to_sync, sync_to_async
+import httpx
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+
+from .prometheus_metrics import NOTIFICATIONS_SENT
+
+logger = logging.getLogger(__name__)
+
+EMAIL = 'email'
+WHATSAPP = 'whatsapp'
+SMS = 'sms'
+# Attente maximale demandée par un fournisseur (Retry-After) prise en compte, en secondes
+MAX_RETRY_AFTER = 30
+
+
+@dataclass
+class Notification:
+    channel: str
+    recipient: str
+    body: str
+    subject: str = ''
+    html: str = None
+    sender: str = None
+    # Identique d'une tentative à l'autre : le fournisseur reconnaît un renvoi
+    idempotency_key: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+@dataclass
+class DeliveryResult:
+    channel: str
+    recipient: str
+    ok: bool
+    attempts: int = 0
+    error: str = ''
+    provider_id: str = ''
+
+
+class NotificationError(Exception):
+    """Envoi refusé : inutile de retenter (destinataire invalide, canal non configuré...)."""
+
+
+class TransientNotificationError(NotificationError):
+    """Échec passager (réseau, fournisseur surchargé) : l'envoi peut être retenté."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Channel:
+    """Canal d'envoi ; send_once lève TransientNotificationError pour un échec à retenter."""
+    name = None
+
+    def is_configured(self):
+        return True
+
+    async def send_once(self, notification, client):
+        raise NotImplementedError
+
+
+class EmailChannel(Channel):
+    name = EMAIL
+
+    @staticmethod
+    def _send(notification):
+        message = EmailMultiAlternatives(
+            notification.subject, notification.body, notification.sender or settings.DEFAULT_FROM_EMAIL,
+            [notification.recipient],
+        )
+        if notification.html:
+            message.attach_alternative(notification.html, 'text/html')
+        message.send(fail_silently=False)
+
+    async def send_once(self, notification, client):
+        try:
+            await sync_to_async(self._send, thread_sensitive=False)(notification)
+        except smtplib.SMTPRecipientsRefused as exc:
+            raise NotificationError(f'Destinataire refusé : {exc}')
+        except smtplib.SMTPAuthenticationError as exc:
+            raise NotificationError(f'Authentification SMTP refusée : {exc}')
+        except smtplib.SMTPResponseException as exc:
+            # 4xx : indisponibilité passagère du serveur ; 5xx : refus définitif
+            error = f'{type(exc).__name__}: {exc}'
+            raise TransientNotificationError(error) if 400 <= exc.smtp_code < 500 else NotificationError(error)
+        except (smtplib.SMTPException, OSError) as exc:
+            raise TransientNotificationError(f'{type(exc).__name__}: {exc}')
+        except Exception as exc:
+            # Configuration (backend, réglages EMAIL_*...) : une nouvelle tentative échouerait de même
+            raise NotificationError(f'{type(exc).__name__}: {exc}')
+        return ''
+
+
+def normalize_phone(phone):
+    """Numéro au format international sans '+' ni séparateurs (237679428531)."""
+    digits = ''.join(character for character in (phone or '') if character.isdigit())
+    if not digits:
+        raise NotificationError(f'Numéro de téléphone invalide : {phone!r}.')
+    return digits
+
+
+class HTTPProviderChannel(Channel):
+    """Fournisseur HTTP : POST {"from", "to", "message"} en JSON ; l'identifiant du message est lu dans "id"."""
+    url_setting = None
+    token_setting = None
+    idempotency_setting = None
+
+    def __init__(self, url=None, token=None, idempotency_header=None):
+        self.url = url if url is not None else getattr(settings, self.url_setting)
+        self.token = token if token is not None else getattr(settings, self.token_setting)
+        self.idempotency_header = (
+            idempotency_header if idempotency_header is not None else getattr(settings, self.idempotency_setting)
+        )
+
+    def is_configured(self):
+        return bool(self.url)
+
+    def payload(self, notification):
+        return {'from': notification.sender, 'to': normalize_phone(notification.recipient), 'message': notification.body}
+
+    def _uncertain(self, error):
+        """Le fournisseur a pu recevoir le message : renvoyé seulement s'il dédoublonne."""
+        if self.idempotency_header:
+            return TransientNotificationError(error)
+        return NotificationError(f'{error} (envoi incertain, non retenté)')
+
+    async def send_once(self, notification, client):
+        headers = {}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        if self.idempotency_header:
+            headers[self.idempotency_header] = notification.idempotency_key
+        try:
+            response = await client.post(self.url, json=self.payload(notification), headers=headers)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as exc:
+            # Rien n'est parti : la nouvelle tentative ne peut pas créer de doublon
+            raise TransientNotificationError(f'{type(exc).__name__}: {exc}')
+        except httpx.TransportError as exc:
+            raise self._uncertain(f'{type(exc).__name__}: {exc}')
+
+        if response.status_code == 429:
+            retry_after = response.headers.get('retry-after', '')
+            raise TransientNotificationError(
+                f'Fournisseur {self.name} : HTTP 429',
+                retry_after=min(float(retry_after), MAX_RETRY_AFTER) if retry_after.isdigit() else None,
+            )
+        if response.status_code >= 500:
+            raise self._uncertain(f'Fournisseur {self.name} : HTTP {response.status_code}')
+        if response.status_code >= 400:
+            raise NotificationError(f'Fournisseur {self.name} : HTTP {response.status_code} {response.content[:200]!r}')
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return str(data.get('id', '')) if isinstance(data, dict) else ''
+
+
+class WhatsAppChannel(HTTPProviderChannel):
+    name = WHATSAPP
+    url_setting = 'WHATSAPP_API_URL'
+    token_setting = 'WHATSAPP_API_TOKEN'
+    idempotency_setting = 'WHATSAPP_IDEMPOTENCY_HEADER'
+
+
+class SMSChannel(HTTPProviderChannel):
+    name = SMS
+    url_setting = 'SMS_API_URL'
+    token_setting = 'SMS_API_TOKEN'
+    idempotency_setting = 'SMS_IDEMPOTENCY_HEADER'
+
+
+def default_channels():
+    return {channel.name: channel for channel in (EmailChannel(), WhatsAppChannel(), SMSChannel())}
+
+
+class NotificationDispatcher:
+
+    def __init__(self, channels=None, max_attempts=None, backoff=None):
+        self.channels = channels or default_channels()
+        self.max_attempts = max_attempts or settings.NOTIFICATION_MAX_ATTEMPTS
+        self.backoff = settings.NOTIFICATION_RETRY_BACKOFF if backoff is None else backoff
+
+    async def _deliver(self, notification, client, limits):
+        result = DeliveryResult(notification.channel, notification.recipient, ok=False)
+        channel = self.channels.get(notification.channel)
+        if channel is None or not channel.is_configured():
+            result.error = f'Canal {notification.channel} non configuré.'
+            return result
+
+        async with limits[channel.name]:
+            while True:
+                result.attempts += 1
+                try:
+                    result.provider_id = await channel.send_once(notification, client)
+                    result.ok, result.error = True, ''
+                    return result
+                except TransientNotificationError as exc:
+                    result.error = str(exc)
+                    if result.attempts >= self.max_attempts:
+                        return result
+                    delay = exc.retry_after
+                    if delay is None:
+                        # Délai doublé à chaque tentative, légèrement décalé pour étaler les reprises
+                        delay = self.backoff * 2 ** (result.attempts - 1) * random.uniform(1, 1.25)
+                    await asyncio.sleep(delay)
+                except NotificationError as exc:
+                    result.error = str(exc)
+                    return result
+
+    async def asend_many(self, notifications):
+        """Envoie le lot (tous canaux en parallèle) ; un DeliveryResult par notification, dans l'ordre."""
+        # Sémaphores créés dans la boucle qui les utilise
+        limits = {
+            name: asyncio.Semaphore(settings.NOTIFICATION_CONCURRENCY.get(name, 1)) for name in self.channels
+        }
+        async with httpx.AsyncClient(timeout=settings.NOTIFICATION_HTTP_TIMEOUT) as client:
+            results = await asyncio.gather(*(
+                self._deliver(notification, client, limits) for notification in notifications
+            ))
+        for result in results:
+            NOTIFICATIONS_SENT.labels(result.channel, 'sent' if result.ok else 'failed').inc()
+            if not result.ok:
+                logger.warning(
+                    "Notification %s à %s non envoyée après %d tentative(s) : %s",
+                    result.channel, result.recipient, result.attempts, result.error,
+                )
+        return results
+
+    def send_many(self, notifications):
+        return async_to_sync(self.asend_many)(list(notifications))
+
+
+def notify(notification):
+    """Envoie une seule notification ; retourne son DeliveryResult."""
+    return NotificationDispatcher().send_many([notification])[0]
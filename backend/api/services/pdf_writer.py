@@ -0,0 +1,128 @@
+# backend/api/services/pdf_writer.py
+"""
+Écriture de PDF tabulaires en flux, sans dépendance externe.
+Module sans import de modèles : utilisable dans les processus de rendu.
+"""
+from array import array
+from datetime import date, datetime
+
+from django.utils import timezone
+
+
+def display_text(value):
+    """Valeur affichable d'une cellule (CSV, PDF)."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Oui' if value else 'Non'
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M') if timezone.is_aware(value) else value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class StreamingPDFWriter:
+    """
+    PDF minimal (tableau texte, police Helvetica) écrit page par page.
+
+    Seule la page en cours est en mémoire ; on ne garde que la position de
+    chaque objet pour la table xref finale. Les objets 1 à 3 (catalogue,
+    arbre des pages, police) sont réservés et l'arbre des pages est écrit à
+    la fin, quand on connaît toutes les pages.
+    """
+
+    PAGE_WIDTH, PAGE_HEIGHT = 842, 595  # A4 paysage
+    MARGIN = 36
+    FONT_SIZE = 8
+    LINE_HEIGHT = 11
+    XREF_BATCH = 1000
+
+    def __init__(self, title, headers):
+        self.title = title
+        self.headers = headers
+        self.column_width = (self.PAGE_WIDTH - 2 * self.MARGIN) / len(headers)
+        # Largeur moyenne d'un caractère Helvetica ~ 0,5 em
+        self.max_chars = max(int(self.column_width / (self.FONT_SIZE * 0.5)) - 1, 3)
+        self.rows_per_page = int((self.PAGE_HEIGHT - 2 * self.MARGIN) / self.LINE_HEIGHT) - 3
+        self.offsets = array('Q', [0, 0, 0])  # objets 1 à 3 réservés
+        self.page_ids = array('L')
+        self.position = 0
+
+    def _emit(self, data):
+        self.position += len(data)
+        return data
+
+    def _object(self, number, body):
+        self.offsets[number - 1] = self.position
+        return self._emit(f'{number} 0 obj\n'.encode() + body + b'\nendobj\n')
+
+    def _new_object(self, body):
+        self.offsets.append(0)
+        return len(self.offsets), body
+
+    @staticmethod
+    def _escape(text):
+        encoded = text.encode('cp1252', errors='replace')
+        return encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+    def _text_line(self, y, cells):
+        parts = []
+        for index, text in enumerate(cells):
+            if len(text) > self.max_chars:
+                text = text[:self.max_chars - 1] + '…'
+            x = self.MARGIN + index * self.column_width
+            parts.append(b'BT /F1 %d Tf %.1f %.1f Td (%s) Tj ET' % (self.FONT_SIZE, x, y, self._escape(text)))
+        return b'\n'.join(parts)
+
+    def _page(self, rows, page_number):
+        top = self.PAGE_HEIGHT - self.MARGIN
+        lines = [
+            self._text_line(top, [f'{self.title} - page {page_number}']),
+            self._text_line(top - 2 * self.LINE_HEIGHT, self.headers),
+        ]
+        y = top - 3 * self.LINE_HEIGHT
+        for row in rows:
+            lines.append(self._text_line(y, [display_text(value) for value in row]))
+            y -= self.LINE_HEIGHT
+        content = b'\n'.join(lines)
+
+        content_id, content_body = self._new_object(
+            b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream'
+        )
+        page_id, page_body = self._new_object(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>'
+            % (self.PAGE_WIDTH, self.PAGE_HEIGHT, content_id)
+        )
+        self.page_ids.append(page_id)
+        return self._object(content_id, content_body) + self._object(page_id, page_body)
+
+    def stream(self, rows):
+        yield self._emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        yield self._object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        yield self._object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+        page, page_number = [], 1
+        for row in rows:
+            page.append(row)
+            if len(page) == self.rows_per_page:
+                yield self._page(page, page_number)
+                page, page_number = [], page_number + 1
+        if page or not self.page_ids:
+            yield self._page(page, page_number)
+
+        # Arbre des pages et table xref écrits par tranches : seuls les numéros
+        # et positions d'objets (8 octets chacun) sont conservés d'une page à l'autre
+        self.offsets[1] = self.position
+        yield self._emit(b'2 0 obj\n<< /Type /Pages /Count %d /Kids [' % len(self.page_ids))
+        for start in range(0, len(self.page_ids), self.XREF_BATCH):
+            batch = self.page_ids[start:start + self.XREF_BATCH]
+            yield self._emit(b''.join(b'%d 0 R ' % page_id for page_id in batch))
+        yield self._emit(b'] >>\nendobj\n')
+
+        xref_position = self.position
+        yield b'xref\n0 %d\n0000000000 65535 f \n' % (len(self.offsets) + 1)
+        for start in range(0, len(self.offsets), self.XREF_BATCH):
+            batch = self.offsets[start:start + self.XREF_BATCH]
+            yield b''.join(b'%010d 00000 n \n' % offset for offset in batch)
+        yield b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(self.offsets) + 1, xref_position)
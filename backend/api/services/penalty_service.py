@@ -0,0 +1,155 @@
+# backend/api/services/penalty_service.py
+"""
+Pénalités automatiques : contributions en retard et prêts échus non remboursés.
+
+Un traitement par lot (commande apply_penalties) sélectionne par requêtes
+ensemblistes les couples (membre, mois) à pénaliser pour chaque règle, puis
+crée en masse les PenaltyAssessment, les transactions 'penalty_charge' (et
+leurs écritures au journal) et retire les points Berry.
+
+PenaltyAssessment est unique par (membre, mois, règle) : les couples déjà
+pénalisés sont exclus dès la sélection (NOT EXISTS), si bien qu'une relance
+ne crée rien. Montants, points et délai de grâce sont configurés dans les
+settings (LATE_CONTRIBUTION_*, OVERDUE_LOAN_*) ; le retard d'une contribution
+(is_late) suit le jour d'échéance de la charte Berry en vigueur.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Value
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from ..models import Member, Contribution, LoanRequest, TransactionLog, PenaltyAssessment
+from .ledger_service import LedgerService
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class PenaltyRunSummary:
+    as_of: object
+    dry_run: bool = False
+    # {règle: nombre de membres pénalisés}, {règle: montant total}
+    counts: dict = field(default_factory=dict)
+    amounts: dict = field(default_factory=dict)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def as_dict(self):
+        return {
+            'as_of': self.as_of, 'dry_run': self.dry_run,
+            'counts': dict(self.counts), 'amounts': {rule: str(amount) for rule, amount in self.amounts.items()},
+        }
+
+
+def penalty_rules():
+    """Règles actives : {règle: (montant, points Berry)} ; une règle à 0 et 0 est ignorée."""
+    rules = {
+        PenaltyAssessment.LATE_CONTRIBUTION: (
+            Decimal(str(settings.LATE_CONTRIBUTION_PENALTY)), settings.LATE_CONTRIBUTION_BERRY_PENALTY,
+        ),
+        PenaltyAssessment.OVERDUE_LOAN: (
+            Decimal(str(settings.OVERDUE_LOAN_PENALTY)), settings.OVERDUE_LOAN_BERRY_PENALTY,
+        ),
+    }
+    return {rule: (amount, points) for rule, (amount, points) in rules.items() if amount > 0 or points > 0}
+
+
+def _already_assessed(rule, period):
+    return Exists(PenaltyAssessment.objects.filter(member=OuterRef('member_id'), period=period, rule=rule))
+
+
+def late_contribution_candidates(as_of, since=None):
+    """(membre, mois) ayant au moins une contribution en retard et pas encore pénalisés pour ce mois."""
+    contributions = Contribution.objects.filter(is_late=True, date__lte=as_of)
+    if since is not None:
+        contributions = contributions.filter(date__gte=since)
+    return (
+        contributions.annotate(period=TruncMonth('date'))
+        .values_list('member_id', 'period')
+        .filter(~_already_assessed(PenaltyAssessment.LATE_CONTRIBUTION, OuterRef('period')))
+        .distinct()
+        .order_by('member_id', 'period')
+    )
+
+
+def overdue_loan_candidates(as_of):
+    """Membres ayant un prêt échu (délai de grâce passé) non pénalisés pour le mois de `as_of`."""
+    period = as_of.replace(day=1)
+    due_before = as_of - timedelta(days=settings.OVERDUE_LOAN_GRACE_DAYS)
+    return (
+        LoanRequest.objects.filter(status='approved', repayment_due_date__lt=due_before)
+        .annotate(period=Value(period))
+        .values_list('member_id', 'period')
+        .filter(~_already_assessed(PenaltyAssessment.OVERDUE_LOAN, period))
+        .distinct()
+        .order_by('member_id')
+    )
+
+
+class PenaltyService:
+
+    @staticmethod
+    def candidates(as_of, since=None):
+        return {
+            PenaltyAssessment.LATE_CONTRIBUTION: late_contribution_candidates(as_of, since),
+            PenaltyAssessment.OVERDUE_LOAN: overdue_loan_candidates(as_of),
+        }
+
+    @classmethod
+    def apply(cls, as_of=None, since=None, dry_run=False):
+        """Applique les pénalités dues à la date `as_of` (aujourd'hui par défaut) et retourne le bilan."""
+        as_of = as_of or timezone.localdate()
+        summary = PenaltyRunSummary(as_of=as_of, dry_run=dry_run)
+        candidates = cls.candidates(as_of, since)
+        with transaction.atomic():
+            for rule, (amount, points) in penalty_rules().items():
+                pairs = list(candidates[rule])
+                summary.counts[rule] = len(pairs)
+                summary.amounts[rule] = amount * len(pairs)
+                if not dry_run:
+                    for start in range(0, len(pairs), BATCH_SIZE):
+                        cls._assess(rule, amount, points, pairs[start:start + BATCH_SIZE])
+        return summary
+
+    @staticmethod
+    def _assess(rule, amount, points, pairs):
+        label = dict(PenaltyAssessment.RULES)[rule]
+        transactions = [None] * len(pairs)
+        if amount > 0:
+            transactions = TransactionLog.objects.bulk_create([
+                TransactionLog(
+                    member_id=member_id, transaction_type='penalty_charge', amount=amount,
+                    description=f'{label} ({period:%Y-%m})',
+                )
+                for member_id, period in pairs
+            ])
+            LedgerService.post_new_transactions(transactions)
+
+        # Une relance concurrente qui aurait pénalisé le même couple fait échouer
+        # l'insertion (contrainte d'unicité) : le lot entier est alors annulé.
+        PenaltyAssessment.objects.bulk_create([
+            PenaltyAssessment(
+                member_id=member_id, period=period, rule=rule, transaction=transaction_log,
+                amount=amount, berry_points=points,
+            )
+            for (member_id, period), transaction_log in zip(pairs, transactions)
+        ])
+        if points:
+            # Plusieurs mois pour un même membre : un seul UPDATE par nombre de mois
+            months = {}
+            for member_id, _ in pairs:
+                months[member_id] = months.get(member_id, 0) + 1
+            by_count = {}
+            for member_id, count in months.items():
+                by_count.setdefault(count, []).append(member_id)
+            for count, member_ids in by_count.items():
+                Member.objects.filter(pk__in=member_ids).update(
+                    berry_score=F('berry_score') - points * count, version=F('version') + 1,
+                )
@@ -0,0 +1,175 @@
+# backend/api/services/period_close_service.py
+"""
+Clôture mensuelle et rapports historiques.
+
+À la réunion de 'Clôture', les chiffres du mois sont figés dans PeriodClose
+(totaux du fonds) et MemberPeriodSnapshot (une ligne par membre), et les parts
+sont évaluées (ShareValuation). Un rapport sur un mois clôturé lit ces lignes
+(O(membres)) ; seuls les mois ouverts sont calculés, à partir de la dernière
+clôture et des contributions postérieures.
+
+Tout ce qui précède la dernière clôture est figé, y compris un mois resté
+ouvert avant un mois clôturé : ses contributions sont déjà comptées dans
+l'instantané suivant, les modifier fausserait tous les cumuls ultérieurs.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from ..models import Member, Contribution, LoanRequest, TransactionLog, PeriodClose, MemberPeriodSnapshot
+from .share_valuation_service import ShareValuationService
+from .statement_service import month_bounds, next_day_start
+
+CLOSING_MEETING_TYPE = 'Clôture'
+ZERO = Decimal('0.00')
+
+
+class PeriodCloseError(Exception):
+    """Clôture impossible (type de réunion, mois déjà clôturé...)."""
+
+
+def is_period_closed(day):
+    """Le mois de `day` est-il figé (clôturé, ou antérieur à une clôture) ? Ses contributions ne bougent plus."""
+    return day is not None and PeriodClose.objects.filter(period__gte=day.replace(day=1)).exists()
+
+
+def compute_period_figures(period):
+    """
+    Calcule la situation de fin de mois de chaque membre en requêtes groupées.
+
+    Le cumul part de la dernière clôture antérieure : seules les contributions
+    postérieures à celle-ci sont agrégées.
+    Retourne {member_id: {...}}.
+    """
+    start, end = month_bounds(period)
+    previous = PeriodClose.objects.filter(period__lt=start).order_by('-period').first()
+    since = month_bounds(previous.period)[1] if previous else None
+
+    figures = {
+        member_id: {'balance': ZERO, 'monthly_contributions': ZERO, 'berry_score': berry_score, 'loan_balance': ZERO}
+        for member_id, berry_score in Member.objects.values_list('id', 'berry_score')
+    }
+    if previous:
+        for member_id, balance in previous.member_snapshots.values_list('member_id', 'balance'):
+            if member_id in figures:
+                figures[member_id]['balance'] = balance
+
+    contributions = Contribution.objects.filter(date__lte=end)
+    if since:
+        contributions = contributions.filter(date__gt=since)
+    totals = contributions.values('member_id').annotate(
+        added=Sum('amount'),
+        monthly=Sum('amount', filter=Q(date__gte=start)),
+    ).values_list('member_id', 'added', 'monthly')
+    for member_id, added, monthly in totals:
+        figures[member_id]['balance'] += added
+        figures[member_id]['monthly_contributions'] = monthly or ZERO
+
+    # Score en fin de mois : score actuel moins les points gagnés depuis
+    later_points = (
+        Contribution.objects.filter(date__gt=end)
+        .values('member_id').annotate(total=Sum('points_berry')).values_list('member_id', 'total')
+    )
+    for member_id, total in later_points:
+        figures[member_id]['berry_score'] -= total
+
+    borrowed = dict(
+        LoanRequest.objects.filter(status='approved', date_requested__lte=end)
+        .values('member_id').annotate(total=Sum('amount')).values_list('member_id', 'total')
+    )
+    repaid = dict(
+        TransactionLog.objects.filter(transaction_type='loan_repayment', date__lt=next_day_start(end))
+        .values('member_id').annotate(total=Sum('amount')).values_list('member_id', 'total')
+    )
+    for member_id, total in borrowed.items():
+        figures[member_id]['loan_balance'] = max(total - repaid.get(member_id, ZERO), ZERO)
+
+    return figures
+
+
+def _fund_totals(figures):
+    return {
+        'total_fund': sum((row['balance'] for row in figures.values()), ZERO),
+        'monthly_contributions': sum((row['monthly_contributions'] for row in figures.values()), ZERO),
+        'active_members': len(figures),
+        'loans_outstanding': sum((row['loan_balance'] for row in figures.values()), ZERO),
+    }
+
+
+class PeriodCloseService:
+
+    @staticmethod
+    @transaction.atomic
+    def close_period(meeting, user=None):
+        """Clôture le mois de la réunion et retourne le PeriodClose créé."""
+        if meeting.type != CLOSING_MEETING_TYPE:
+            raise PeriodCloseError("Seule une réunion de type 'Clôture' peut clôturer un mois.")
+        period = meeting.date.replace(day=1)
+        if PeriodClose.objects.filter(Q(period=period) | Q(meeting=meeting)).exists():
+            raise PeriodCloseError(f"Le mois {period:%Y-%m} est déjà clôturé.")
+        if PeriodClose.objects.filter(period__gt=period).exists():
+            raise PeriodCloseError("Un mois postérieur est déjà clôturé.")
+
+        figures = compute_period_figures(period)
+        period_close = PeriodClose.objects.create(period=period, meeting=meeting, closed_by=user, **_fund_totals(figures))
+        MemberPeriodSnapshot.objects.bulk_create([
+            MemberPeriodSnapshot(period_close=period_close, member_id=member_id, **row)
+            for member_id, row in figures.items()
+        ])
+        # Parts évaluées à la fin du mois clôturé, conservées avec la clôture
+        ShareValuationService.value(as_of=month_bounds(period)[1], period_close=period_close, user=user)
+        meeting.status = 'Passée'
+        meeting.save(update_fields=['status'])
+        return period_close
+
+    @staticmethod
+    def period_report(period):
+        """Totaux du fonds et situation des membres pour un mois, clôturé ou non."""
+        period = period.replace(day=1)
+        period_close = PeriodClose.objects.filter(period=period).first()
+        if period_close is not None:
+            members = list(
+                period_close.member_snapshots.order_by('member_id').values(
+                    'member_id', 'balance', 'monthly_contributions', 'berry_score', 'loan_balance',
+                )
+            )
+            totals = {
+                'total_fund': period_close.total_fund,
+                'monthly_contributions': period_close.monthly_contributions,
+                'active_members': period_close.active_members,
+                'loans_outstanding': period_close.loans_outstanding,
+            }
+        else:
+            figures = compute_period_figures(period)
+            members = [{'member_id': member_id, **row} for member_id, row in sorted(figures.items())]
+            totals = _fund_totals(figures)
+
+        return {'period': f'{period:%Y-%m}', 'closed': period_close is not None, **totals, 'members': members}
+
+    @staticmethod
+    def fund_history(first, last):
+        """Totaux mensuels de `first` à `last` : clôtures lues en une requête, mois ouverts calculés."""
+        months, month = [], first.replace(day=1)
+        if month > last:
+            return []
+        while month <= last:
+            months.append(month)
+            month = month_bounds(month)[1] + timedelta(days=1)
+
+        closed = {
+            row['period']: row for row in PeriodClose.objects.filter(period__range=(months[0], months[-1])).values(
+                'period', 'total_fund', 'monthly_contributions', 'active_members', 'loans_outstanding',
+            )
+        }
+
+        history = []
+        for month in months:
+            if month in closed:
+                row = dict(closed[month], closed=True)
+            else:
+                row = dict(_fund_totals(compute_period_figures(month)), period=month, closed=False)
+            row['period'] = f"{row['period']:%Y-%m}"
+            history.append(row)
+        return history
@@ -0,0 +1,227 @@
+# backend/api/services/prometheus_metrics.py
+"""
+Métriques au format Prometheus, exposées sur /metrics.
+
+- Requêtes HTTP par méthode, nom d'URL et code de retour (compteur, latence,
+  nombre de requêtes SQL), alimentées par RequestMetricsMiddleware.
+- Envois d'emails (EmailVerificationService) : résultat et durée.
+- Notifications par canal (email, WhatsApp, SMS) : résultat après les reprises.
+- Connexions et inscriptions : succès / échec.
+- Indicateurs métier (membres actifs, votes ouverts, prêts en attente), lus
+  en base au moment du scrape et gardés quelques secondes en cache.
+- Tâches planifiées (run_scheduler) : exécutions par statut et durée.
+- Base de données : connexions obtenues par Django et, si le pool psycopg est
+  actif, occupation du pool (relevée au plus une fois par seconde et par processus).
+
+Plusieurs workers gunicorn : si PROMETHEUS_MULTIPROC_DIR est défini au
+démarrage, chaque processus écrit ses valeurs dans ce répertoire et le scrape
+les agrège (MultiProcessCollector), quel que soit le worker qui répond.
+"""
+import functools
+import os
+import threading
+import time
+
+from django.db.backends.signals import connection_created
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+PREFIX = 'friendly_banks'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+JOB_DURATION_BUCKETS = (0.1, 0.5, 1, 5, 15, 60, 300, 900)
+BUSINESS_METRICS_TTL = 10  # secondes : un scrape toutes les 15 s relit la base au plus une fois
+POOL_SAMPLE_INTERVAL = 1.0  # secondes entre deux relevés des pools d'un processus
+
+HTTP_REQUESTS = Counter(
+    f'{PREFIX}_http_requests_total', 'Requêtes HTTP traitées.', ['method', 'url_name', 'status'],
+)
+HTTP_LATENCY = Histogram(
+    f'{PREFIX}_http_request_duration_seconds', 'Latence des requêtes HTTP.', ['method', 'url_name'],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_DB_QUERIES = Histogram(
+    f'{PREFIX}_http_request_db_queries', 'Requêtes SQL par requête HTTP.', ['method', 'url_name'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+EMAILS_SENT = Counter(f'{PREFIX}_emails_total', "Envois d'emails.", ['kind', 'outcome'])
+EMAIL_DURATION = Histogram(
+    f'{PREFIX}_email_send_duration_seconds', "Durée d'envoi des emails.", ['kind'], buckets=LATENCY_BUCKETS,
+)
+NOTIFICATIONS_SENT = Counter(f'{PREFIX}_notifications_total', 'Notifications envoyées par canal.', ['channel', 'outcome'])
+SCHEDULED_JOB_RUNS = Counter(f'{PREFIX}_scheduled_job_runs_total', 'Exécutions des tâches planifiées.', ['job', 'status'])
+SCHEDULED_JOB_DURATION = Histogram(
+    f'{PREFIX}_scheduled_job_duration_seconds', "Durée d'exécution des tâches planifiées.", ['job'],
+    buckets=JOB_DURATION_BUCKETS,
+)
+AUTH_EVENTS = Counter(f'{PREFIX}_auth_events_total', 'Connexions et inscriptions.', ['event', 'outcome'])
+
+DB_CONNECTIONS = Counter(
+    f'{PREFIX}_db_connections_total', 'Connexions obtenues par Django (ouvertes, ou empruntées au pool).', ['alias'],
+)
+# Jauges additionnées sur les workers vivants : le total du serveur
+DB_POOL_CONNECTIONS = Gauge(
+    f'{PREFIX}_db_pool_connections', 'Connexions ouvertes par le pool (prêtées ou libres).', ['alias'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_IDLE = Gauge(
+    f'{PREFIX}_db_pool_idle_connections', 'Connexions libres dans le pool.', ['alias'], multiprocess_mode='livesum',
+)
+DB_POOL_WAITING = Gauge(
+    f'{PREFIX}_db_pool_waiting_requests', "Demandes en attente d'une connexion libre.", ['alias'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_MAX = Gauge(
+    f'{PREFIX}_db_pool_max_connections', 'Taille maximale des pools.', ['alias'], multiprocess_mode='livesum',
+)
+DB_POOL_ERRORS = Counter(
+    f'{PREFIX}_db_pool_errors_total', "Demandes de connexion en échec (délai d'attente dépassé...).", ['alias'],
+)
+DB_POOL_CONNECTIONS_LOST = Counter(
+    f'{PREFIX}_db_pool_connections_lost_total', 'Connexions écartées par la vérification du pool.', ['alias'],
+)
+
+
+def observe_request(method, url_name, status_code, timing):
+    url_name = url_name or 'unmatched'
+    HTTP_REQUESTS.labels(method, url_name, str(status_code)).inc()
+    HTTP_LATENCY.labels(method, url_name).observe(timing.total_time)
+    HTTP_DB_QUERIES.labels(method, url_name).observe(timing.queries)
+
+
+def observe_job_run(job, status, duration):
+    SCHEDULED_JOB_RUNS.labels(job, status).inc()
+    SCHEDULED_JOB_DURATION.labels(job).observe(duration)
+
+
+def _count_connection(sender, connection, **kwargs):
+    DB_CONNECTIONS.labels(connection.alias).inc()
+
+
+connection_created.connect(_count_connection, dispatch_uid='prometheus_db_connections')
+
+
+def database_pools():
+    """[(alias, pool psycopg)] des pools créés dans ce processus."""
+    from django.db import connections
+
+    pools = []
+    for alias in connections:
+        pool = getattr(type(connections[alias]), '_connection_pools', {}).get(alias)
+        if pool is not None:
+            pools.append((alias, pool))
+    return pools
+
+
+_last_pool_sample = 0.0
+
+
+def sample_db_pools(force=False):
+    """Reporte l'état des pools dans les jauges (au plus une fois par POOL_SAMPLE_INTERVAL)."""
+    global _last_pool_sample
+    now = time.monotonic()
+    if not force and now - _last_pool_sample < POOL_SAMPLE_INTERVAL:
+        return
+    _last_pool_sample = now
+    for alias, pool in database_pools():
+        # pop_stats : les compteurs du pool repartent de zéro, on les ajoute aux nôtres
+        stats = pool.pop_stats()
+        DB_POOL_CONNECTIONS.labels(alias).set(stats.get('pool_size', 0))
+        DB_POOL_IDLE.labels(alias).set(stats.get('pool_available', 0))
+        DB_POOL_WAITING.labels(alias).set(stats.get('requests_waiting', 0))
+        DB_POOL_MAX.labels(alias).set(stats.get('pool_max', 0))
+        DB_POOL_ERRORS.labels(alias).inc(stats.get('requests_errors', 0))
+        DB_POOL_CONNECTIONS_LOST.labels(alias).inc(stats.get('connections_lost', 0))
+
+
+def track_email(kind):
+    """Décore une méthode d'envoi qui retourne True (envoyé) ou False (échec)."""
+    def decorator(send):
+        @functools.wraps(send)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            sent = send(*args, **kwargs)
+            EMAIL_DURATION.labels(kind).observe(time.perf_counter() - start)
+            EMAILS_SENT.labels(kind, 'sent' if sent else 'failed').inc()
+            return sent
+        return wrapper
+    return decorator
+
+
+def track_auth_event(event):
+    """Décore une vue (connexion, inscription) : succès si le code de retour est < 400."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            if request.method == 'POST':
+                AUTH_EVENTS.labels(event, 'success' if response.status_code < 400 else 'failure').inc()
+            return response
+        return wrapper
+    return decorator
+
+
+class BusinessMetricsCollector:
+    """Indicateurs métier calculés au scrape, en cache BUSINESS_METRICS_TTL secondes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cached_at = None
+        self._values = None
+
+    @staticmethod
+    def _read():
+        from django.db.models import Count, Q, Sum
+        from ..models import Member, LoanRequest, Vote, Sanction
+
+        loans = LoanRequest.objects.aggregate(
+            pending=Count('id', filter=Q(status='pending')),
+            pending_amount=Sum('amount', filter=Q(status='pending')),
+        )
+        return {
+            'active_members': Member.objects.filter(user__is_active=True).count(),
+            'open_votes': Vote.objects.filter(status='En cours').count(),
+            'open_sanction_votes': Sanction.objects.filter(status='Vote en cours').count(),
+            'pending_loans': loans['pending'],
+            'pending_loans_amount': float(loans['pending_amount'] or 0),
+        }
+
+    def values(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._values is None or now - self._cached_at >= BUSINESS_METRICS_TTL:
+                self._values = self._read()
+                self._cached_at = now
+            return self._values
+
+    def reset(self):
+        with self._lock:
+            self._values = None
+
+    def collect(self):
+        descriptions = {
+            'active_members': 'Membres dont le compte est actif.',
+            'open_votes': 'Propositions dont le vote est en cours.',
+            'open_sanction_votes': 'Sanctions en cours de vote.',
+            'pending_loans': 'Demandes de prêt en attente.',
+            'pending_loans_amount': 'Montant total des demandes de prêt en attente.',
+        }
+        for name, value in self.values().items():
+            yield GaugeMetricFamily(f'{PREFIX}_{name}', descriptions[name], value=value)
+
+
+business_metrics = BusinessMetricsCollector()
+_business_registry = CollectorRegistry(auto_describe=False)
+_business_registry.register(business_metrics)
+
+
+def render_latest():
+    """Exposition texte de toutes les métriques (agrégées sur les workers en mode multiprocessus)."""
+    sample_db_pools(force=True)
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(_business_registry)
@@ -0,0 +1,244 @@
+# backend/api/services/reminder_service.py
+"""
+Rappels de contribution (tâche planifiée remind_contributions).
+
+Une requête ensembliste (anti-jointure NOT EXISTS) sélectionne les membres
+actifs sans contribution ce mois-ci ni rappel pour ce mois ; leurs rappels sont
+réservés en masse (ContributionReminder 'pending', unique par membre, mois et
+canal). Chaque passe s'attribue ensuite les rappels à envoyer par un UPDATE
+conditionnel ('sending', claimed_by) : deux passes simultanées (commande
+manuelle pendant la tâche planifiée...) ne se partagent jamais un rappel. Les
+rappels réservés sont relus en une requête avec tout ce qui personnalise le message (prénom, score Berry, dernière contribution : compteurs
+dénormalisés de Member), rendus par lot, puis envoyés par
+REMINDER_SMTP_CONNECTIONS connexions ouvertes une seule fois chacune.
+
+Le statut de chaque destinataire (envoyé, en échec et pourquoi) est enregistré :
+une relance ne renvoie rien à ceux qui ont été rappelés et reprend les rappels
+en attente ou en échec (jusqu'à REMINDER_MAX_ATTEMPTS tentatives). Un membre qui
+a payé entre-temps n'est plus rappelé. L'envoi s'arrête après
+REMINDER_TIME_BUDGET_SECONDS ; les rappels restants sont rendus et partent à
+la passe suivante. Une réservation plus ancienne que REMINDER_CLAIM_SECONDS
+(passe arrêtée en plein envoi) peut être reprise.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from html import escape
+import logging
+import queue
+import time
+import uuid
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from ..models import Contribution, ContributionReminder, Member
+from .berry_rules import berry_rules
+from .statement_service import month_bounds
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+MONTHS = (
+    'janvier', 'février', 'mars', 'avril', 'mai', 'juin',
+    'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre',
+)
+
+
+@dataclass
+class ReminderRunSummary:
+    period: object
+    selected: int = 0
+    sent: int = 0
+    failed: int = 0
+    # Non envoyés faute de temps : repris à la passe suivante
+    deferred: int = 0
+
+    def as_dict(self):
+        return {
+            'period': self.period, 'selected': self.selected, 'sent': self.sent,
+            'failed': self.failed, 'deferred': self.deferred,
+        }
+
+
+def _paid_this_month(bounds):
+    return Exists(Contribution.objects.filter(member=OuterRef('member_id'), date__range=bounds))
+
+
+def reminder_candidates(period):
+    """Membres actifs avec un email, sans contribution ni rappel par email pour le mois de `period`."""
+    bounds = month_bounds(period)
+    return (
+        Member.objects.filter(user__is_active=True).exclude(user__email='')
+        .filter(~Exists(Contribution.objects.filter(member=OuterRef('pk'), date__range=bounds)))
+        .filter(~Exists(ContributionReminder.objects.filter(
+            member=OuterRef('pk'), period=period, channel=ContributionReminder.EMAIL,
+        )))
+        .order_by('pk')
+        .values_list('pk', 'user__email')
+    )
+
+
+def render_reminder(row, context):
+    """(sujet, texte, HTML) du rappel d'un membre ; `context` est commun au lot."""
+    name = row['member__user__first_name'] or row['member__user__username']
+    last = row['member__last_contribution_date']
+    history = f'Votre dernière contribution date du {last:%d/%m/%Y}.' if last else "Vous n'avez encore jamais contribué."
+    deadline = f"Pensez à la verser au plus tard le {context['due_date']:%d/%m/%Y}"
+    if context['late_points']:
+        deadline += f" : un versement en retard coûte {context['late_points']} points Berry"
+    lines = [
+        f"Votre contribution de {context['month']} n'est pas encore enregistrée.",
+        f'{deadline}.',
+        history,
+        f"Votre score Berry actuel : {row['member__berry_score']} points.",
+    ]
+    text = '\n\n'.join([f'Bonjour {name},', *lines, "L'équipe Friendly Banks"])
+    html = (
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="UTF-8"></head>'
+        '<body style="font-family: Arial, sans-serif; color: #333;">'
+        f'<h2>🏦 Bonjour {escape(name)},</h2>'
+        + ''.join(f'<p>{escape(line)}</p>' for line in lines)
+        + "<p>L'équipe Friendly Banks</p></body></html>"
+    )
+    return context['subject'], text, html
+
+
+def _send_worker(messages, results, deadline):
+    """Envoie les messages de la file sur une seule connexion ; (pk, erreur ou None) dans `results`."""
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception:
+        # Serveur injoignable : les messages restent dans la file pour les autres connexions
+        logger.exception("Connexion d'envoi des rappels impossible")
+        return
+    try:
+        while time.monotonic() < deadline:
+            try:
+                pk, message = messages.get_nowait()
+            except queue.Empty:
+                break
+            message.connection = connection
+            try:
+                connection.send_messages([message])
+                results.append((pk, None))
+            except Exception as exc:
+                results.append((pk, f'{type(exc).__name__}: {exc}'))
+                # Connexion peut-être rompue : la suite repart d'une connexion neuve
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    logger.exception("Reconnexion d'envoi des rappels impossible")
+                    return
+    finally:
+        connection.close()
+
+
+class ContributionReminderService:
+
+    @staticmethod
+    def reserve(period):
+        """Crée les rappels 'pending' des nouveaux candidats ; retourne leur nombre."""
+        reminders = [
+            ContributionReminder(member_id=member_id, period=period, recipient=email)
+            for member_id, email in reminder_candidates(period)
+        ]
+        ContributionReminder.objects.bulk_create(reminders, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        return len(reminders)
+
+    @staticmethod
+    def claim(period, claimed_by):
+        """
+        Attribue à la passe `claimed_by` les rappels en attente ou en échec (tentatives
+        restantes) de membres qui n'ont toujours pas payé, puis les relit.
+        """
+        now = timezone.now()
+        available = Q(status__in=(ContributionReminder.PENDING, ContributionReminder.FAILED)) | Q(
+            status=ContributionReminder.SENDING, claimed_at__lt=now - timedelta(seconds=settings.REMINDER_CLAIM_SECONDS),
+        )
+        ContributionReminder.objects.filter(
+            available, period=period, channel=ContributionReminder.EMAIL, attempts__lt=settings.REMINDER_MAX_ATTEMPTS,
+        ).filter(~_paid_this_month(month_bounds(period))).update(
+            status=ContributionReminder.SENDING, claimed_by=claimed_by, claimed_at=now,
+        )
+        return list(
+            ContributionReminder.objects.filter(status=ContributionReminder.SENDING, claimed_by=claimed_by)
+            .order_by('pk')
+            .values(
+                'pk', 'recipient', 'member__user__first_name', 'member__user__username',
+                'member__berry_score', 'member__last_contribution_date',
+            )
+        )
+
+    @classmethod
+    def send(cls, today=None, time_budget=None):
+        """Réserve puis envoie les rappels du mois de `today` ; retourne le bilan."""
+        if time_budget is None:
+            time_budget = settings.REMINDER_TIME_BUDGET_SECONDS
+        deadline = time.monotonic() + time_budget
+        today = today or timezone.localdate()
+        period = today.replace(day=1)
+        cls.reserve(period)
+        claimed_by = uuid.uuid4().hex
+        rows = cls.claim(period, claimed_by)
+        summary = ReminderRunSummary(period=period, selected=len(rows))
+        if not rows:
+            return summary
+
+        rule_set = berry_rules.for_date(today)
+        due_day = min(rule_set.due_day, month_bounds(today)[1].day)
+        context = {
+            'subject': f'Rappel : contribution de {MONTHS[today.month - 1]} {today.year}',
+            'month': f'{MONTHS[today.month - 1]} {today.year}',
+            'due_date': today.replace(day=due_day),
+            # Points perdus par un versement en retard (hors bonus de montant)
+            'late_points': max(0, -rule_set.points(0, True, False)),
+        }
+        messages = queue.Queue()
+        for row in rows:
+            subject, text, html = render_reminder(row, context)
+            message = EmailMultiAlternatives(subject, text, settings.DEFAULT_FROM_EMAIL, [row['recipient']])
+            message.attach_alternative(html, 'text/html')
+            messages.put((row['pk'], message))
+
+        results = []
+        workers = max(1, min(settings.REMINDER_SMTP_CONNECTIONS, len(rows)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(_send_worker, messages, results, deadline) for _ in range(workers)]:
+                future.result()
+
+        cls._record(results, claimed_by, claimed=len(rows))
+        summary.sent = sum(1 for _, error in results if error is None)
+        summary.failed = len(results) - summary.sent
+        summary.deferred = len(rows) - len(results)
+        logger.info("Rappels de contribution %s : %s", f'{period:%Y-%m}', summary.as_dict())
+        return summary
+
+    @staticmethod
+    def _record(results, claimed_by, claimed):
+        now = timezone.now()
+        sent = [pk for pk, error in results if error is None]
+        for start in range(0, len(sent), BATCH_SIZE):
+            ContributionReminder.objects.filter(pk__in=sent[start:start + BATCH_SIZE], claimed_by=claimed_by).update(
+                status=ContributionReminder.SENT, attempts=F('attempts') + 1, error='', sent_at=now,
+            )
+        failed = [(pk, error) for pk, error in results if error is not None]
+        for start in range(0, len(failed), BATCH_SIZE):
+            batch = dict(failed[start:start + BATCH_SIZE])
+            reminders = list(
+                ContributionReminder.objects.filter(pk__in=batch, claimed_by=claimed_by).only('pk', 'attempts')
+            )
+            for reminder in reminders:
+                reminder.status = ContributionReminder.FAILED
+                reminder.attempts += 1
+                reminder.error = batch[reminder.pk][:1000]
+            ContributionReminder.objects.bulk_update(reminders, ['status', 'attempts', 'error'])
+        if len(results) < claimed:
+            # Non envoyés faute de temps : rendus pour la passe suivante
+            ContributionReminder.objects.filter(status=ContributionReminder.SENDING, claimed_by=claimed_by).update(
+                status=ContributionReminder.PENDING, claimed_by='', claimed_at=None,
+            )
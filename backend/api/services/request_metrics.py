@@ -0,0 +1,127 @@
+# backend/api/services/request_metrics.py
+"""
+Mesures par requête (nombre de requêtes SQL, temps base, temps de rendu, latence)
+et histogrammes agrégés par route, en mémoire du processus.
+
+Alimenté par api.middleware.RequestMetricsMiddleware.
+"""
+from bisect import bisect_left
+import threading
+import time
+
+# Bornes supérieures des classes des histogrammes (la dernière classe est +inf)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestTiming:
+    """
+    Mesures d'une requête. Sert aussi d'« execute wrapper » Django : chaque
+    requête SQL passe par __call__, qui la compte et la chronomètre.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.total_time = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    def stop(self):
+        self.total_time = time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'render_ms': round(self.render_time * 1000, 2),
+            'total_ms': round(self.total_time * 1000, 2),
+        }
+
+    def server_timing(self):
+        """Valeur de l'en-tête Server-Timing (durées en millisecondes)."""
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} requêtes SQL", '
+            f'render;dur={self.render_time * 1000:.2f}, '
+            f'total;dur={self.total_time * 1000:.2f}'
+        )
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        """Effectifs cumulés par borne supérieure ('+Inf' pour la dernière classe)."""
+        buckets, cumulative = {}, 0
+        for bound, count in zip((*self.bounds, '+Inf'), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {'buckets': buckets, 'count': self.count, 'sum': round(self.sum, 3)}
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.db_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.render_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.statuses = {}
+
+    def observe(self, timing, status_code):
+        self.latency_ms.observe(timing.total_time * 1000)
+        self.db_ms.observe(timing.db_time * 1000)
+        self.render_ms.observe(timing.render_time * 1000)
+        self.queries.observe(timing.queries)
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+
+    def snapshot(self):
+        return {
+            'latency_ms': self.latency_ms.snapshot(),
+            'db_ms': self.db_ms.snapshot(),
+            'render_ms': self.render_ms.snapshot(),
+            'queries': self.queries.snapshot(),
+            'statuses': dict(self.statuses),
+        }
+
+
+class RequestMetricsRegistry:
+    """Histogrammes par route ('GET api/members/<int:pk>/'), partagés par les threads du processus."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, timing, status_code):
+        with self._lock:
+            metrics = self._routes.get(route)
+            if metrics is None:
+                metrics = self._routes[route] = RouteMetrics()
+            metrics.observe(timing, status_code)
+
+    def snapshot(self):
+        with self._lock:
+            return {route: metrics.snapshot() for route, metrics in sorted(self._routes.items())}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+request_metrics = RequestMetricsRegistry()
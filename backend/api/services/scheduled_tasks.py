@@ -0,0 +1,85 @@
+# backend/api/services/scheduled_tasks.py
+"""
+Tâches récurrentes de l'association, exécutées par la commande run_scheduler.
+
+Chaque tâche reçoit l'heure de l'horloge du planificateur et retourne un
+résumé enregistré dans l'historique (JobRun.result).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from ..models import JobRun, Member
+from .berry_rules import berry_rules
+from .idempotency_service import IdempotencyService
+from .member_counters import MemberCounterService
+from .penalty_service import PenaltyService
+from .reminder_service import ContributionReminderService
+from .scheduler import Job
+from .vote_service import VoteClosingService
+
+# Durée de validité d'un code de vérification (User.is_verification_code_valid)
+VERIFICATION_CODE_TTL = timedelta(minutes=15)
+
+
+def close_expired_votes(now):
+    return VoteClosingService.close_expired(now)
+
+
+def remind_contributions(now):
+    """
+    Rappels des contributions du mois non versées, de CONTRIBUTION_REMINDER_DAYS_BEFORE
+    jours avant l'échéance de la charte Berry en vigueur jusqu'à l'échéance.
+    """
+    today = timezone.localdate(now)
+    due_day = berry_rules.for_date(today).due_day
+    if not 0 <= due_day - today.day <= settings.CONTRIBUTION_REMINDER_DAYS_BEFORE:
+        return {'skipped': f'échéance le {due_day}'}
+    return ContributionReminderService.send(today).as_dict()
+
+
+def apply_penalties(now):
+    """
+    Pénalités des retards du mois en cours et du mois précédent (versement saisi
+    après la fin du mois), pas avant PENALTIES_START_DATE : la tâche ne pénalise
+    jamais l'historique, qui se rattrape par la commande apply_penalties --since.
+    """
+    today = timezone.localdate(now)
+    since = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+    if settings.PENALTIES_START_DATE:
+        since = max(since, parse_date(settings.PENALTIES_START_DATE))
+    return PenaltyService.apply(as_of=today, since=since).as_dict()
+
+
+def purge_verification_codes(now):
+    """Efface les codes de vérification expirés."""
+    purged = get_user_model().objects.filter(code_generated_at__lt=now - VERIFICATION_CODE_TTL).update(
+        email_verification_code=None, code_generated_at=None, verification_attempts=0,
+    )
+    return {'purged': purged}
+
+
+def refresh_member_stats(now):
+    """Recalcule les compteurs des membres qui ont dérivé (écritures hors ORM...)."""
+    drifted = {item.member_id for item in MemberCounterService.find_drift()}
+    repaired = MemberCounterService.repair(Member.objects.filter(pk__in=drifted)) if drifted else 0
+    return {'repaired': repaired}
+
+
+def prune_history(now):
+    """Supprime les clés d'idempotence expirées et l'historique des tâches trop ancien."""
+    runs, _ = JobRun.objects.filter(started_at__lt=now - timedelta(days=settings.SCHEDULER_HISTORY_DAYS)).delete()
+    return {'idempotency_keys': IdempotencyService.prune(), 'job_runs': runs}
+
+
+JOBS = (
+    Job('close_expired_votes', '*/5 * * * *', close_expired_votes, 'Clôture des votes échus.'),
+    Job('remind_contributions', '0 8 * * *', remind_contributions, 'Rappel des contributions non versées.'),
+    Job('apply_penalties', '30 0 * * *', apply_penalties, 'Pénalités des retards et prêts échus.', lock_seconds=3600),
+    Job('purge_verification_codes', '*/15 * * * *', purge_verification_codes, 'Effacement des codes expirés.'),
+    Job('refresh_member_stats', '0 3 * * *', refresh_member_stats, 'Correction des compteurs des membres.'),
+    Job('prune_history', '30 3 * * *', prune_history, "Purge des clés d'idempotence et de l'historique."),
+)
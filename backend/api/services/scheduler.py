@@ -0,0 +1,264 @@
+# backend/api/services/scheduler.py
+"""
+Planificateur des tâches récurrentes (commande run_scheduler).
+
+Chaque tâche a une planification au format cron (« minute heure jour mois
+jour-de-semaine », à l'heure locale TIME_ZONE). Son état partagé est une ligne
+ScheduledJob : prochaine échéance et verrou. Un worker ne lance une tâche
+qu'après l'avoir réservée par un UPDATE conditionnel (échéance atteinte, verrou
+libre ou expiré) : si plusieurs démons tournent, un seul l'exécute. Un verrou
+expire après SCHEDULER_LOCK_SECONDS, ce qui permet de reprendre la tâche d'un
+worker arrêté en pleine exécution. Les créneaux manqués (démon arrêté) ne sont
+pas rattrapés : la tâche s'exécute une fois puis reprend sa planification.
+Le démon vérifie sa connexion avant chaque passe et après chaque tâche ; une
+erreur de base de données n'interrompt que la passe en cours.
+
+Chaque exécution est historisée (JobRun : durée, statut, résultat ou erreur)
+et mesurée (métriques Prometheus). L'horloge est injectée : FakeClock fait
+avancer le temps dans les tests sans attendre.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.db import Error as DatabaseError, close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import ScheduledJob, JobRun
+from .prometheus_metrics import observe_job_run
+
+logger = logging.getLogger(__name__)
+
+CRON_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+# Une planification qui ne tombe jamais (31 février...) est refusée au-delà de cet horizon
+MAX_YEARS_AHEAD = 5
+
+
+class SchedulerError(ValueError):
+    """Planification invalide ou tâche inconnue."""
+
+
+def _parse_cron_field(text, name, low, high):
+    values = set()
+    for item in text.split(','):
+        base, _, step = item.partition('/')
+        try:
+            step = int(step) if step else 1
+            if base == '*':
+                start, end = low, high
+            elif '-' in base:
+                start, end = (int(part) for part in base.split('-', 1))
+            else:
+                start = end = int(base)
+        except ValueError:
+            raise SchedulerError(f'Champ {name} invalide : {text!r}.')
+        if step < 1 or not low <= start <= end <= high:
+            raise SchedulerError(f'Champ {name} hors limites ({low}-{high}) : {text!r}.')
+        values.update(range(start, end + 1, step))
+    if name == 'weekday' and 7 in values:
+        # 0 et 7 désignent tous deux le dimanche
+        values = (values - {7}) | {0}
+    return frozenset(values)
+
+
+class CronSpec:
+    """Planification cron à cinq champs : listes, intervalles et pas (« */15 », « 1-5 », « 8,20 »)."""
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != len(CRON_FIELDS):
+            raise SchedulerError(f'Planification invalide {expression!r} : cinq champs attendus.')
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_cron_field(part, name, low, high) for part, (name, low, high) in zip(parts, CRON_FIELDS)
+        )
+        # Comme cron : si jour du mois et jour de semaine sont tous deux restreints, l'un ou l'autre suffit
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment):
+        """Premier créneau strictement postérieur à `moment`."""
+        start = timezone.localtime(moment).replace(tzinfo=None, second=0, microsecond=0)
+        candidate = start + timedelta(minutes=1)
+        while candidate.year <= start.year + MAX_YEARS_AHEAD:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return timezone.make_aware(candidate)
+        raise SchedulerError(f'La planification {self.expression!r} ne tombe jamais.')
+
+
+@dataclass(frozen=True)
+class Job:
+    name: str
+    schedule: str
+    # func(now) -> résultat sérialisable en JSON (enregistré dans JobRun.result)
+    func: object
+    description: str = ''
+    lock_seconds: int = None
+
+
+class SystemClock:
+
+    def now(self):
+        return timezone.now()
+
+    def sleep(self, seconds, stop=None):
+        if stop is not None:
+            stop.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+
+class FakeClock:
+    """Horloge de test : le temps n'avance que par advance() ou sleep()."""
+
+    def __init__(self, start):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def advance(self, **delta):
+        self._now += timedelta(**delta)
+
+    def sleep(self, seconds, stop=None):
+        self.advance(seconds=seconds)
+
+
+def default_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class Scheduler:
+
+    def __init__(self, jobs, clock=None, worker=None):
+        self.jobs = {job.name: job for job in jobs}
+        self.specs = {job.name: CronSpec(job.schedule) for job in jobs}
+        self.clock = clock or SystemClock()
+        self.worker = worker or default_worker_name()
+        self._synced = False
+
+    def _job(self, name):
+        try:
+            return self.jobs[name]
+        except KeyError:
+            raise SchedulerError(f'Tâche inconnue : {name}.')
+
+    def sync(self):
+        """Crée l'état des tâches nouvelles ; recale l'échéance de celles dont la planification a changé."""
+        now = self.clock.now()
+        existing = dict(ScheduledJob.objects.filter(name__in=self.jobs).values_list('name', 'schedule'))
+        for name, job in self.jobs.items():
+            if name not in existing:
+                ScheduledJob.objects.get_or_create(
+                    name=name, defaults={'schedule': job.schedule, 'next_run_at': self.specs[name].next_after(now)},
+                )
+            elif existing[name] != job.schedule:
+                ScheduledJob.objects.filter(name=name).update(
+                    schedule=job.schedule, next_run_at=self.specs[name].next_after(now),
+                )
+        self._synced = True
+
+    @staticmethod
+    def _unlocked(now):
+        return Q(locked_until__isnull=True) | Q(locked_until__lte=now)
+
+    def claim(self, name, now, force=False):
+        """Réserve la tâche pour ce worker ; False si elle n'est pas due ou qu'un autre worker la tient."""
+        job = self._job(name)
+        rows = ScheduledJob.objects.filter(self._unlocked(now), name=name)
+        if not force:
+            rows = rows.filter(next_run_at__lte=now)
+        lock_seconds = job.lock_seconds or settings.SCHEDULER_LOCK_SECONDS
+        return rows.update(locked_by=self.worker, locked_until=now + timedelta(seconds=lock_seconds)) == 1
+
+    def due(self):
+        """Noms des tâches arrivées à échéance et libres."""
+        if not self._synced:
+            self.sync()
+        now = self.clock.now()
+        return list(
+            ScheduledJob.objects.filter(self._unlocked(now), name__in=self.jobs, next_run_at__lte=now)
+            .order_by('next_run_at', 'name').values_list('name', flat=True)
+        )
+
+    def run_pending(self, after_run=None):
+        """Exécute les tâches arrivées à échéance ; retourne les JobRun enregistrés."""
+        runs = []
+        for name in self.due():
+            try:
+                run = self.run(name)
+            finally:
+                if after_run is not None:
+                    after_run()
+            if run is not None:
+                runs.append(run)
+        return runs
+
+    def run(self, name, force=False):
+        """
+        Exécute la tâche si ce worker obtient son verrou (None sinon). `force` : hors
+        planification, sans décaler la prochaine échéance.
+        """
+        job = self._job(name)
+        if not self._synced:
+            self.sync()
+        started_at = self.clock.now()
+        if not self.claim(name, started_at, force):
+            return None
+
+        status, result, error = JobRun.SUCCESS, None, ''
+        start = time.perf_counter()
+        try:
+            result = job.func(started_at)
+        except Exception as exc:
+            logger.exception("Échec de la tâche planifiée %s", name)
+            status, error = JobRun.FAILED, f'{type(exc).__name__}: {exc}'
+        duration = time.perf_counter() - start
+        finished_at = self.clock.now()
+
+        run = JobRun.objects.create(
+            job=name, worker=self.worker, started_at=started_at, finished_at=finished_at,
+            duration_ms=round(duration * 1000), status=status, result=result, error=error,
+        )
+        release = {'locked_until': None, 'last_run_at': started_at, 'last_status': status}
+        if not force:
+            release['next_run_at'] = self.specs[name].next_after(max(started_at, finished_at))
+        ScheduledJob.objects.filter(name=name, locked_by=self.worker).update(**release)
+        observe_job_run(name, status, duration)
+        logger.info("Tâche planifiée %s : %s en %d ms", name, status, run.duration_ms)
+        return run
+
+    def run_forever(self, tick=None, stop=None):
+        """Boucle du démon : une passe toutes les `tick` secondes jusqu'à ce que `stop` soit positionné."""
+        tick = tick or settings.SCHEDULER_TICK_SECONDS
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            # Hors cycle requête, Django ne vérifie ni ne recycle la connexion : on le fait à chaque passe
+            close_old_connections()
+            try:
+                self.run_pending(after_run=close_old_connections)
+            except DatabaseError:
+                # Base momentanément injoignable : la passe suivante repart d'une connexion neuve
+                logger.exception("Passe du planificateur interrompue par une erreur de base de données")
+            self.clock.sleep(tick, stop)
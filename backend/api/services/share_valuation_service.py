@@ -0,0 +1,216 @@
+# backend/api/services/share_valuation_service.py
+"""
+Évaluation des parts (Member.shares) et simulation de distribution.
+
+La valeur du fonds à une date est la somme des contributions, des intérêts
+perçus sur les prêts et des pénalités encaissées. Chaque membre détient
+contributions / SHARE_NOMINAL_VALUE parts ; les intérêts et pénalités sont
+répartis au prorata des contributions. Les montants de chaque source sont
+agrégés par membre en une requête groupée chacune, puis combinés en une seule
+passe : le coût ne dépend pas du nombre de lignes par membre.
+
+Une évaluation est enregistrée à chaque clôture mensuelle et à la demande
+(commande value_shares, POST /api/shares/valuations/). Seule une évaluation
+datée d'aujourd'hui (ou plus tard) met à jour Member.shares : une évaluation
+passée (clôture d'un mois écoulé...) n'écrit que son instantané. La simulation « que
+reçoit chaque membre si l'on distribue X » relit la dernière évaluation ; ses
+poids sont gardés en mémoire (une évaluation n'est jamais modifiée).
+"""
+from collections import OrderedDict
+from decimal import Decimal, ROUND_HALF_UP
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+
+from ..models import Member, Contribution, LoanRequest, TransactionLog, ShareValuation, MemberShareValuation
+from .statement_service import next_day_start
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+LOAN_STATUSES_EARNING = ('approved', 'repaid')
+BATCH_SIZE = 500
+# Poids des dernières évaluations simulées (membres, parts, contributions en centimes)
+WEIGHTS_CACHE_SIZE = 4
+_weights_cache = OrderedDict()
+_weights_lock = threading.Lock()
+
+
+class ShareValuationError(Exception):
+    """Évaluation ou simulation impossible (aucune évaluation, montant invalide...)."""
+
+
+def _money(value):
+    return Decimal(str(value or 0)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _cents(value):
+    return int(_money(value) * 100)
+
+
+def allocate(total_cents, weights):
+    """
+    Répartit `total_cents` au prorata de `weights` (entiers) par la méthode du
+    plus fort reste : les parts sont des centimes entiers dont la somme vaut exactement le total.
+    """
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        return [0] * len(weights)
+    quotients = [(total_cents * weight) // weight_sum for weight in weights]
+    remaining = total_cents - sum(quotients)
+    if remaining:
+        by_remainder = sorted(range(len(weights)), key=lambda i: (-((total_cents * weights[i]) % weight_sum), i))
+        for i in by_remainder[:remaining]:
+            quotients[i] += 1
+    return quotients
+
+
+def _grouped(queryset, **aggregates):
+    return {row.pop('member_id'): row for row in queryset.values('member_id').annotate(**aggregates).order_by()}
+
+
+def compute_share_values(as_of):
+    """
+    Situation de chaque membre à la date `as_of` (incluse).
+    Retourne (totaux du fonds, {member_id: {...}}).
+    """
+    nominal = Decimal(str(settings.SHARE_NOMINAL_VALUE))
+    day_after = next_day_start(as_of)
+
+    contributions = _grouped(Contribution.objects.filter(date__lte=as_of), total=Sum('amount'))
+    loans = _grouped(
+        LoanRequest.objects.filter(status__in=LOAN_STATUSES_EARNING, date_requested__lte=as_of),
+        principal=Sum('amount'),
+        interest=Sum(ExpressionWrapper(
+            F('amount') * F('interest_rate') / 100, output_field=DecimalField(max_digits=14, decimal_places=4),
+        )),
+    )
+    cash_in = _grouped(
+        TransactionLog.objects.filter(transaction_type__in=('loan_repayment', 'penalty'), date__lt=day_after),
+        repaid=Sum('amount', filter=Q(transaction_type='loan_repayment')),
+        penalties=Sum('amount', filter=Q(transaction_type='penalty')),
+    )
+
+    # Intérêts perçus : chaque remboursement couvre capital et intérêts dans la proportion due
+    interest_earned = ZERO
+    for member_id, loan in loans.items():
+        interest = _money(loan['interest'])
+        due = _money(loan['principal']) + interest
+        repaid = _money(cash_in.get(member_id, {}).get('repaid'))
+        if due > 0 and interest > 0:
+            interest_earned += _money(min(repaid, due) * interest / due)
+    penalties = sum((_money(row['penalties']) for row in cash_in.values()), ZERO)
+
+    member_ids = list(Member.objects.order_by('pk').values_list('pk', flat=True))
+    paid_cents = [_cents(contributions.get(member_id, {}).get('total')) for member_id in member_ids]
+    income_cents = allocate(_cents(interest_earned + penalties), paid_cents)
+
+    members = {}
+    for member_id, paid, income in zip(member_ids, paid_cents, income_cents):
+        paid, income = Decimal(paid).scaleb(-2), Decimal(income).scaleb(-2)
+        members[member_id] = {
+            'contributions': paid,
+            'shares': (paid / nominal).quantize(CENT, rounding=ROUND_HALF_UP),
+            'income': income,
+            'value': paid + income,
+        }
+
+    total_contributions = Decimal(sum(paid_cents)).scaleb(-2)
+    total_shares = sum((row['shares'] for row in members.values()), ZERO)
+    fund_value = total_contributions + interest_earned + penalties
+    totals = {
+        'total_contributions': total_contributions,
+        'interest_earned': interest_earned,
+        'penalties': penalties,
+        'fund_value': fund_value,
+        'total_shares': total_shares,
+        'share_value': (fund_value / total_shares).quantize(Decimal('0.0001')) if total_shares else Decimal('0'),
+        'member_count': len(members),
+    }
+    return totals, members
+
+
+class ShareValuationService:
+
+    @staticmethod
+    @transaction.atomic
+    def value(as_of=None, period_close=None, user=None):
+        """Évalue les parts et enregistre l'évaluation ; met à jour Member.shares si elle n'est pas passée."""
+        today = timezone.localdate()
+        as_of = as_of or today
+        totals, members = compute_share_values(as_of)
+        valuation = ShareValuation.objects.create(
+            as_of=as_of, period_close=period_close, created_by=user, **totals,
+        )
+        MemberShareValuation.objects.bulk_create([
+            MemberShareValuation(valuation=valuation, member_id=member_id, **row)
+            for member_id, row in members.items()
+        ], batch_size=BATCH_SIZE)
+        if as_of < today:
+            # Les parts courantes comptent des contributions postérieures à `as_of`
+            return valuation
+
+        # Seuls les membres dont le nombre de parts change sont réécrits (et changent de version)
+        current = dict(Member.objects.values_list('pk', 'shares'))
+        changed = [
+            Member(pk=member_id, shares=row['shares'])
+            for member_id, row in members.items() if current.get(member_id) != row['shares']
+        ]
+        for start in range(0, len(changed), BATCH_SIZE):
+            batch = changed[start:start + BATCH_SIZE]
+            Member.objects.bulk_update(batch, ['shares'])
+            Member.objects.filter(pk__in=[member.pk for member in batch]).update(version=F('version') + 1)
+        return valuation
+
+    @staticmethod
+    def latest():
+        return ShareValuation.objects.order_by('-as_of', '-id').first()
+
+    @staticmethod
+    def _weights(valuation):
+        # La date de création distingue deux évaluations qui auraient réutilisé le même identifiant
+        key = (valuation.pk, valuation.created_at)
+        with _weights_lock:
+            weights = _weights_cache.get(key)
+            if weights is not None:
+                _weights_cache.move_to_end(key)
+                return weights
+
+        rows = list(
+            MemberShareValuation.objects.filter(valuation_id=valuation.pk)
+            .order_by('member_id').values_list('member_id', 'shares', 'contributions')
+        )
+        weights = ([row[0] for row in rows], [row[1] for row in rows], [_cents(row[2]) for row in rows])
+        with _weights_lock:
+            _weights_cache[key] = weights
+            while len(_weights_cache) > WEIGHTS_CACHE_SIZE:
+                _weights_cache.popitem(last=False)
+        return weights
+
+    @classmethod
+    def simulate_payout(cls, amount, valuation=None):
+        """Montant reçu par chaque membre si `amount` est distribué au prorata des parts (contributions versées)."""
+        amount = _money(amount)
+        if amount <= 0:
+            raise ShareValuationError('Le montant à distribuer doit être positif.')
+        valuation = valuation or cls.latest()
+        if valuation is None:
+            raise ShareValuationError("Aucune évaluation des parts : lancez d'abord une évaluation.")
+
+        member_ids, shares, weights = cls._weights(valuation)
+        if not any(weights):
+            raise ShareValuationError("Aucune part dans l'évaluation : rien à distribuer.")
+        payouts = allocate(_cents(amount), weights)
+        return {
+            'valuation': valuation.pk,
+            'as_of': valuation.as_of,
+            'amount': amount,
+            'total_shares': valuation.total_shares,
+            'per_share': (amount / valuation.total_shares).quantize(Decimal('0.0001')) if valuation.total_shares else None,
+            'members': [
+                {'member_id': member_id, 'shares': member_shares, 'payout': Decimal(payout).scaleb(-2)}
+                for member_id, member_shares, payout in zip(member_ids, shares, payouts)
+            ],
+        }
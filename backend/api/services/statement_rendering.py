@@ -0,0 +1,84 @@
+# backend/api/services/statement_rendering.py
+"""
+Rendu HTML / PDF d'un relevé mensuel, exécuté dans les processus du pool.
+Les données arrivent sous forme de dictionnaire : aucun accès à la base ici.
+"""
+from html import escape
+import os
+
+from .pdf_writer import StreamingPDFWriter
+
+
+def _statement_lines(data):
+    """Lignes (rubrique, détail, valeur) communes au HTML et au PDF."""
+    lines = [
+        ('Score Berry', 'Score en fin de mois', str(data['berry_score'])),
+        ('Points Berry', 'Gagnés ce mois', f"+{data['points_earned']}"),
+        ('Points Berry', 'Perdus ce mois', f"-{data['points_lost']}"),
+        ('Prêt', 'Solde restant dû en fin de mois', f"{data['loan_balance']} FCFA"),
+    ]
+    for contribution in data['contributions']:
+        late = ' (en retard)' if contribution['is_late'] else ''
+        lines.append(('Contribution', f"{contribution['date']}{late}", f"{contribution['amount']} FCFA / {contribution['points']:+d} pts"))
+    for sanction in data['sanctions']:
+        lines.append(('Sanction', f"{sanction['date']} - {sanction['type']} : {sanction['reason']}", sanction['status']))
+    return lines
+
+
+def _render_html(data):
+    rows = '\n'.join(
+        f"<tr><td>{escape(section)}</td><td>{escape(detail)}</td><td>{escape(value)}</td></tr>"
+        for section, detail, value in _statement_lines(data)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <title>Relevé {data['period']} - {escape(data['member_name'])}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; color: #333; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #e5e7eb; padding: 6px 10px; text-align: left; }}
+        th {{ background: #1d4ed8; color: white; }}
+    </style>
+</head>
+<body>
+    <h1>🏦 Friendly Banks</h1>
+    <h2>Relevé de {data['period']} - {escape(data['member_name'])}</h2>
+    <table>
+        <tr><th>Rubrique</th><th>Détail</th><th>Valeur</th></tr>
+{rows}
+    </table>
+</body>
+</html>
+"""
+
+
+def _write_atomically(path, chunks):
+    # Fichier temporaire puis renommage : un relevé interrompu n'est jamais à moitié écrit
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as output:
+        for chunk in chunks:
+            output.write(chunk)
+    os.replace(tmp_path, path)
+
+
+def render_statement(data, data_hash, media_root, formats):
+    """
+    Exécuté dans un worker : écrit les fichiers du relevé et retourne
+    (member_id, empreinte, {format: chemin relatif à MEDIA_ROOT}).
+    """
+    relative_dir = os.path.join('statements', data['period'])
+    os.makedirs(os.path.join(media_root, relative_dir), exist_ok=True)
+
+    files = {}
+    for file_format in formats:
+        relative_path = os.path.join(relative_dir, f"member_{data['member_id']}.{file_format}")
+        if file_format == 'html':
+            chunks = [_render_html(data).encode('utf-8')]
+        else:
+            title = f"Relevé {data['period']} - {data['member_name']}"
+            chunks = StreamingPDFWriter(title, ['Rubrique', 'Détail', 'Valeur']).stream(_statement_lines(data))
+        _write_atomically(os.path.join(media_root, relative_path), chunks)
+        files[file_format] = relative_path
+    return data['member_id'], data_hash, files
@@ -0,0 +1,217 @@
+# backend/api/services/statement_service.py
+"""
+Relevés mensuels des membres (HTML et PDF).
+
+1. Les données du mois sont lues pour tous les membres en quelques requêtes groupées.
+2. Le rendu (statement_rendering.py) est réparti sur un pool de processus ; les
+   workers ne touchent pas à la base, ils reçoivent des dictionnaires et écrivent
+   leurs fichiers.
+3. Chaque relevé terminé est enregistré (MemberStatement) au fil de l'eau :
+   une exécution interrompue reprend là où elle s'est arrêtée, et un membre dont
+   les données n'ont pas changé (même empreinte) n'est pas régénéré.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+import hashlib
+import json
+import multiprocessing
+import os
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from ..models import Member, Contribution, LoanRequest, TransactionLog, Sanction, MemberStatement
+from .statement_rendering import render_statement
+
+# À incrémenter quand la mise en page change : tous les relevés seront régénérés
+STATEMENT_LAYOUT_VERSION = 1
+STATEMENT_FORMATS = ('html', 'pdf')
+SAVE_BATCH_SIZE = 100
+
+
+def month_bounds(period):
+    """Premier et dernier jour du mois de `period`."""
+    start = period.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+def next_day_start(day):
+    """
+    Début du lendemain de `day` (fuseau courant) : `date__lt=next_day_start(day)`
+    remplace `date__date__lte=day` sur un DateTimeField et reste utilisable par un index.
+    """
+    return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+
+def _amount(value):
+    # Les sommes SQLite perdent les décimales : format uniforme pour l'empreinte
+    return str(Decimal(value or 0).quantize(Decimal('0.01')))
+
+
+def collect_statement_data(period):
+    """
+    Données de relevé de tous les membres pour le mois, en 6 requêtes.
+    Retourne {member_id: dict sérialisable en JSON}.
+    """
+    start, end = month_bounds(period)
+
+    statements = {}
+    for member in Member.objects.values('id', 'berry_score', 'user__username', 'user__first_name', 'user__last_name'):
+        statements[member['id']] = {
+            'member_id': member['id'],
+            'member_name': f"{member['user__first_name']} {member['user__last_name']}".strip() or member['user__username'],
+            'period': start.strftime('%Y-%m'),
+            'berry_score': member['berry_score'],  # ramené à la fin du mois plus bas
+            'contributions': [],
+            'points_earned': 0,
+            'points_lost': 0,
+            'loan_balance': '0.00',
+            'sanctions': [],
+        }
+
+    contributions = (
+        Contribution.objects.filter(date__range=(start, end))
+        .order_by('date', 'id')
+        .values_list('member_id', 'date', 'amount', 'is_late', 'points_berry')
+    )
+    for member_id, day, amount, is_late, points in contributions:
+        statement = statements[member_id]
+        statement['contributions'].append({'date': day.isoformat(), 'amount': _amount(amount), 'is_late': is_late, 'points': points})
+        if points >= 0:
+            statement['points_earned'] += points
+        else:
+            statement['points_lost'] -= points
+
+    # Score en fin de mois : score actuel moins les points gagnés depuis
+    later_points = (
+        Contribution.objects.filter(date__gt=end)
+        .values('member_id').annotate(total=Sum('points_berry')).values_list('member_id', 'total')
+    )
+    for member_id, total in later_points:
+        statements[member_id]['berry_score'] -= total
+
+    # Solde de prêt à la fin du mois : prêts approuvés moins remboursements enregistrés
+    borrowed = dict(
+        LoanRequest.objects.filter(status='approved', date_requested__lte=end)
+        .values('member_id').annotate(total=Sum('amount')).values_list('member_id', 'total')
+    )
+    repaid = dict(
+        TransactionLog.objects.filter(transaction_type='loan_repayment', date__lt=next_day_start(end))
+        .values('member_id').annotate(total=Sum('amount')).values_list('member_id', 'total')
+    )
+    for member_id, total in borrowed.items():
+        balance = max(total - repaid.get(member_id, 0), Decimal('0.00'))
+        statements[member_id]['loan_balance'] = _amount(balance)
+
+    sanctions = (
+        Sanction.objects.filter(date__range=(start, end))
+        .order_by('date', 'id')
+        .values_list('member_id', 'date', 'type', 'reason', 'status')
+    )
+    for member_id, day, sanction_type, reason, sanction_status in sanctions:
+        statements[member_id]['sanctions'].append({
+            'date': day.isoformat(), 'type': sanction_type, 'reason': reason, 'status': sanction_status,
+        })
+
+    return statements
+
+
+def statement_hash(data, formats):
+    payload = json.dumps({'data': data, 'formats': sorted(formats), 'layout': STATEMENT_LAYOUT_VERSION}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MonthlyStatementService:
+    """Orchestre la génération des relevés d'un mois."""
+
+    def __init__(self, period, formats=STATEMENT_FORMATS, workers=None, force=False, media_root=None):
+        self.period = month_bounds(period)[0]
+        self.formats = tuple(formats)
+        self.workers = os.cpu_count() if workers is None else workers
+        self.force = force
+        self.media_root = str(media_root or settings.MEDIA_ROOT)
+
+    def _is_up_to_date(self, existing, data_hash):
+        if existing is None or existing['data_hash'] != data_hash:
+            return False
+        paths = [existing[f'{file_format}_file'] for file_format in self.formats]
+        return all(path and os.path.exists(os.path.join(self.media_root, path)) for path in paths)
+
+    def pending_jobs(self):
+        """Relevés à (re)générer : (données, empreinte)."""
+        statements = collect_statement_data(self.period)
+        existing = {
+            row['member_id']: row
+            for row in MemberStatement.objects.filter(period=self.period).values('member_id', 'data_hash', 'html_file', 'pdf_file')
+        }
+        jobs = []
+        for member_id, data in statements.items():
+            data_hash = statement_hash(data, self.formats)
+            if self.force or not self._is_up_to_date(existing.get(member_id), data_hash):
+                jobs.append((data, data_hash))
+        return jobs, len(statements) - len(jobs)
+
+    def _save(self, results):
+        now = timezone.now()
+        MemberStatement.objects.bulk_create(
+            [
+                MemberStatement(
+                    member_id=member_id, period=self.period, data_hash=data_hash, generated_at=now,
+                    html_file=files.get('html', ''), pdf_file=files.get('pdf', ''),
+                )
+                for member_id, data_hash, files in results
+            ],
+            update_conflicts=True,
+            unique_fields=['member', 'period'],
+            update_fields=['data_hash', 'html_file', 'pdf_file', 'generated_at'],
+        )
+
+    def _render_all(self, jobs):
+        """Génère les relevés et les retourne au fur et à mesure."""
+        if self.workers <= 1:
+            for data, data_hash in jobs:
+                yield render_statement(data, data_hash, self.media_root, self.formats)
+            return
+
+        # « spawn » : les workers repartent d'un interpréteur neuf, sans hériter des
+        # connexions à la base ; ils n'importent que statement_rendering (pas de modèles)
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [
+                executor.submit(render_statement, data, data_hash, self.media_root, self.formats)
+                for data, data_hash in jobs
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def generate(self, progress=None):
+        """Retourne (générés, ignorés car inchangés)."""
+        jobs, skipped = self.pending_jobs()
+        done, batch = 0, []
+        for result in self._render_all(jobs):
+            batch.append(result)
+            if len(batch) >= SAVE_BATCH_SIZE:
+                self._save(batch)
+                done += len(batch)
+                batch = []
+                if progress:
+                    progress(done, len(jobs))
+        if batch:
+            self._save(batch)
+            done += len(batch)
+            if progress:
+                progress(done, len(jobs))
+        return done, skipped
+
+
+def previous_month(today=None):
+    today = today or timezone.localdate()
+    return (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+
+def parse_period(value):
+    """'AAAA-MM' -> date du premier jour du mois."""
+    year, month = value.split('-')
+    return date(int(year), int(month), 1)
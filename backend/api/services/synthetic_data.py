@@ -0,0 +1,237 @@
+# backend/api/services/synthetic_data.py
+"""
+Génération d'associations synthétiques pour les benchmarks et les essais de charge.
+
+Les lignes sont insérées par bulk_create : les save() des modèles (score Berry,
+écritures comptables) ne sont pas appelés. Les champs dérivés (retard, points,
+score) sont calculés ici avec les mêmes règles que Contribution.calculate_impact ;
+le journal se reconstruit ensuite avec `manage.py backfill_ledger`.
+Le tirage est déterministe pour une graine donnée.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Member, Contribution, LoanRequest, TransactionLog, Sanction, Vote, VoteRecord
+from .member_counters import MemberCounterService
+
+User = get_user_model()
+
+DEFAULT_PREFIX = 'synth-'
+DEFAULT_PASSWORD = 'synthetic-password'
+BATCH_SIZE = 2000
+INITIAL_BERRY_SCORE = 20
+
+# Montants mensuels usuels ; 6800 et plus donnent le bonus
+CONTRIBUTION_AMOUNTS = (Decimal('2000.00'), Decimal('3500.00'), Decimal('5000.00'), Decimal('6800.00'), Decimal('10000.00'))
+LOAN_STATUSES = ('pending', 'approved', 'approved', 'rejected', 'repaid')
+VOTE_CHOICES = ('for', 'for', 'against')
+
+
+@dataclass
+class SyntheticDataSummary:
+    users: int = 0
+    members: int = 0
+    contributions: int = 0
+    loans: int = 0
+    guarantees: int = 0
+    repayments: int = 0
+    sanctions: int = 0
+    votes: int = 0
+    vote_records: int = 0
+    member_ids: list = field(default_factory=list, repr=False)
+
+    def as_dict(self):
+        return {name: value for name, value in self.__dict__.items() if name != 'member_ids'}
+
+
+def _months_back(today, count):
+    """Premiers jours des `count` derniers mois, du plus ancien au plus récent."""
+    months, month = [], today.replace(day=1)
+    for _ in range(count):
+        months.append(month)
+        month = (month - timedelta(days=1)).replace(day=1)
+    return months[::-1]
+
+
+class SyntheticDataGenerator:
+    """
+    Crée `members` membres avec `months` mois de contributions, des prêts
+    garantis par deux autres membres (et leurs remboursements), des sanctions
+    et `votes` propositions de vote auxquelles une partie des membres répond.
+    """
+
+    def __init__(self, members, months=12, votes=None, seed=0, prefix=DEFAULT_PREFIX, today=None):
+        self.members = members
+        self.months = months
+        self.votes = max(1, members // 50) if votes is None else votes
+        self.random = random.Random(seed)
+        self.prefix = prefix
+        self.today = today or timezone.localdate()
+
+    @staticmethod
+    def _bulk(model, objects):
+        return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+    @transaction.atomic
+    def generate(self):
+        summary = SyntheticDataSummary()
+        rng = self.random
+        # Un seul hachage pour tous les comptes : make_password coûte ~0,3 s
+        password = make_password(DEFAULT_PASSWORD)
+
+        users = self._bulk(User, [
+            User(
+                username=f'{self.prefix}{index}', email=f'{self.prefix}{index}@example.com',
+                first_name='Membre', last_name=str(index), password=password,
+                role='member', is_email_verified=True,
+            )
+            for index in range(self.members)
+        ])
+        # SQLite ne renvoie pas toujours les clés des lignes insérées en masse
+        user_ids = dict(User.objects.filter(username__startswith=self.prefix).values_list('username', 'id'))
+        summary.users = len(users)
+
+        members = self._bulk(Member, [
+            Member(user_id=user_ids[user.username], shares=Decimal(rng.randint(0, 20)))
+            for user in users
+        ])
+        member_ids = list(
+            Member.objects.filter(user__username__startswith=self.prefix).order_by('id').values_list('id', flat=True)
+        )
+        summary.members = len(members)
+        summary.member_ids = member_ids
+
+        scores = self._generate_contributions(member_ids, summary)
+        self._generate_loans(member_ids, summary)
+        self._generate_sanctions(member_ids, summary)
+        self._generate_votes(list(user_ids.values()), summary)
+
+        # Score final : score initial + points des contributions
+        for member_id, score in scores.items():
+            if score != INITIAL_BERRY_SCORE:
+                Member.objects.filter(pk=member_id).update(berry_score=score)
+        # bulk_create contourne Contribution.save : compteurs recalculés en une fois
+        MemberCounterService.repair(Member.objects.filter(user__username__startswith=self.prefix))
+        return summary
+
+    def _generate_contributions(self, member_ids, summary):
+        rng = self.random
+        months = _months_back(self.today, self.months)
+        scores = {member_id: INITIAL_BERRY_SCORE for member_id in member_ids}
+        batch = []
+        for member_id in member_ids:
+            first = True
+            for month in months:
+                # Quelques mois sautés, le mois en cours pas forcément encore payé
+                if rng.random() < 0.08:
+                    continue
+                last_day = (month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+                day = month.replace(day=rng.randint(1, last_day.day))
+                if day > self.today:
+                    continue
+                contribution = Contribution(member_id=member_id, amount=rng.choice(CONTRIBUTION_AMOUNTS), date=day)
+                impact = contribution.calculate_impact(is_first_contribution_ever=first)
+                contribution.is_late = impact['is_late']
+                contribution.points_berry = impact['points_berry']
+                scores[member_id] += contribution.points_berry
+                first = False
+                batch.append(contribution)
+                if len(batch) >= BATCH_SIZE:
+                    summary.contributions += len(self._bulk(Contribution, batch))
+                    batch = []
+        if batch:
+            summary.contributions += len(self._bulk(Contribution, batch))
+        return scores
+
+    def _generate_loans(self, member_ids, summary):
+        rng = self.random
+        if len(member_ids) < 3:
+            return
+        borrowers = rng.sample(member_ids, max(1, len(member_ids) // 5))
+        self._bulk(LoanRequest, [
+            LoanRequest(
+                member_id=member_id,
+                amount=Decimal(rng.randrange(50_000, 500_000, 5_000)),
+                justification='Prêt synthétique',
+                status=rng.choice(LOAN_STATUSES),
+                interest_rate=Decimal('5.00'),
+                repayment_due_date=self.today + timedelta(days=rng.randint(30, 365)),
+            )
+            for member_id in borrowers
+        ])
+        loans = list(
+            LoanRequest.objects.filter(member__user__username__startswith=self.prefix)
+            .order_by('id').values_list('id', 'member_id', 'amount', 'status')
+        )
+        summary.loans = len(loans)
+
+        # Deux garants par prêt, distincts de l'emprunteur
+        Guarantor = LoanRequest.guarantors.through
+        guarantees, repayments = [], []
+        for loan_id, borrower_id, amount, status in loans:
+            candidates = rng.sample(member_ids, 3)
+            for guarantor_id in [m for m in candidates if m != borrower_id][:2]:
+                guarantees.append(Guarantor(loanrequest_id=loan_id, member_id=guarantor_id))
+            if status in ('approved', 'repaid'):
+                share = amount if status == 'repaid' else (amount / 2).quantize(Decimal('0.01'))
+                repayments.append(TransactionLog(
+                    member_id=borrower_id, transaction_type='loan_repayment', amount=share,
+                    description=f'Remboursement du prêt #{loan_id}',
+                ))
+        summary.guarantees = len(self._bulk(Guarantor, guarantees))
+        summary.repayments = len(self._bulk(TransactionLog, repayments))
+
+    def _generate_sanctions(self, member_ids, summary):
+        rng = self.random
+        sanctioned = rng.sample(member_ids, len(member_ids) // 20)
+        summary.sanctions = len(self._bulk(Sanction, [
+            Sanction(
+                member_id=member_id, type=sanction_type, reason='Retard répété de cotisation',
+                status=rng.choice(('Vote en cours', 'Appliquée', 'Rejetée')),
+                amount=Decimal('5000.00') if sanction_type == 'Amende' else None,
+            )
+            for member_id in sanctioned
+            for sanction_type in [rng.choice(('Avertissement', 'Amende'))]
+        ]))
+
+    def _generate_votes(self, user_ids, summary):
+        rng = self.random
+        now = timezone.make_aware(datetime.combine(self.today, time(12)))
+        votes = self._bulk(Vote, [
+            Vote(
+                title=f'{self.prefix}vote {index}', description='Proposition synthétique',
+                type=rng.choice([choice for choice, _ in Vote.VOTE_TYPES]),
+                status='En cours' if index % 3 else 'Approuvé',
+                end_date=now + timedelta(days=rng.randint(-30, 30)),
+            )
+            for index in range(self.votes)
+        ])
+        vote_ids = list(Vote.objects.filter(title__startswith=f'{self.prefix}vote ').values_list('id', flat=True))
+        summary.votes = len(votes)
+
+        # Environ 60 % de participation, plafonnée pour garder un volume raisonnable
+        voters = min(len(user_ids), 500)
+        batch = []
+        for vote_id in vote_ids:
+            for user_id in rng.sample(user_ids, int(voters * 0.6)):
+                batch.append(VoteRecord(vote_proposal_id=vote_id, voter_id=user_id, choice=rng.choice(VOTE_CHOICES)))
+            if len(batch) >= BATCH_SIZE:
+                summary.vote_records += len(self._bulk(VoteRecord, batch))
+                batch = []
+        if batch:
+            summary.vote_records += len(self._bulk(VoteRecord, batch))
+
+    @staticmethod
+    @transaction.atomic
+    def clear(prefix=DEFAULT_PREFIX):
+        """Supprime les données d'une génération précédente (membres, votes et tout ce qui en dépend)."""
+        # QuerySet.delete() n'appelle pas les delete() des modèles : pas de contre-passation
+        Vote.objects.filter(title__startswith=f'{prefix}vote ').delete()
+        return User.objects.filter(username__startswith=prefix).delete()[0]
@@ -0,0 +1,131 @@
+# backend/api/services/vote_service.py
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from ..models import Sanction, SanctionVote, Vote, VoteRecord
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class VoteCastingService:
+    """
+    Enregistre les votes en une seule requête INSERT ... SELECT ... ON CONFLICT.
+
+    La contrainte unique (proposition, votant) garantit qu'un utilisateur ne vote
+    qu'une fois, même si deux requêtes arrivent en même temps. Le contrôle du
+    statut (et de la date de fin pour les votes généraux) est intégré au SELECT :
+    si la proposition est close, aucune ligne n'est insérée.
+    """
+
+    RECORDED = 'recorded'
+    DUPLICATE = 'duplicate'
+    CLOSED = 'closed'
+    NOT_FOUND = 'not_found'
+
+    @staticmethod
+    def _insert_or_ignore(record_model, fk_field, choice_field, parent_model, parent_id, voter_id, choice, conditions, params):
+        """Construit et exécute l'insertion conditionnelle. Retourne True si une ligne a été créée."""
+        record_table = connection.ops.quote_name(record_model._meta.db_table)
+        parent_table = connection.ops.quote_name(parent_model._meta.db_table)
+        fk_column = record_model._meta.get_field(fk_field).column
+        voter_column = record_model._meta.get_field('voter').column
+        choice_column = record_model._meta.get_field(choice_field).column
+
+        sql = (
+            f"INSERT INTO {record_table} ({fk_column}, {voter_column}, {choice_column}, date) "
+            f"SELECT p.id, %s, %s, %s FROM {parent_table} p "
+            f"WHERE p.id = %s AND {' AND '.join(conditions)} "
+            f"ON CONFLICT ({fk_column}, {voter_column}) DO NOTHING "
+            f"RETURNING id"
+        )
+        created_at = connection.ops.adapt_datetimefield_value(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [voter_id, choice, created_at, parent_id, *params])
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def cast_sanction_vote(sanction_id, voter, choice):
+        """Vote sur une sanction encore 'Vote en cours'."""
+        if VoteCastingService._insert_or_ignore(
+            SanctionVote, 'sanction', 'vote', Sanction, sanction_id, voter.pk, choice,
+            conditions=['p.status = %s'], params=['Vote en cours'],
+        ):
+            return VoteCastingService.RECORDED
+
+        # Chemin d'échec uniquement : on détermine la cause pour la réponse HTTP
+        sanction_status = Sanction.objects.filter(pk=sanction_id).values_list('status', flat=True).first()
+        if sanction_status is None:
+            return VoteCastingService.NOT_FOUND
+        if sanction_status != 'Vote en cours':
+            return VoteCastingService.CLOSED
+        return VoteCastingService.DUPLICATE
+
+    @staticmethod
+    def cast_proposal_vote(vote_id, voter, choice):
+        """Vote sur une proposition 'En cours' dont la date de fin n'est pas dépassée."""
+        now = timezone.now()
+        if VoteCastingService._insert_or_ignore(
+            VoteRecord, 'vote_proposal', 'choice', Vote, vote_id, voter.pk, choice,
+            conditions=['p.status = %s', 'p.end_date > %s'],
+            params=['En cours', connection.ops.adapt_datetimefield_value(now)],
+        ):
+            return VoteCastingService.RECORDED
+
+        proposal = Vote.objects.filter(pk=vote_id).values('status', 'end_date').first()
+        if proposal is None:
+            return VoteCastingService.NOT_FOUND
+        if proposal['status'] != 'En cours' or proposal['end_date'] <= now:
+            return VoteCastingService.CLOSED
+        return VoteCastingService.DUPLICATE
+
+
+class VoteClosingService:
+    """
+    Clôture les propositions dont la date de fin est passée (tâche planifiée
+    close_expired_votes). Majorité simple : plus de voix pour que contre ;
+    qualifiée : au moins deux tiers des voix exprimées ; unanimité : aucune
+    voix contre. Sans aucune voix pour, la proposition est rejetée.
+    """
+
+    APPROVED = 'Approuvé'
+    REJECTED = 'Rejeté'
+
+    @classmethod
+    def outcome(cls, required_majority, votes_for, votes_against):
+        if votes_for == 0:
+            return cls.REJECTED
+        if required_majority == 'Unanimité':
+            approved = votes_against == 0
+        elif required_majority == 'Qualifiée':
+            approved = 3 * votes_for >= 2 * (votes_for + votes_against)
+        else:
+            approved = votes_for > votes_against
+        return cls.APPROVED if approved else cls.REJECTED
+
+    @classmethod
+    @transaction.atomic
+    def close_expired(cls, now=None):
+        """Clôture les votes échus ; retourne {statut: nombre de propositions}."""
+        now = now or timezone.now()
+        expired = (
+            Vote.objects.filter(status='En cours', end_date__lte=now)
+            .annotate(
+                votes_for=Count('records', filter=Q(records__choice='for')),
+                votes_against=Count('records', filter=Q(records__choice='against')),
+            )
+            .values_list('pk', 'required_majority', 'votes_for', 'votes_against')
+        )
+        by_outcome = {cls.APPROVED: [], cls.REJECTED: []}
+        for pk, required_majority, votes_for, votes_against in expired:
+            by_outcome[cls.outcome(required_majority, votes_for, votes_against)].append(pk)
+
+        closed = {}
+        for outcome, pks in by_outcome.items():
+            # status='En cours' répété : un vote clôturé entre-temps n'est pas réécrit
+            closed[outcome] = Vote.objects.filter(pk__in=pks, status='En cours').update(
+                status=outcome, version=F('version') + 1,
+            ) if pks else 0
+        if any(closed.values()):
+            logger.info("Votes clôturés : %s", closed)
+        return closed
@@ -0,0 +1,125 @@
+"""
+Outils de test : budgets de requêtes SQL par endpoint, fournisseur de
+notifications factice.
+
+Le lanceur QueryBudgetTestRunner (settings.TEST_RUNNER) active
+QUERY_BUDGET_STRICT : toute requête de test qui dépasse le budget de sa route
+(settings.QUERY_BUDGETS) échoue avec QueryBudgetExceeded.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from .middleware import query_budget_of
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._strict_budgets = override_settings(QUERY_BUDGET_STRICT=True)
+        self._strict_budgets.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._strict_budgets.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+class QueryBudgetMixin:
+    """À combiner avec un TestCase : vérifie qu'une réponse respecte le budget déclaré de sa route."""
+
+    def assertWithinQueryBudget(self, response):
+        request = getattr(response, 'wsgi_request', None) or getattr(response, 'asgi_request', None)
+        budget = query_budget_of(request)
+        self.assertIsNotNone(budget, f"Aucun budget de requêtes déclaré pour {request.path} (settings.QUERY_BUDGETS)")
+        queries = request.request_timing.queries
+        self.assertLessEqual(queries, budget, f"{request.path} : {queries} requêtes SQL pour un budget de {budget}")
+        return queries
+
+
+class StubProviderServer:
+    """
+    Fournisseur WhatsApp / SMS factice : serveur HTTP/1.1 local (keep-alive) qui
+    enregistre les messages reçus et répond {"id": ...}. `delay` simule la latence
+    du fournisseur ; fail_next(n, status) fait échouer les n prochaines requêtes.
+
+        with StubProviderServer() as provider:
+            with override_settings(WHATSAPP_API_URL=provider.url + '/whatsapp'): ...
+    """
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.requests = []
+        self.connections = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def fail_next(self, count, status=503, headers=None):
+        with self._lock:
+            self._failures.extend([(status, headers or {})] * count)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                with stub._lock:
+                    failure = stub._failures.pop(0) if stub._failures else None
+                    if failure is None:
+                        stub.requests.append({
+                            'path': self.path, 'headers': dict(self.headers), 'json': json.loads(body or b'null'),
+                        })
+                        message_id = f'msg-{len(stub.requests)}'
+                status, headers = failure or (200, {})
+                content = json.dumps({'id': message_id} if failure is None else {'error': 'indisponible'}).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
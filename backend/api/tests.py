@@ -1,8 +1,59 @@
+import asyncio
+import io
+import json
+import logging
+import os
+import subprocess
+import smtplib
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from asgiref.sync import async_to_sync, sync_to_async
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection, transaction
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from django.contrib.auth import get_user_model
-from .models import Member, Contribution, LoanRequest, Committee, TransactionLog
+from .models import Member, Contribution, LoanRequest, Committee, TransactionLog, Sanction, SanctionVote, Vote, VoteRecord, MemberStatement, Meeting, PeriodClose, LedgerAccount, JournalEntry, IdempotencyKey, StaleVersionError, ShareValuation, PenaltyAssessment, BerryRuleSet, ScheduledJob, JobRun, ContributionReminder
+from .services.vote_service import VoteCastingService
+from .services.event_broadcaster import broadcaster
+from .services.export_service import ExportService
+from .services.statement_service import MonthlyStatementService, collect_statement_data
+from .services.ledger_service import LedgerService, UnbalancedEntryError
+from .services.idempotency_service import IdempotencyService
+from .services.request_metrics import request_metrics
+from .middleware import QueryBudgetExceeded
+from .testing import QueryBudgetMixin, StubProviderServer
+from .services.prometheus_metrics import business_metrics
+from .services.email_service import EmailVerificationService
+from .services.synthetic_data import SyntheticDataGenerator
+from .services.member_counters import MemberCounterService
+from .services.period_close_service import PeriodCloseService
+from .services.share_valuation_service import ShareValuationService, allocate
+from .services.penalty_service import PenaltyService
+from .services.berry_rules import berry_rules, publish_rule_set, BerryRulesError
+from .services.scheduler import CronSpec, FakeClock, Job, Scheduler, SchedulerError
+from .services.scheduled_tasks import apply_penalties, close_expired_votes, purge_verification_codes, remind_contributions
+from .services.reminder_service import ContributionReminderService
+from .services.notification_channels import EMAIL, SMS, WHATSAPP, EmailChannel, Notification, NotificationDispatcher
+from .log_handlers import QueueLogHandler, RedactionFilter
+from .db_routing import PrimaryReplicaRouter, ReplicaRoutingMiddleware, read_from_replica
+from prometheus_client.parser import text_string_to_metric_families
+from unittest import mock
+from openpyxl import load_workbook
+from .permissions import ROLE_PERMISSION_TABLE, ROLE_PERMISSIONS, compile_role_permissions, has_role_permission
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
 
 User = get_user_model()
 
@@ -91,3 +142,1709 @@ class FriendlyBanksAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     # Additional tests can be added for committees, transactions, exports, etc.
+
+
+class VoteCastingTestCase(APITestCase):
+    """Vote en une seule insertion : doublons -> 409, propositions closes -> 400."""
+
+    def setUp(self):
+        self.voter = User.objects.create_user(username='voter', password='voterpass', role='member')
+        self.target = Member.objects.create(user=User.objects.create_user(username='target', password='targetpass', role='member'))
+        self.sanction = Sanction.objects.create(member=self.target, type='Avertissement', reason='Retard répété')
+        self.proposal = Vote.objects.create(
+            title='Nouvelle règle', description='Proposition', type='Règle',
+            end_date=timezone.now() + timedelta(days=3),
+        )
+        self.client.force_authenticate(user=self.voter)
+
+    def test_sanction_vote_duplicate_returns_conflict(self):
+        url = reverse('sanction-vote', args=[self.sanction.id])
+        response = self.client.post(url, {'vote': 'for'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(url, {'vote': 'against'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(SanctionVote.objects.filter(sanction=self.sanction).count(), 1)
+
+    def test_sanction_vote_closed_or_missing(self):
+        self.sanction.status = 'Appliquée'
+        self.sanction.save()
+        response = self.client.post(reverse('sanction-vote', args=[self.sanction.id]), {'vote': 'for'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('sanction-vote', args=[999999]), {'vote': 'for'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_proposal_vote_single_insert(self):
+        url = reverse('vote-vote', args=[self.proposal.id])
+        with self.assertNumQueries(1):
+            VoteCastingService.cast_proposal_vote(self.proposal.id, self.voter, 'for')
+        response = self.client.post(url, {'vote': 'for'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_proposal_vote_after_end_date_is_closed(self):
+        self.proposal.end_date = timezone.now() - timedelta(minutes=1)
+        self.proposal.save()
+        response = self.client.post(reverse('vote-vote', args=[self.proposal.id]), {'vote': 'for'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(VoteRecord.objects.exists())
+
+
+class ConcurrentVoteCastingTestCase(TransactionTestCase):
+    """Soumissions simultanées du même votant : une seule ligne, aucune IntegrityError."""
+
+    THREADS = 16
+
+    def setUp(self):
+        # Une base SQLite en mémoire ne se partage pas entre threads
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Nécessite une base de test accessible depuis plusieurs connexions.')
+
+    def test_concurrent_votes_record_exactly_once(self):
+        voter = User.objects.create_user(username='voter', password='voterpass', role='member')
+        proposal = Vote.objects.create(
+            title='Nouvelle règle', description='Proposition', type='Règle',
+            end_date=timezone.now() + timedelta(days=3),
+        )
+        barrier = threading.Barrier(self.THREADS)
+        outcomes = []
+
+        def cast():
+            try:
+                barrier.wait()
+                outcomes.append(VoteCastingService.cast_proposal_vote(proposal.id, voter, 'for'))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=cast) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count(VoteCastingService.RECORDED), 1)
+        self.assertEqual(outcomes.count(VoteCastingService.DUPLICATE), self.THREADS - 1)
+        self.assertEqual(VoteRecord.objects.filter(vote_proposal=proposal).count(), 1)
+
+
+class LiveEventsTestCase(APITestCase):
+    """Diffusion des événements temps réel depuis les chemins d'écriture."""
+
+    def setUp(self):
+        self.voter = User.objects.create_user(username='voter', password='voterpass', role='president')
+        self.member = Member.objects.create(user=self.voter)
+        self.client.force_authenticate(user=self.voter)
+
+    def _collect(self, action):
+        """Exécute `action` et retourne les messages reçus par un abonné."""
+        async def run():
+            queue = broadcaster.subscribe()
+            try:
+                await sync_to_async(action)()
+                await asyncio.sleep(0)
+                messages = []
+                while not queue.empty():
+                    messages.append(queue.get_nowait())
+                return messages
+            finally:
+                broadcaster.unsubscribe(queue)
+        return async_to_sync(run)()
+
+    def test_contribution_publishes_fund_delta(self):
+        today = timezone.now().date()
+
+        def create():
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('contribution-list'), {
+                    'member': self.member.id, 'amount': '5000.00', 'date': today.isoformat(),
+                }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        messages = self._collect(create)
+        self.assertEqual(len(messages), 1)
+        self.assertTrue(messages[0].startswith('event: fund.stats\n'))
+        self.assertIn('"total_fund_delta":5000.0', messages[0].replace(' ', ''))
+
+    def test_vote_publishes_tally_change(self):
+        proposal = Vote.objects.create(
+            title='Nouvelle règle', description='Proposition', type='Règle',
+            end_date=timezone.now() + timedelta(days=3),
+        )
+
+        def cast():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('vote-vote', args=[proposal.id]), {'vote': 'for'}, format='json')
+
+        messages = self._collect(cast)
+        self.assertEqual(len(messages), 1)
+        self.assertIn('event: vote.tally', messages[0])
+        self.assertIn('"choice": "for"', messages[0])
+
+    def test_event_stream_requires_valid_ticket(self):
+        ticket = self.client.post(reverse('event-ticket')).data['ticket']
+        token = str(AccessToken.for_user(self.voter))
+
+        async def run():
+            client = AsyncClient()
+            self.assertEqual((await client.get(reverse('event-stream'))).status_code, 401)
+            self.assertEqual((await client.get(reverse('event-stream'), {'ticket': 'invalide'})).status_code, 401)
+            # Le jeton d'accès n'est plus accepté dans l'URL
+            self.assertEqual((await client.get(reverse('event-stream'), {'token': token})).status_code, 401)
+            with self.settings(EVENT_TICKET_TTL_SECONDS=-1):
+                self.assertEqual((await client.get(reverse('event-stream'), {'ticket': ticket})).status_code, 401)
+            self.assertEqual(
+                (await client.get(reverse('event-stream'), headers={'Authorization': f'Bearer {token}'})).status_code, 200,
+            )
+
+            response = await client.get(reverse('event-stream'), {'ticket': ticket})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            chunks = response.streaming_content
+            self.assertEqual(await anext(chunks), b'retry: 5000\n\n')
+            broadcaster.publish('sanction.created', {'id': 1})
+            self.assertEqual(await anext(chunks), b'event: sanction.created\ndata: {"id": 1}\n\n')
+            await chunks.aclose()
+        async_to_sync(run)()
+
+
+class AsyncReadEndpointsTestCase(APITestCase):
+    """Lectures asynchrones : mêmes réponses que les vues DRF, servies par le gestionnaire ASGI."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='readerpass', role='member', first_name='Awa')
+        self.member = Member.objects.create(user=self.user, berry_score=42)
+        Contribution.objects.create(member=self.member, amount=5000, date=timezone.now().date())
+        self.proposal = Vote.objects.create(
+            title='Nouvelle règle', description='Proposition', type='Règle',
+            end_date=timezone.now() + timedelta(days=3),
+        )
+        VoteRecord.objects.create(vote_proposal=self.proposal, voter=self.user, choice='for')
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def _aget(self, url):
+        async def run():
+            return await AsyncClient().get(url, headers=self.headers)
+        return async_to_sync(run)()
+
+    def test_dashboard_stats(self):
+        response = self._aget(reverse('dashboard-stats'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['berry_points'], 42)  # première contribution sous le seuil : 0 point
+        self.assertEqual(data['fund_status']['total_fund'], 5000.0)
+        self.assertEqual(data['fund_status']['monthly_contributions'], 5000.0)
+        self.assertEqual(data['fund_status']['active_members'], 1)
+
+    def test_profile_and_berry_score(self):
+        self.assertEqual(self._aget(reverse('user-profile')).json()['firstName'], 'Awa')
+        response = self._aget(reverse('berry_score', args=[self.member.id]))
+        self.assertEqual(response.json()['member_id'], self.member.id)
+        self.assertEqual(self._aget(reverse('berry_score', args=['inconnu'])).status_code, 404)
+
+    def test_vote_list_matches_serializer(self):
+        with self.assertNumQueries(2):  # utilisateur + liste annotée
+            data = self._aget(reverse('vote-list')).json()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['votes_for'], 1)
+        self.assertEqual(data[0]['votes_against'], 0)
+        self.assertTrue(data[0]['has_voted'])
+
+    def test_requires_authentication(self):
+        self.headers = {}
+        self.assertEqual(self._aget(reverse('dashboard-stats')).status_code, 401)
+
+    def test_writes_are_delegated_to_drf_views(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.put(reverse('user-profile'), {'firstName': 'Aïcha'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(User.objects.get(pk=self.user.pk).first_name, 'Aïcha')
+
+
+class ClaimsAuthenticationTestCase(APITestCase):
+    """Le jeton porte rôle, membre et superuser : plus de requête User à chaque appel."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='claims', password='claimspass', role='president')
+        self.member = Member.objects.create(user=self.user)
+
+    def _claims_token(self):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'claims', 'password': 'claimspass'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return AccessToken(response.data['access'])
+
+    def test_token_contains_claims(self):
+        token = self._claims_token()
+        self.assertEqual(token['role'], 'president')
+        self.assertEqual(token['member_id'], self.member.id)
+        self.assertFalse(token['is_superuser'])
+
+    def test_refresh_rereads_claims_and_rejects_inactive_users(self):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'claims', 'password': 'claimspass'}, format='json')
+        refresh = response.data['refresh']
+        self.assertNotIn('role', RefreshToken(refresh))
+
+        User.objects.filter(pk=self.user.pk).update(role='member', is_superuser=False)
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data['access'])['role'], 'member')
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_without_user_query(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self._claims_token()}')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('member-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Les anciens jetons sans claims restent acceptés (chargement classique)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        with self.assertNumQueries(2):
+            self.client.get(reverse('member-list'))
+
+    def test_full_user_loaded_lazily_for_writes(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self._claims_token()}')
+        response = self.client.post(reverse('sanction-list'), {
+            'member': self.member.id, 'type': 'Avertissement', 'reason': 'Retard',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Sanction.objects.get().proposed_by, self.user)
+
+        response = self.client.put(reverse('user-profile'), {'firstName': 'Paul'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(User.objects.get(pk=self.user.pk).first_name, 'Paul')
+
+
+class RolePermissionMatrixTestCase(APITestCase):
+    """Chaque endpoint refuse (403) exactement les rôles qui n'ont pas la permission requise."""
+
+    MISSING = 999999  # identifiant inexistant : une action autorisée répond 404/400, jamais 403
+
+    ENDPOINTS = [
+        ('get', 'user-list', [], 'system_admin'),
+        ('get', 'member-list', [], 'view_members'),
+        ('put', 'member-detail', [MISSING], 'edit_members'),
+        ('delete', 'member-detail', [MISSING], 'delete_members'),
+        ('get', 'contribution-list', [], 'view_contributions'),
+        ('post', 'contribution-list', [], 'add_contributions'),
+        ('patch', 'contribution-detail', [MISSING], 'edit_contributions'),
+        ('delete', 'contribution-detail', [MISSING], 'manage_contributions'),
+        ('get', 'loanrequest-list', [], 'view_loans'),
+        ('post', 'loanrequest-list', [], 'add_loan_requests'),
+        ('patch', 'loanrequest-detail', [MISSING], 'approve_loans'),
+        ('delete', 'loanrequest-detail', [MISSING], 'manage_loans'),
+        ('get', 'committee-list', [], 'view_governance'),
+        ('post', 'committee-list', [], 'manage_governance'),
+        ('get', 'transactionlog-list', [], 'view_reports'),
+        ('post', 'transactionlog-list', [], 'add_repayments'),
+        ('get', 'sanction-detail', [MISSING], 'view_sanctions'),
+        ('post', 'sanction-list', [], 'manage_sanctions'),
+        ('post', 'sanction-vote', [MISSING], 'participate_in_votes'),
+        ('get', 'meeting-list', [], 'view_governance'),
+        ('post', 'meeting-list', [], 'organize_sessions'),
+        ('post', 'vote-list', [], 'manage_governance'),
+        ('post', 'vote-vote', [MISSING], 'participate_in_votes'),
+        ('post', 'create-member-credentials', [], 'create_members'),
+        ('put', 'update-member-role', [MISSING], 'edit_members'),
+        ('get', 'dashboard-stats', [], None),
+        ('post', 'event-ticket', [], None),
+    ]
+
+    def test_endpoints_follow_role_matrix(self):
+        for role, _ in User.ROLES:
+            user = User.objects.create_user(username=f'role_{role}', password='rolepass', role=role)
+            self.client.force_authenticate(user=user)
+            for method, name, args, permission in self.ENDPOINTS:
+                with self.subTest(role=role, method=method, endpoint=name):
+                    with transaction.atomic():
+                        response = getattr(self.client, method)(reverse(name, args=args), {}, format='json')
+                    if has_role_permission(user, permission):
+                        self.assertNotEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+                    else:
+                        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_matrix_checks_are_query_free(self):
+        user = User.objects.create_user(username='censeur', password='censeurpass', role='censeur')
+        user = User.objects.get(pk=user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(has_role_permission(user, 'approve_loans'))
+            self.assertFalse(has_role_permission(user, 'delete_members'))
+
+    def test_matrix_must_cover_every_role(self):
+        self.assertEqual(set(ROLE_PERMISSION_TABLE), {code for code, _ in User.ROLES})
+        self.assertIn('add_contributions', ROLE_PERMISSION_TABLE['president'])  # impliquée par manage_contributions
+        incomplete = {role: perms for role, perms in ROLE_PERMISSIONS.items() if role != 'guest'}
+        with self.assertRaises(ImproperlyConfigured):
+            compile_role_permissions(incomplete, {})
+
+
+class StreamingExportTestCase(APITestCase):
+    """Exports CSV / XLSX / PDF produits en flux côté serveur."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tresoriere', password='tresorierepass', role='treasurer',
+                                             first_name='Awa', last_name='Diallo')
+        self.member = Member.objects.create(user=self.user)
+        Contribution.objects.create(member=self.member, amount=5000, date=date(2025, 1, 10))
+        Contribution.objects.create(member=self.member, amount=7000, date=date(2025, 2, 10))
+        self.client.force_authenticate(user=self.user)
+
+    def _download(self, dataset, file_format, **params):
+        response = self.client.get(reverse('export', args=[dataset, file_format]), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_export_with_filters(self):
+        response, content = self._download('contributions', 'csv', date_from='2025-02-01')
+        self.assertIn('attachment; filename="contributions_', response['Content-Disposition'])
+        lines = content.decode('utf-8-sig').splitlines()
+        self.assertEqual(lines[0], 'ID,Membre,Montant,Date,En retard,Points Berry')
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Awa Diallo,7000.00,2025-02-10,Non', lines[1])
+
+        response = self.client.get(reverse('export', args=['contributions', 'csv']), {'date_from': '10/02/2025'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_xlsx_and_pdf_exports(self):
+        _, content = self._download('members', 'xlsx')
+        sheet = load_workbook(io.BytesIO(content)).active
+        self.assertEqual(sheet.cell(row=2, column=2).value, 'tresoriere')
+
+        _, content = self._download('contributions', 'pdf')
+        self.assertTrue(content.startswith(b'%PDF-1.4'))
+        self.assertTrue(content.endswith(b'%%EOF\n'))
+        self.assertIn(b'(Awa Diallo)', content)
+
+    def test_export_follows_role_matrix(self):
+        self.assertEqual(self.client.get(reverse('export', args=['loans', 'csv'])).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=User.objects.create_user(username='invite', password='invitepass', role='guest'))
+        self.assertEqual(self.client.get(reverse('export', args=['transactions', 'csv'])).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_asgi_export_is_streamed_asynchronously(self):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+        async def run():
+            response = await AsyncClient().get(reverse('export', args=['contributions', 'csv']), headers=headers)
+            return b''.join([chunk async for chunk in response])
+
+        # Django avertit (puis charge tout en mémoire) s'il reçoit un itérateur synchrone
+        with warnings.catch_warnings():
+            warnings.filterwarnings('error', message='StreamingHttpResponse must consume synchronous iterators')
+            content = async_to_sync(run)()
+        self.assertEqual(len(content.decode('utf-8-sig').splitlines()), 3)
+
+    def test_memory_stays_flat_for_one_million_rows(self):
+        def synthetic_rows(count):
+            amount, day = Decimal('5000.00'), date(2025, 1, 10)
+            for index in range(count):
+                yield (index, 'Awa Diallo', amount, day, False, 5)
+
+        headers = ['ID', 'Membre', 'Montant', 'Date', 'En retard', 'Points Berry']
+        for file_format, count in (('csv', 1_000_000), ('pdf', 20_000), ('xlsx', 5_000)):
+            with self.subTest(file_format=file_format):
+                tracemalloc.start()
+                try:
+                    size = sum(len(chunk) for chunk in ExportService.render(file_format, 'Test', headers, synthetic_rows(count)))
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                self.assertGreater(size, count)
+                # Le fichier complet ferait des dizaines de Mo ; le pic reste sous 2 Mo
+                self.assertLess(peak, 2 * 1024 * 1024)
+
+
+class MonthlyStatementTestCase(TestCase):
+    """Relevés mensuels : requêtes groupées, fichiers dans MEDIA_ROOT, reprise et saut des relevés inchangés."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(__import__('shutil').rmtree, self.media_root)
+        self.members = []
+        for index in range(3):
+            user = User.objects.create_user(username=f'membre{index}', password='membrepass', first_name=f'Membre{index}')
+            member = Member.objects.create(user=user)
+            Contribution.objects.create(member=member, amount=5000, date=date(2025, 1, 10))
+            Contribution.objects.create(member=member, amount=7000, date=date(2025, 1, 28))
+            self.members.append(member)
+        loan = LoanRequest.objects.create(member=self.members[0], amount=50000, justification='Études', status='approved')
+        repayment = TransactionLog.objects.create(member=self.members[0], transaction_type='loan_repayment', amount=20000)
+        # Dates automatiques (auto_now_add) ramenées dans le mois du relevé
+        LoanRequest.objects.filter(pk=loan.pk).update(date_requested=date(2025, 1, 5))
+        TransactionLog.objects.filter(pk=repayment.pk).update(date=timezone.make_aware(timezone.datetime(2025, 1, 20)))
+
+    def _service(self, **kwargs):
+        return MonthlyStatementService(date(2025, 1, 1), media_root=self.media_root, workers=1, **kwargs)
+
+    def test_data_is_collected_in_grouped_queries(self):
+        with self.assertNumQueries(6):
+            data = collect_statement_data(date(2025, 1, 1))
+        statement = data[self.members[0].id]
+        self.assertEqual(len(statement['contributions']), 2)
+        self.assertEqual(statement['points_earned'], 0)  # première contribution : pas de récompense
+        self.assertEqual(statement['points_lost'], 10)  # 2e après le 25 : -15 de retard, +5 de bonus
+        self.assertEqual(statement['loan_balance'], '30000.00')
+
+    def test_generation_is_incremental(self):
+        self.assertEqual(self._service().generate(), (3, 0))
+        statement = MemberStatement.objects.get(member=self.members[0])
+        with open(os.path.join(self.media_root, statement.html_file), encoding='utf-8') as html:
+            self.assertIn('Membre0', html.read())
+        with open(os.path.join(self.media_root, statement.pdf_file), 'rb') as pdf:
+            self.assertTrue(pdf.read().startswith(b'%PDF'))
+
+        # Rien n'a changé : aucun relevé régénéré
+        self.assertEqual(self._service().generate(), (0, 3))
+
+        # Nouvelle contribution et fichier supprimé : seuls ces deux membres sont repris
+        Contribution.objects.create(member=self.members[1], amount=5000, date=date(2025, 1, 5))
+        os.remove(os.path.join(self.media_root, statement.pdf_file))
+        self.assertEqual(self._service().generate(), (2, 1))
+        self.assertEqual(self._service(force=True).generate(), (3, 0))
+
+    def test_command_renders_in_process_pool(self):
+        with self.settings(MEDIA_ROOT=self.media_root):
+            call_command('generate_monthly_statements', month='2025-01', workers=2, formats=['html'], stdout=io.StringIO())
+        self.assertEqual(MemberStatement.objects.count(), 3)
+        self.assertFalse(MemberStatement.objects.exclude(pdf_file='').exists())
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'statements', '2025-01'))), 3)
+
+
+class PeriodCloseTestCase(APITestCase):
+    """Clôture mensuelle : instantanés figés, contributions verrouillées, rapports lus dans les clôtures."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='presidente', password='presidentepass', role='president')
+        self.member = Member.objects.create(user=self.user)
+        other = Member.objects.create(user=User.objects.create_user(username='autre', password='autrepass'))
+        Contribution.objects.create(member=self.member, amount=5000, date=date(2025, 1, 10))
+        Contribution.objects.create(member=other, amount=7000, date=date(2025, 1, 20))
+        self.february = Contribution.objects.create(member=self.member, amount=6000, date=date(2025, 2, 10))
+        self.client.force_authenticate(user=self.user)
+
+    def _meeting(self, day, meeting_type='Clôture'):
+        return Meeting.objects.create(title=f'Réunion {day}', date=day, time='18:00', type=meeting_type)
+
+    def _close(self, meeting):
+        return self.client.post(reverse('meeting-close-period', args=[meeting.id]))
+
+    def test_close_period_freezes_snapshot(self):
+        self.assertEqual(self._close(self._meeting(date(2025, 1, 30), 'Comité')).status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self._close(self._meeting(date(2025, 1, 30)))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data['closed'])
+        self.assertEqual(response.data['total_fund'], Decimal('12000.00'))
+        self.assertEqual(self._close(self._meeting(date(2025, 1, 31))).status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Février part de l'instantané de janvier
+        self._close(self._meeting(date(2025, 2, 28)))
+        february = PeriodClose.objects.get(period=date(2025, 2, 1))
+        self.assertEqual(february.total_fund, Decimal('18000.00'))
+        self.assertEqual(february.member_snapshots.get(member=self.member).balance, Decimal('11000.00'))
+
+    def test_closed_period_contributions_are_locked(self):
+        self._close(self._meeting(date(2025, 2, 28)))
+        response = self.client.post(reverse('contribution-list'), {
+            'member': self.member.id, 'amount': '5000.00', 'date': '2025-02-15',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(reverse('contribution-detail', args=[self.february.id]), {'amount': '9000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.delete(reverse('contribution-detail', args=[self.february.id]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Contribution.objects.filter(pk=self.february.pk).exists())
+
+    def test_open_month_before_a_closed_month_is_locked(self):
+        # Janvier reste ouvert, février est clôturé : ses cumuls incluent déjà janvier
+        self._close(self._meeting(date(2025, 2, 28)))
+        january = Contribution.objects.get(member=self.member, date=date(2025, 1, 10))
+        response = self.client.post(reverse('contribution-list'), {
+            'member': self.member.id, 'amount': '5000.00', 'date': '2025-01-15',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(reverse('contribution-detail', args=[january.id]), {'amount': '9000.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.delete(reverse('contribution-detail', args=[january.id])).status_code, status.HTTP_400_BAD_REQUEST)
+        # Un mois postérieur reste ouvert
+        response = self.client.post(reverse('contribution-list'), {
+            'member': self.member.id, 'amount': '5000.00', 'date': '2025-03-05',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(PeriodClose.objects.get().total_fund, Decimal('18000.00'))
+        self.assertEqual(self.client.get(reverse('period-report', args=['2025-03'])).data['total_fund'], Decimal('23000.00'))
+
+    def test_reports_read_snapshots_and_compute_open_period(self):
+        self._close(self._meeting(date(2025, 1, 30)))
+        with self.assertNumQueries(2):  # clôture + lignes des membres
+            report = self.client.get(reverse('period-report', args=['2025-01'])).data
+        self.assertTrue(report['closed'])
+        self.assertEqual(len(report['members']), 2)
+
+        report = self.client.get(reverse('period-report', args=['2025-02'])).data
+        self.assertFalse(report['closed'])
+        self.assertEqual(report['total_fund'], Decimal('18000.00'))
+        self.assertEqual(report['monthly_contributions'], Decimal('6000.00'))
+
+        history = self.client.get(reverse('fund-history'), {'from': '2025-01', 'to': '2025-02'}).data
+        self.assertEqual([(row['period'], row['closed']) for row in history], [('2025-01', True), ('2025-02', False)])
+        self.assertEqual(self.client.get(reverse('period-report', args=['janvier'])).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LedgerTestCase(APITestCase):
+    """Journal en partie double : écritures automatiques, contre-passations, balance et relevés."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tresoriere', password='tresorierepass', role='treasurer')
+        self.member = Member.objects.create(user=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def _balance(self, code):
+        return LedgerAccount.objects.get(code=code).balance
+
+    def test_contribution_edit_and_delete_are_reversed(self):
+        contribution = Contribution.objects.create(member=self.member, amount=5000, date=date(2025, 1, 10))
+        self.assertEqual(self._balance(LedgerService.CASH), Decimal('5000.00'))
+        self.assertEqual(self._balance(LedgerService.MEMBER_CONTRIBUTIONS), Decimal('5000.00'))
+
+        contribution.save()  # inchangée : pas de nouvelle écriture
+        self.assertEqual(JournalEntry.objects.count(), 1)
+
+        contribution.amount = 8000
+        contribution.save()
+        self.assertEqual(JournalEntry.objects.filter(reversal_of__isnull=False).count(), 1)
+        self.assertEqual(self._balance(LedgerService.CASH), Decimal('8000.00'))
+
+        contribution.delete()
+        self.assertEqual(self._balance(LedgerService.CASH), Decimal('0.00'))
+        self.assertEqual(JournalEntry.objects.count(), 4)
+
+    def test_loans_repayments_and_fines_are_posted(self):
+        loan = LoanRequest.objects.create(member=self.member, amount=20000, justification='Stock')
+        self.assertFalse(JournalEntry.objects.exists())  # en attente : rien de décaissé
+        loan.status = 'approved'
+        loan.save()
+        TransactionLog.objects.create(member=self.member, transaction_type='loan_repayment', amount=5000)
+        self.assertEqual(self._balance(LedgerService.LOANS), Decimal('15000.00'))
+        self.assertEqual(self._balance(LedgerService.CASH), Decimal('-15000.00'))
+
+        sanction = Sanction.objects.create(member=self.member, type='Amende', reason='Retard', amount=1000)
+        self.assertEqual(self._balance(LedgerService.FINE_INCOME), Decimal('0.00'))
+        sanction.status = 'Appliquée'
+        sanction.save()
+        self.assertEqual(self._balance(LedgerService.FINE_INCOME), Decimal('1000.00'))
+        self.assertEqual(self._balance(LedgerService.FINES_RECEIVABLE), Decimal('1000.00'))
+        self.assertTrue(LedgerService.trial_balance()['balanced'])
+
+        # Supprimer l'amende contre-passe sa créance
+        sanction.delete()
+        self.assertEqual(self._balance(LedgerService.FINE_INCOME), Decimal('0.00'))
+        self.assertEqual(self._balance(LedgerService.FINES_RECEIVABLE), Decimal('0.00'))
+        self.assertTrue(LedgerService.trial_balance()['balanced'])
+
+    def test_unbalanced_entry_is_rejected(self):
+        with self.assertRaises(UnbalancedEntryError):
+            LedgerService.post(date(2025, 1, 1), 'Erreur', 'manual', 1, [
+                (LedgerService.CASH, None, 100, 0), (LedgerService.MEMBER_CONTRIBUTIONS, None, 0, 90),
+            ])
+        with self.assertRaises(UnbalancedEntryError):
+            LedgerService.post(date(2025, 1, 1), 'Erreur', 'manual', 1, [
+                (LedgerService.CASH, None, 100, 100), (LedgerService.MEMBER_CONTRIBUTIONS, None, 0, 0),
+            ])
+        self.assertFalse(JournalEntry.objects.exists())
+
+    def test_trial_balance_and_account_statement_endpoints(self):
+        Contribution.objects.create(member=self.member, amount=5000, date=date(2025, 1, 10))
+        Contribution.objects.create(member=self.member, amount=3000, date=date(2025, 2, 10))
+
+        with self.assertNumQueries(1):  # totaux tenus à jour : une seule lecture
+            balance = self.client.get(reverse('trial-balance')).data
+        self.assertTrue(balance['balanced'])
+        self.assertEqual(balance['total_debit'], Decimal('8000.00'))
+        january = self.client.get(reverse('trial-balance'), {'as_of': '2025-01-31'}).data
+        self.assertEqual(january['total_debit'], Decimal('5000.00'))
+
+        statement = self.client.get(reverse('account-statement', args=[LedgerService.CASH]), {'from': '2025-02-01'}).data
+        self.assertEqual(statement['opening_balance'], Decimal('5000.00'))
+        self.assertEqual([line['balance'] for line in statement['lines']], [Decimal('8000.00')])
+        self.assertEqual(statement['closing_balance'], Decimal('8000.00'))
+        self.assertEqual(self.client.get(reverse('account-statement', args=['999'])).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class IdempotencyKeyTestCase(APITestCase):
+    """En-tête Idempotency-Key : une nouvelle tentative rejoue la réponse sans réécrire."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='presidente', password='presidentepass', role='president')
+        self.member = Member.objects.create(user=self.user)
+        self.client.force_authenticate(user=self.user)
+        self.payload = {'member': self.member.id, 'amount': '5000.00', 'date': timezone.localdate().isoformat()}
+
+    def _post(self, url, payload, key):
+        return self.client.post(url, payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_stored_response(self):
+        first = self._post(reverse('contribution-list'), self.payload, 'cle-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        score = Member.objects.get(pk=self.member.pk).berry_score
+
+        with self.assertNumQueries(1):  # lecture de la clé, rien n'est réexécuté
+            retry = self._post(reverse('contribution-list'), self.payload, 'cle-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json()['id'], first.data['id'])
+        self.assertEqual(Contribution.objects.count(), 1)
+        self.assertEqual(Member.objects.get(pk=self.member.pk).berry_score, score)
+
+        # Sans clé, ou avec une autre clé, la requête est bien exécutée
+        self.assertEqual(self._post(reverse('contribution-list'), self.payload, 'cle-2').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Contribution.objects.count(), 2)
+
+    def test_key_reused_for_other_request_is_rejected(self):
+        self._post(reverse('contribution-list'), self.payload, 'cle-1')
+        response = self._post(reverse('contribution-list'), dict(self.payload, amount='9000.00'), 'cle-1')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Contribution.objects.count(), 1)
+        self.assertEqual(self._post(reverse('contribution-list'), self.payload, 'x' * 300).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_member_creation_replay_does_not_store_password(self):
+        payload = {'email': 'nouveau@example.com', 'firstName': 'Nouveau', 'lastName': 'Membre', 'role': 'member'}
+        first = self._post(reverse('create-member-credentials'), payload, 'membre-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        retry = self._post(reverse('create-member-credentials'), payload, 'membre-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json()['member']['id'], first.data['member']['id'])
+        self.assertNotIn('generated_password', IdempotencyKey.objects.get(key='membre-1').response_body)
+
+    def test_expired_keys_are_pruned(self):
+        self._post(reverse('contribution-list'), self.payload, 'cle-1')
+        IdempotencyKey.objects.update(created_at=timezone.now() - IdempotencyService.ttl() - timedelta(minutes=1))
+        self.assertEqual(IdempotencyService.prune(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
+class OptimisticConcurrencyTestCase(APITestCase):
+    """Versions de ligne : ETag en lecture, If-Match obligatoire, 412 sur une version périmée."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='presidente', password='presidentepass', role='president')
+        self.member = Member.objects.create(user=self.user)
+        self.loan = LoanRequest.objects.create(member=self.member, amount=20000, justification='Stock')
+        self.client.force_authenticate(user=self.user)
+
+    def _patch_loan(self, loan_status, etag=None):
+        headers = {'HTTP_IF_MATCH': etag} if etag else {}
+        return self.client.patch(reverse('loanrequest-detail', args=[self.loan.id]), {'status': loan_status}, format='json', **headers)
+
+    def test_concurrent_loan_decisions_conflict(self):
+        etag = self.client.get(reverse('loanrequest-detail', args=[self.loan.id]))['ETag']
+        self.assertEqual(etag, '"v1"')
+        self.assertEqual(self._patch_loan('approved').status_code, 428)
+
+        # Deux membres du comité statuent à partir de la même version
+        approved = self._patch_loan('approved', etag)
+        self.assertEqual(approved.status_code, status.HTTP_200_OK)
+        self.assertEqual(approved['ETag'], '"v2"')
+        self.assertEqual(self._patch_loan('rejected', etag).status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+        self.loan.refresh_from_db()
+        self.assertEqual((self.loan.status, self.loan.version), ('approved', 2))
+        self.assertEqual(JournalEntry.objects.filter(source_type=LedgerService.LOAN).count(), 1)
+
+    def test_conditional_update_is_a_single_statement(self):
+        stale = LoanRequest.objects.get(pk=self.loan.pk)
+        self.loan.status = 'approved'
+        self.loan.save()  # sauvegarde interne : version incrémentée sans condition
+        self.assertEqual(self.loan.version, 2)
+
+        stale.expected_version = stale.version
+        stale.status = 'rejected'
+        with self.assertRaises(StaleVersionError), self.assertNumQueries(1):
+            with transaction.atomic():
+                LoanRequest.save_base(stale)
+        self.assertEqual(LoanRequest.objects.get(pk=self.loan.pk).status, 'approved')
+
+    def test_member_and_governance_updates_require_current_version(self):
+        url = reverse('update-member-role', args=[self.member.id])
+        response = self.client.put(url, {'role': 'censeur'}, format='json', HTTP_IF_MATCH='"v1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"v2"')
+        response = self.client.put(url, {'role': 'treasurer'}, format='json', HTTP_IF_MATCH='"v1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(User.objects.get(pk=self.user.pk).role, 'censeur')
+
+        sanction = Sanction.objects.create(member=self.member, type='Avertissement', reason='Retard')
+        url = reverse('sanction-detail', args=[sanction.id])
+        self.assertEqual(self.client.patch(url, {'reason': 'Absence'}, format='json', HTTP_IF_MATCH='"v7"').status_code, 412)
+        self.assertEqual(self.client.patch(url, {'reason': 'Absence'}, format='json', HTTP_IF_MATCH='*').status_code, 200)
+
+
+class RequestMetricsTestCase(QueryBudgetMixin, APITestCase):
+    """Mesures par requête : Server-Timing, histogrammes par route et budgets de requêtes SQL."""
+
+    def setUp(self):
+        request_metrics.reset()
+        self.user = User.objects.create_user(username='presidente', password='presidentepass', role='president')
+        self.members = [self.user] + [User.objects.create_user(username=f'membre{i}', password='membrepass') for i in range(4)]
+        self.members = [Member.objects.create(user=user) for user in self.members]
+        for member in self.members:
+            loan = LoanRequest.objects.create(member=member, amount=10000, justification='Stock')
+            loan.guarantors.set(self.members[:2])
+        self.client.force_authenticate(user=self.user)
+
+    def test_server_timing_and_route_histograms(self):
+        response = self.client.get(reverse('loanrequest-detail', args=[self.members[0].loan_requests.get().id]))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="2 requêtes SQL", render;dur=[\d.]+, total;dur=[\d.]+$')
+        self.client.get(reverse('loanrequest-detail', args=[self.members[1].loan_requests.get().id]))
+
+        # Agrégé par motif d'URL, pas par identifiant
+        route = request_metrics.snapshot()['GET api/loan-requests/<int:pk>/']
+        self.assertEqual(route['latency_ms']['count'], 2)
+        self.assertEqual(route['queries']['buckets']['2'], 2)
+        self.assertEqual(route['statuses'], {200: 2})
+
+    def test_list_endpoints_stay_within_budget(self):
+        self.assertWithinQueryBudget(self.client.get(reverse('loanrequest-list')))
+        self.assertWithinQueryBudget(self.client.get(reverse('member-list')))
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        response = async_to_sync(AsyncClient().get)(reverse('sanction-list'), headers=headers)
+        self.assertEqual(self.assertWithinQueryBudget(response), 2)
+
+    @override_settings(QUERY_BUDGETS={'GET loanrequest-list': 1}, QUERY_BUDGET_STRICT=True)
+    def test_budget_overrun_fails_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('loanrequest-list'))
+        with self.settings(QUERY_BUDGET_STRICT=False):
+            self.assertEqual(self.client.get(reverse('loanrequest-list')).status_code, status.HTTP_200_OK)
+
+
+@override_settings(METRICS_TOKEN='secret')
+class PrometheusMetricsTestCase(APITestCase):
+    """Endpoint /metrics : requêtes par nom d'URL, emails, connexions, indicateurs métier, agrégation multiprocessus."""
+
+    def setUp(self):
+        business_metrics.reset()
+        self.user = User.objects.create_user(username='presidente', password='presidentepass', role='president')
+        self.member = Member.objects.create(user=self.user)
+        LoanRequest.objects.create(member=self.member, amount=20000, justification='Stock')
+        Vote.objects.create(title='Règle', description='Proposition', type='Règle', end_date=timezone.now() + timedelta(days=3))
+
+    def _scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        return {
+            (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in text_string_to_metric_families(response.content.decode())
+            for sample in family.samples
+        }
+
+    def _value(self, samples, name, **labels):
+        return samples.get((name, tuple(sorted(labels.items()))), 0)
+
+    def test_requests_and_auth_events_are_counted(self):
+        before = self._scrape()
+        self.client.post(reverse('token_obtain_pair'), {'username': 'presidente', 'password': 'presidentepass'}, format='json')
+        self.client.post(reverse('token_obtain_pair'), {'username': 'presidente', 'password': 'mauvais'}, format='json')
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse('member-list'))
+        after = self._scrape()
+
+        def delta(name, **labels):
+            return self._value(after, name, **labels) - self._value(before, name, **labels)
+
+        self.assertEqual(delta('friendly_banks_auth_events_total', event='login', outcome='success'), 1)
+        self.assertEqual(delta('friendly_banks_auth_events_total', event='login', outcome='failure'), 1)
+        self.assertEqual(delta('friendly_banks_http_requests_total', method='GET', url_name='member-list', status='200'), 1)
+        self.assertEqual(delta('friendly_banks_http_request_duration_seconds_count', method='GET', url_name='member-list'), 1)
+
+    def test_email_outcomes_and_business_gauges(self):
+        before = self._scrape()
+        self.assertTrue(EmailVerificationService.send_verification_email(self.user))
+        with self.settings(EMAIL_BACKEND='api.tests.BackendInexistant'):
+            self.assertFalse(EmailVerificationService.send_welcome_email(self.user))
+        samples = self._scrape()
+        for kind, outcome in (('verification', 'sent'), ('welcome', 'failed')):
+            self.assertEqual(
+                self._value(samples, 'friendly_banks_emails_total', kind=kind, outcome=outcome)
+                - self._value(before, 'friendly_banks_emails_total', kind=kind, outcome=outcome), 1,
+            )
+        self.assertEqual(self._value(samples, 'friendly_banks_active_members'), 1)
+        self.assertEqual(self._value(samples, 'friendly_banks_open_votes'), 1)
+        self.assertEqual(self._value(samples, 'friendly_banks_pending_loans'), 1)
+        self.assertEqual(self._value(samples, 'friendly_banks_pending_loans_amount'), 20000)
+
+    def test_token_and_multiprocess_aggregation(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+        # Sans jeton configuré, /metrics n'est servi qu'en développement
+        with self.settings(METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+            with self.settings(DEBUG=True):
+                self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+        # Deux « workers » écrivent dans le répertoire partagé ; le scrape additionne
+        with tempfile.TemporaryDirectory() as directory:
+            script = (
+                "from prometheus_client import Counter; "
+                "Counter('friendly_banks_auth_events', '', ['event', 'outcome']).labels('signup', 'success').inc(2)"
+            )
+            for _ in range(2):
+                subprocess.run([sys.executable, '-c', script], env={**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory}, check=True)
+            with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+                samples = self._scrape()
+        self.assertEqual(self._value(samples, 'friendly_banks_auth_events_total', event='signup', outcome='success'), 4)
+
+
+    def test_database_pool_gauges(self):
+        class FakePool:
+            def pop_stats(self):
+                return {'pool_size': 4, 'pool_available': 1, 'requests_waiting': 2, 'pool_max': 10,
+                        'requests_errors': 1, 'connections_lost': 3}
+
+        before = self._scrape()
+        with mock.patch('api.services.prometheus_metrics.database_pools', return_value=[('default', FakePool())]):
+            samples = self._scrape()
+        self.assertEqual(self._value(samples, 'friendly_banks_db_pool_connections', alias='default'), 4)
+        self.assertEqual(self._value(samples, 'friendly_banks_db_pool_idle_connections', alias='default'), 1)
+        self.assertEqual(self._value(samples, 'friendly_banks_db_pool_waiting_requests', alias='default'), 2)
+        self.assertEqual(self._value(samples, 'friendly_banks_db_pool_max_connections', alias='default'), 10)
+        self.assertEqual(
+            self._value(samples, 'friendly_banks_db_pool_connections_lost_total', alias='default')
+            - self._value(before, 'friendly_banks_db_pool_connections_lost_total', alias='default'), 3,
+        )
+
+class SyntheticDataBenchmarkTestCase(TestCase):
+    """Générateur d'associations synthétiques et benchmark des endpoints (sortie JSON)."""
+
+    def test_generated_data_is_consistent_and_deterministic(self):
+        today = date(2025, 6, 15)
+        summary = SyntheticDataGenerator(30, months=6, votes=2, seed=7, today=today).generate()
+        self.assertEqual((summary.users, summary.members, summary.votes), (30, 30, 2))
+        self.assertEqual(Contribution.objects.count(), summary.contributions)
+        self.assertFalse(Contribution.objects.filter(date__gt=today).exists())
+
+        # Score = score initial + points des contributions, comme après recalculate_berry_points
+        for member in Member.objects.prefetch_related('contributions'):
+            self.assertEqual(member.berry_score, 20 + sum(c.points_berry for c in member.contributions.all()))
+        for loan in LoanRequest.objects.prefetch_related('guarantors'):
+            guarantors = {guarantor.pk for guarantor in loan.guarantors.all()}
+            self.assertEqual(len(guarantors), 2)
+            self.assertNotIn(loan.member_id, guarantors)
+        self.assertEqual(VoteRecord.objects.count(), summary.vote_records)
+
+        first = sorted(Contribution.objects.values_list('member__user__username', 'date', 'amount'))
+        SyntheticDataGenerator.clear()
+        self.assertFalse(Member.objects.exists() or Vote.objects.exists() or TransactionLog.objects.exists())
+        SyntheticDataGenerator(30, months=6, votes=2, seed=7, today=today).generate()
+        self.assertEqual(sorted(Contribution.objects.values_list('member__user__username', 'date', 'amount')), first)
+
+    def test_benchmark_writes_json_and_flags_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'bench.json')
+            call_command('benchmark_api', scales=[15], months=3, repeat=1, output=output, stdout=io.StringIO())
+            with open(output) as handle:
+                results = json.load(handle)
+
+            scale = results['scales']['15']
+            self.assertEqual(scale['rows']['members'], 15)
+            for key in ('GET member-list', 'GET member-detail', 'GET contribution-list', 'GET dashboard-stats'):
+                self.assertEqual(scale['endpoints'][key]['status'], 200)
+                self.assertGreaterEqual(scale['endpoints'][key]['p95_ms'], scale['endpoints'][key]['p50_ms'])
+            self.assertIn('recalculate_berry_points', scale['commands'])
+            # Tout est annulé après la mesure
+            self.assertFalse(Member.objects.exists())
+
+            # Une référence à zéro requête fait apparaître une régression
+            for row in scale['endpoints'].values():
+                row['queries'] = 0
+            baseline = os.path.join(directory, 'baseline.json')
+            with open(baseline, 'w') as handle:
+                json.dump(results, handle)
+            with self.assertRaisesMessage(CommandError, 'régression'):
+                call_command('benchmark_api', scales=[15], months=3, repeat=1, skip_commands=True,
+                             baseline=baseline, fail_on_regression=True, stdout=io.StringIO())
+
+
+class StructuredLoggingTestCase(APITestCase):
+    """Journalisation en file : JSON, rotation, secrets masqués, pas d'attente disque dans la requête."""
+
+    def _logger(self, handler):
+        logger = logging.getLogger('api.tests.journal')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_records_are_redacted_json_lines_with_rotation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'app.log')
+            handler = QueueLogHandler(filename, max_bytes=4000, backup_count=10, console=False)
+            handler.addFilter(RedactionFilter())
+            logger = self._logger(handler)
+
+            logger.info('Nouveau membre créé: %s avec mot de passe: %s', 'a@example.com', 'Xy7#secret')
+            logger.info('Appel sortant', extra={'headers': {'Authorization': 'Bearer abc.def'}, 'route': 'GET x'})
+            try:
+                raise ValueError('boum')
+            except ValueError:
+                logger.exception('Échec %s', 42)
+            for index in range(100):
+                logger.info('Ligne de remplissage %d', index)
+            handler.close()
+
+            backups = sorted((name for name in os.listdir(directory) if name != 'app.log'), key=lambda name: -int(name.rsplit('.', 1)[1]))
+            self.assertGreaterEqual(len(backups), 2)
+            records = []
+            for name in [*backups, 'app.log']:
+                with open(os.path.join(directory, name), encoding='utf-8') as log_file:
+                    records += [json.loads(line) for line in log_file]
+
+        self.assertEqual(records[0]['message'], 'Nouveau membre créé: a@example.com avec mot de passe: [REDACTED]')
+        self.assertEqual(records[1]['headers'], {'Authorization': '[REDACTED]'})
+        self.assertEqual(records[1]['route'], 'GET x')
+        self.assertEqual((records[2]['level'], records[2]['message']), ('ERROR', 'Échec 42'))
+        self.assertIn('ValueError: boum', records[2]['exception'])
+
+    def test_logging_call_does_not_wait_for_slow_handler(self):
+        written = []
+
+        class SlowHandler(logging.Handler):
+            def emit(self, record):
+                time.sleep(0.05)
+                written.append(record.getMessage())
+
+        handler = QueueLogHandler(console=False)
+        handler.listener.handlers = (SlowHandler(),)
+        logger = self._logger(handler)
+
+        start = time.perf_counter()
+        for index in range(10):
+            logger.info('Message %d', index)
+        self.assertLess(time.perf_counter() - start, 0.25)
+        handler.close()  # vide la file avant l'arrêt
+        self.assertEqual(written, [f'Message {index}' for index in range(10)])
+
+    def test_member_creation_does_not_log_password(self):
+        user = User.objects.create_user(username='presidente', password='presidentepass', role='president')
+        self.client.force_authenticate(user=user)
+        payload = {'email': 'nouveau@example.com', 'firstName': 'Nouveau', 'lastName': 'Membre', 'role': 'member'}
+        with self.assertLogs('api', level='INFO') as logs:
+            response = self.client.post(reverse('create-member-credentials'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        password = response.data['generated_password']
+        self.assertTrue(any('nouveau@example.com' in line for line in logs.output))
+        self.assertFalse(any(password in line for line in logs.output))
+
+
+class ReplicaRoutingTestCase(SimpleTestCase):
+    """Lectures sur réplique : routeur, marque « principale » après écriture, et essai sur deux bases SQLite."""
+
+    def setUp(self):
+        patcher = mock.patch('api.db_routing.replica_configured', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = PrimaryReplicaRouter()
+
+    def test_router_reads_replica_until_a_write(self):
+        self.assertEqual(self.router.db_for_read(Member), 'default')
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(Member), 'replica')
+            self.assertEqual(self.router.db_for_write(Member), 'default')
+            # Après une écriture, la suite du bloc relit la principale
+            self.assertEqual(self.router.db_for_read(Member), 'default')
+        self.assertEqual(self.router.db_for_read(Member), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'api'))
+
+    @override_settings(REPLICA_STICKY_SECONDS=60)
+    def test_user_sticks_to_primary_after_writing(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Member))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+
+        def call(method, user_id):
+            token = AccessToken()
+            token['user_id'] = user_id
+            middleware(getattr(factory, method)('/api/members/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+            return seen[-1]
+
+        self.assertEqual(call('get', 1), 'replica')
+        self.assertEqual(call('post', 1), 'default')
+        self.assertEqual(call('get', 1), 'default')  # lit ce qu'il vient d'écrire
+        self.assertEqual(call('get', 2), 'replica')  # les autres ne sont pas concernés
+        cache.clear()  # délai écoulé
+        self.assertEqual(call('get', 1), 'replica')
+
+    def test_two_sqlite_databases(self):
+        script = (
+            "import datetime, json, shutil\n"
+            "from django.test import Client\n"
+            "from api.models import User, Member, Contribution\n"
+            "from api.serializers import ClaimsTokenObtainPairSerializer\n"
+            "def headers(user): return {'Authorization': f'Bearer {ClaimsTokenObtainPairSerializer.get_token(user).access_token}'}\n"
+            "writer = User.objects.create_user(username='tresoriere', password='x', role='treasurer')\n"
+            "reader = User.objects.create_user(username='lectrice', password='x', role='treasurer')\n"
+            "member = Member.objects.create(user=writer)\n"
+            "shutil.copy(PRIMARY, REPLICA)  # réplication, puis retard\n"
+            "Contribution.objects.create(member=member, amount=5000, date=datetime.date(2025, 6, 10))\n"
+            "client = Client()\n"
+            "count = lambda user: len(client.get('/api/contributions/', headers=headers(user)).json())\n"
+            "result = {'reader_before': count(reader), 'writer_before': count(writer)}\n"
+            "post = client.post('/api/contributions/', {'member': member.id, 'amount': '5000.00', 'date': '2025-06-11'},\n"
+            "                   content_type='application/json', headers=headers(writer))\n"
+            "result.update(post=post.status_code, writer_after=count(writer), reader_after=count(reader))\n"
+            "print(json.dumps(result))\n"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            primary, replica = os.path.join(directory, 'primary.sqlite3'), os.path.join(directory, 'replica.sqlite3')
+            env = {
+                **os.environ, 'DATABASE_URL': f'sqlite:///{primary}', 'DATABASE_REPLICA_URL': f'sqlite:///{replica}',
+                'DJANGO_ALLOWED_HOSTS': 'testserver',
+            }
+            manage = [sys.executable, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'manage.py')]
+            subprocess.run([*manage, 'migrate', '-v0'], env=env, check=True)
+            script = f"PRIMARY, REPLICA = {primary!r}, {replica!r}\n" + script
+            output = subprocess.run([*manage, 'shell', '-c', script], env=env, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(result, {
+            'reader_before': 0, 'writer_before': 0,  # la réplique n'a pas encore la contribution
+            'post': 201, 'writer_after': 2,          # l'auteur relit la principale
+            'reader_after': 0,                        # les autres lisent toujours la réplique
+        })
+
+
+class DatabaseConnectionsTestCase(TransactionTestCase):
+    """Pool de connexions (configuration) et test de charge : connexions bornées quand la concurrence augmente."""
+
+    def test_pool_configuration(self):
+        from config import settings as project_settings
+
+        postgres = {'ENGINE': 'django.db.backends.postgresql', 'NAME': 'fb', 'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True}
+        with mock.patch.multiple(project_settings, DB_POOL_MAX_SIZE=8, DB_POOL_MIN_SIZE=2):
+            config = project_settings.database_config(dict(postgres))
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual((config['OPTIONS']['pool']['min_size'], config['OPTIONS']['pool']['max_size']), (2, 8))
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])  # chaque connexion prêtée est vérifiée
+
+        with mock.patch.multiple(project_settings, DB_POOL_MAX_SIZE=0, DB_PGBOUNCER=True):
+            config = project_settings.database_config(dict(postgres))
+        self.assertNotIn('OPTIONS', config)
+        self.assertTrue(config['DISABLE_SERVER_SIDE_CURSORS'])
+
+    def test_connections_stay_bounded_as_threads_scale(self):
+        user = User.objects.create_user(username='tresoriere', password='x', role='treasurer')
+        member = Member.objects.create(user=user)
+        Contribution.objects.create(member=member, amount=Decimal('5000.00'), date=date(2025, 6, 10))
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'load.json')
+            call_command('loadtest_db_connections', threads=[1, 2, 4], requests=60, username='tresoriere',
+                         output=output, stdout=io.StringIO())
+            with open(output) as handle:
+                levels = json.load(handle)['levels']
+
+        self.assertEqual([level['threads'] for level in levels], [1, 2, 4])
+        for level in levels:
+            # Une connexion par thread, réutilisée : pas une par requête
+            self.assertTrue(level['bounded'])
+            self.assertLessEqual(level['connections_opened'], level['threads'])
+
+
+class IndexUsageTestCase(TestCase):
+    """
+    Les filtres et tris des endpoints chauds passent par les index de 0011 (plan EXPLAIN).
+    Sur PostgreSQL, les parcours séquentiels sont désactivés : sur une petite table
+    le planificateur les préférerait même avec un index utilisable.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='indexed', password='pass')
+        cls.member = Member.objects.create(user=user)
+        Contribution.objects.create(member=cls.member, amount=Decimal('5000'), date=date(2026, 3, 10))
+
+    def assertUsesIndex(self, queryset, index_name):
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_month_filter_is_a_range_on_the_date_index(self):
+        from .services.statement_service import month_bounds
+        queryset = Contribution.objects.filter(date__range=month_bounds(date(2026, 3, 15)))
+        self.assertIn('BETWEEN', str(queryset.query))
+        self.assertUsesIndex(queryset, 'contribution_date_idx')
+
+    def test_member_history_uses_composite_index(self):
+        self.assertUsesIndex(
+            Contribution.objects.filter(member=self.member, date__gte=date(2026, 1, 1)).order_by('date', 'id'),
+            'contribution_member_date_idx',
+        )
+
+    def test_open_loans_use_partial_index(self):
+        self.assertUsesIndex(
+            LoanRequest.objects.filter(status='approved', date_requested__lte=timezone.now()), 'loan_approved_date_idx',
+        )
+        self.assertUsesIndex(Vote.objects.filter(status='En cours', end_date__lt=timezone.now()), 'vote_open_end_date_idx')
+
+    def test_default_orderings_use_indexes(self):
+        self.assertUsesIndex(Sanction.objects.order_by('-date')[:20], 'sanction_date_idx')
+        self.assertUsesIndex(Meeting.objects.order_by('-date', '-time')[:20], 'meeting_date_time_idx')
+        self.assertUsesIndex(
+            TransactionLog.objects.filter(transaction_type='loan_repayment', date__lt=timezone.now()),
+            'transaction_type_date_idx',
+        )
+
+
+class MemberCountersTestCase(APITestCase):
+    """Compteurs de contributions dénormalisés sur Member, tenus par les écritures et vérifiables."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin', is_staff=True, is_superuser=True)
+        self.member = Member.objects.create(user=User.objects.create_user(username='cotisant', password='pass'))
+
+    def _stored(self):
+        return Member.objects.values(*Member.COUNTER_FIELDS, 'berry_score').get(pk=self.member.pk)
+
+    def test_writes_keep_counters_in_sync(self):
+        first = Contribution.objects.create(member=self.member, amount=Decimal('5000'), date=date(2026, 1, 28))
+        # Première contribution (compteur à zéro) : pas de pénalité de retard
+        self.assertEqual(first.points_berry, 0)
+        late = Contribution.objects.create(member=self.member, amount=Decimal('7000'), date=date(2026, 2, 27))
+        self.assertEqual(late.points_berry, -10)
+        self.assertEqual(self._stored(), {
+            'contribution_count': 2, 'total_contributed': Decimal('12000'), 'last_contribution_date': date(2026, 2, 27),
+            'late_count': 2, 'berry_score': 10,
+        })
+
+        late.date = date(2026, 2, 10)
+        late.save()
+        late.delete()
+        self.assertEqual(self._stored(), {
+            'contribution_count': 1, 'total_contributed': Decimal('5000'), 'last_contribution_date': date(2026, 1, 28),
+            'late_count': 1, 'berry_score': 20,
+        })
+        self.assertEqual(MemberCounterService.find_drift(), [])
+
+    def test_check_command_reports_and_repairs_drift(self):
+        Contribution.objects.create(member=self.member, amount=Decimal('5000'), date=date(2026, 1, 10))
+        Member.objects.filter(pk=self.member.pk).update(contribution_count=7, last_contribution_date=None)
+
+        with self.assertRaisesMessage(CommandError, '1 membre(s) en écart'):
+            call_command('check_member_counters', stdout=io.StringIO())
+        output = io.StringIO()
+        call_command('check_member_counters', '--repair', stdout=output)
+        self.assertIn('1 membre(s) corrigé(s)', output.getvalue())
+        self.assertEqual(self._stored()['contribution_count'], 1)
+        self.assertEqual(self._stored()['last_contribution_date'], date(2026, 1, 10))
+        self.assertEqual(MemberCounterService.find_drift(), [])
+
+    def test_member_list_exposes_counters(self):
+        Contribution.objects.create(member=self.member, amount=Decimal('5000'), date=date(2026, 1, 10))
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('member-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        row = next(row for row in rows if row['id'] == self.member.pk)
+        self.assertEqual(row['contribution_count'], 1)
+        self.assertEqual(row['total_contributed'], '5000.00')
+        self.assertEqual(row['last_contribution_date'], '2026-01-10')
+        self.assertEqual(row['late_count'], 0)
+
+
+@override_settings(SHARE_NOMINAL_VALUE='5000')
+class ShareValuationTestCase(QueryBudgetMixin, APITestCase):
+    """Parts évaluées depuis contributions, intérêts et pénalités ; simulation de distribution au centime."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tresoriere', password='pass', role='treasurer')
+        self.borrower = Member.objects.create(user=self.user)
+        self.saver = Member.objects.create(user=User.objects.create_user(username='epargnant', password='pass'))
+        Contribution.objects.create(member=self.borrower, amount=Decimal('10000'), date=date(2025, 1, 10))
+        Contribution.objects.create(member=self.saver, amount=Decimal('30000'), date=date(2025, 1, 12))
+        LoanRequest.objects.create(member=self.borrower, amount=Decimal('100000'), justification='Commerce',
+                                   status='approved', interest_rate=Decimal('10.00'))
+        repayment = TransactionLog.objects.create(member=self.borrower, transaction_type='loan_repayment', amount=Decimal('55000'))
+        penalty = TransactionLog.objects.create(member=self.borrower, transaction_type='penalty', amount=Decimal('2000'))
+        LoanRequest.objects.update(date_requested=date(2025, 1, 5))
+        TransactionLog.objects.filter(pk__in=[repayment.pk, penalty.pk]).update(
+            date=timezone.make_aware(timezone.datetime(2025, 1, 25)),
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_valuation_distributes_income_pro_rata(self):
+        valuation = ShareValuationService.value(as_of=date(2025, 1, 31))
+        # 55 000 remboursés sur 110 000 dus : la moitié des 10 000 d'intérêts est perçue
+        self.assertEqual(valuation.interest_earned, Decimal('5000.00'))
+        self.assertEqual(valuation.penalties, Decimal('2000.00'))
+        self.assertEqual(valuation.fund_value, Decimal('47000.00'))
+        self.assertEqual(valuation.total_shares, Decimal('8.00'))
+        rows = {row.member_id: row for row in valuation.member_valuations.all()}
+        self.assertEqual((rows[self.borrower.pk].income, rows[self.saver.pk].income), (Decimal('1750.00'), Decimal('5250.00')))
+        self.assertEqual(rows[self.saver.pk].value, Decimal('35250.00'))
+        # Évaluation passée : les parts courantes ne sont pas réécrites
+        self.assertEqual(Member.objects.get(pk=self.saver.pk).shares, Decimal('0.00'))
+        ShareValuationService.value()
+        self.assertEqual(Member.objects.get(pk=self.saver.pk).shares, Decimal('6.00'))
+
+        # Une date antérieure aux encaissements ne compte que les contributions ; l'historique est conservé
+        earlier = ShareValuationService.value(as_of=date(2025, 1, 20))
+        self.assertEqual(earlier.fund_value, Decimal('40000.00'))
+        self.assertEqual(ShareValuation.objects.count(), 3)
+
+    def test_payout_simulation_is_exact_and_cheap(self):
+        self.assertEqual(allocate(100, [1, 1, 1]), [34, 33, 33])
+        self.assertEqual(self.client.get(reverse('payout-simulation'), {'amount': '100'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(reverse('share-valuation-list'), {'as_of': '2025-01-31'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(reverse('payout-simulation'), {'amount': '1000.01'})
+        self.assertWithinQueryBudget(response)
+        payouts = {row['member_id']: row['payout'] for row in response.data['members']}
+        self.assertEqual(payouts, {self.borrower.pk: Decimal('250.00'), self.saver.pk: Decimal('750.01')})
+        # Poids de l'évaluation en mémoire : seule la dernière évaluation est relue
+        with self.assertNumQueries(1):
+            self.client.get(reverse('payout-simulation'), {'amount': '500'})
+        self.assertEqual(self.client.get(reverse('payout-simulation'), {'amount': 'NaN'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_period_close_records_valuation(self):
+        meeting = Meeting.objects.create(title='Clôture de janvier', date=date(2025, 1, 31), time='18:00', type='Clôture')
+        period_close = PeriodCloseService.close_period(meeting, user=self.user)
+        valuation = period_close.share_valuation
+        self.assertEqual(valuation.as_of, date(2025, 1, 31))
+        self.assertEqual(valuation.fund_value, Decimal('47000.00'))
+        # Un mois écoulé n'écrase pas les parts courantes (contributions de février...)
+        Contribution.objects.create(member=self.saver, amount=Decimal('5000'), date=date(2025, 2, 10))
+        Member.objects.filter(pk=self.saver.pk).update(shares=Decimal('7.00'))
+        PeriodCloseService.close_period(
+            Meeting.objects.create(title='Clôture de février', date=date(2025, 2, 28), time='18:00', type='Clôture'),
+            user=self.user,
+        )
+        self.assertEqual(Member.objects.get(pk=self.saver.pk).shares, Decimal('7.00'))
+
+        detail = self.client.get(reverse('share-valuation-detail', args=[valuation.pk])).data
+        self.assertEqual(len(detail['members']), 2)
+        history = self.client.get(reverse('share-valuation-list')).data
+        self.assertEqual([row['id'] for row in history][-1], valuation.pk)
+
+
+@override_settings(
+    CONTRIBUTION_DUE_DAY=20, LATE_CONTRIBUTION_PENALTY='1000', LATE_CONTRIBUTION_BERRY_PENALTY=0,
+    OVERDUE_LOAN_PENALTY='2500', OVERDUE_LOAN_BERRY_PENALTY=10, OVERDUE_LOAN_GRACE_DAYS=5,
+)
+class PenaltyAutomationTestCase(TestCase):
+    """Pénalités par lot : sélection ensembliste, idempotence par (membre, mois, règle), réglages."""
+
+    def setUp(self):
+        self.late = Member.objects.create(user=User.objects.create_user(username='retardataire', password='pass'))
+        self.borrower = Member.objects.create(user=User.objects.create_user(username='emprunteur', password='pass'))
+        # Deux retards en mars (un seul mois pénalisé), un en avril ; le 15 est dans les temps
+        for day in (date(2026, 3, 22), date(2026, 3, 28), date(2026, 4, 21), date(2026, 4, 15)):
+            Contribution.objects.create(member=self.late, amount=Decimal('5000'), date=day)
+        LoanRequest.objects.create(member=self.borrower, amount=Decimal('50000'), justification='Stock',
+                                   status='approved', repayment_due_date=date(2026, 4, 1))
+        # Échu mais encore dans le délai de grâce au 30 avril
+        LoanRequest.objects.create(member=self.late, amount=Decimal('20000'), justification='Frais',
+                                   status='approved', repayment_due_date=date(2026, 4, 27))
+
+    def test_due_day_comes_from_settings(self):
+        self.assertTrue(Contribution.objects.get(member=self.late, date=date(2026, 3, 22)).is_late)
+        self.assertFalse(Contribution.objects.get(member=self.late, date=date(2026, 4, 15)).is_late)
+
+    def test_penalties_are_applied_once(self):
+        score = Member.objects.get(pk=self.borrower.pk).berry_score
+        summary = PenaltyService.apply(as_of=date(2026, 4, 30))
+        self.assertEqual(summary.counts, {PenaltyAssessment.LATE_CONTRIBUTION: 2, PenaltyAssessment.OVERDUE_LOAN: 1})
+
+        charges = TransactionLog.objects.filter(transaction_type='penalty_charge')
+        self.assertEqual(sorted(charges.values_list('member_id', 'amount')), sorted([
+            (self.late.pk, Decimal('1000.00')), (self.late.pk, Decimal('1000.00')), (self.borrower.pk, Decimal('2500.00')),
+        ]))
+        self.assertEqual(Member.objects.get(pk=self.borrower.pk).berry_score, score - 10)
+        # Les pénalités sont à recevoir au journal, qui reste équilibré
+        self.assertEqual(LedgerAccount.objects.get(code='758').balance, Decimal('4500.00'))
+        self.assertTrue(LedgerService.trial_balance()['balanced'])
+
+        # Relance : rien de nouveau, une sélection par règle (plus SAVEPOINT et RELEASE)
+        with self.assertNumQueries(4):
+            self.assertEqual(PenaltyService.apply(as_of=date(2026, 4, 30)).total, 0)
+        # Mois suivant : le prêt toujours échu est pénalisé pour mai (grâce passée pour le second)
+        summary = PenaltyService.apply(as_of=date(2026, 5, 10))
+        self.assertEqual(summary.counts[PenaltyAssessment.OVERDUE_LOAN], 2)
+        self.assertEqual(PenaltyAssessment.objects.count(), 5)
+
+    def test_scheduled_job_does_not_backfill_history(self):
+        # Le 10 mai : seuls les retards d'avril (mois précédent) sont repris, pas ceux de mars
+        result = apply_penalties(timezone.make_aware(timezone.datetime(2026, 5, 10, 0, 30)))
+        self.assertEqual(result['counts'][PenaltyAssessment.LATE_CONTRIBUTION], 1)
+        self.assertEqual(PenaltyAssessment.objects.get(rule=PenaltyAssessment.LATE_CONTRIBUTION).period, date(2026, 4, 1))
+
+        PenaltyAssessment.objects.all().delete()
+        with self.settings(PENALTIES_START_DATE='2026-05-01'):
+            result = apply_penalties(timezone.make_aware(timezone.datetime(2026, 5, 10, 0, 30)))
+        self.assertEqual(result['counts'][PenaltyAssessment.LATE_CONTRIBUTION], 0)
+
+    def test_command_dry_run_writes_nothing(self):
+        output = io.StringIO()
+        call_command('apply_penalties', '--as-of', '2026-04-30', '--since', '2026-04-01', '--dry-run', stdout=output)
+        self.assertIn('2 pénalité(s) à appliquer', output.getvalue())
+        self.assertFalse(PenaltyAssessment.objects.exists())
+        with self.assertRaises(CommandError):
+            call_command('apply_penalties', '--as-of', '30/04/2026', stdout=io.StringIO())
+
+
+@override_settings(CONTRIBUTION_DUE_DAY=25)
+class BerryRulesTestCase(APITestCase):
+    """Charte Berry versionnée : compilée une fois, appliquée selon la date d'effet, exposée par l'API."""
+
+    def setUp(self):
+        berry_rules.invalidate()
+        self.addCleanup(berry_rules.invalidate)
+        self.member = Member.objects.create(user=User.objects.create_user(username='berry', password='pass'))
+        self.president = User.objects.create_user(username='pres_berry', password='pass', role='president')
+
+    def test_default_rules_match_original_charter(self):
+        rule_set = berry_rules.for_date(date(2026, 3, 1))
+        self.assertEqual(rule_set.version, 0)
+        self.assertEqual(rule_set.impact(date(2026, 3, 10), Decimal('5000'), True), {'is_late': False, 'points_berry': 0})
+        self.assertEqual(rule_set.impact(date(2026, 3, 10), Decimal('5000'), False), {'is_late': False, 'points_berry': 5})
+        self.assertEqual(rule_set.impact(date(2026, 3, 26), Decimal('7000'), False), {'is_late': True, 'points_berry': -10})
+        # Chargée une fois : les appels suivants ne touchent pas la base
+        with self.assertNumQueries(0):
+            berry_rules.for_date(date(2026, 4, 1))
+
+    def test_published_version_applies_from_effective_date(self):
+        Contribution.objects.create(member=self.member, amount=Decimal('5000'), date=date(2026, 2, 5))
+        Contribution.objects.create(member=self.member, amount=Decimal('5000'), date=date(2026, 3, 12))
+        publish_rule_set(date(2026, 4, 1), 10, [
+            {'name': 'à temps', 'when': {'late': False, 'first': False}, 'points': 8},
+            {'name': 'retard', 'when': {'late': True}, 'points': -20},
+        ])
+        april = Contribution.objects.create(member=self.member, amount=Decimal('5000'), date=date(2026, 4, 12))
+        self.assertEqual((april.is_late, april.points_berry), (True, -20))
+        self.assertEqual(Contribution.objects.get(date=date(2026, 3, 12)).points_berry, 5)
+
+        call_command('recalculate_berry_points', stdout=io.StringIO())
+        self.assertEqual(Member.objects.get(pk=self.member.pk).berry_score, 20 + 0 + 5 - 20)
+        with self.assertRaises(ValueError):
+            BerryRuleSet.objects.get(version=1).save()
+        with self.assertRaises(BerryRulesError):
+            publish_rule_set(date(2026, 5, 1), 10, [{'when': {'weekday': 1}, 'points': 3}])
+
+    def test_api_lists_and_publishes_versions(self):
+        self.client.force_authenticate(user=self.member.user)
+        self.assertEqual([row['version'] for row in self.client.get(reverse('berry-rule-set-list')).data], [0])
+        payload = {'effective_from': '2026-06-01', 'due_day': 15, 'rules': [{'name': 'à temps', 'when': {'late': False}, 'points': 4}]}
+        self.assertEqual(self.client.post(reverse('berry-rule-set-list'), payload, format='json').status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.president)
+        response = self.client.post(reverse('berry-rule-set-list'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['version'], 1)
+        invalid = self.client.post(reverse('berry-rule-set-list'), {**payload, 'due_day': 40}, format='json')
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        current = self.client.get(reverse('berry-rule-set-current'), {'date': '2026-06-10'}).data
+        self.assertEqual((current['version'], current['due_day']), (1, 15))
+        self.assertEqual(self.client.get(reverse('berry-rule-set-current'), {'date': '2026-05-31'}).data['version'], 0)
+
+
+class SchedulerTestCase(TestCase):
+    """Planificateur : échéances cron, verrou par tâche, historique, avec une horloge simulée."""
+
+    def setUp(self):
+        self.clock = FakeClock(timezone.make_aware(timezone.datetime(2026, 3, 23, 7, 58)))
+        self.calls = []
+
+    def _job(self, now):
+        self.calls.append(now)
+        return {'call': len(self.calls)}
+
+    def test_cron_spec(self):
+        now = timezone.make_aware(timezone.datetime(2026, 3, 23, 10, 7))
+        self.assertEqual(CronSpec('*/15 * * * *').next_after(now), now.replace(minute=15))
+        # Le lundi 23 mars 2026 à 8 h est passé : lundi suivant
+        self.assertEqual(CronSpec('0 8 * * 1').next_after(now), now.replace(day=30, hour=8, minute=0))
+        self.assertEqual(CronSpec('0 0 1,15 * 7').next_after(now), now.replace(day=29, hour=0, minute=0))
+        for expression in ('* * *', '61 * * * *', '0 0 31 2 *'):
+            with self.assertRaises(SchedulerError):
+                CronSpec(expression).next_after(now)
+
+    def test_daemon_survives_a_database_error(self):
+        stop = threading.Event()
+
+        def job(now):
+            self.calls.append(now)
+            stop.set()
+
+        scheduler = Scheduler([Job('rappel', '* * * * *', job)], clock=self.clock, worker='a')
+        scheduler.sync()
+        with mock.patch.object(scheduler, 'due', side_effect=[OperationalError('connexion perdue'), ['rappel']]), \
+                mock.patch('api.services.scheduler.close_old_connections') as close_old:
+            scheduler.run_forever(tick=60, stop=stop)
+        # La passe en échec n'arrête pas le démon : la tâche tourne à la passe suivante
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(JobRun.objects.get().status, JobRun.SUCCESS)
+        # Avant chaque passe et après la tâche
+        self.assertEqual(close_old.call_count, 3)
+
+    def test_due_jobs_run_once_and_are_recorded(self):
+        scheduler = Scheduler([Job('rappel', '0 8 * * *', self._job)], clock=self.clock, worker='a')
+        self.assertEqual(scheduler.run_pending(), [])
+        self.clock.advance(minutes=5)
+        [run] = scheduler.run_pending()
+        self.assertEqual((run.status, run.result, run.worker), (JobRun.SUCCESS, {'call': 1}, 'a'))
+        self.assertEqual(scheduler.run_pending(), [])
+        self.clock.advance(days=1)
+        scheduler.run_pending()
+        self.assertEqual(len(self.calls), 2)
+        state = ScheduledJob.objects.get(name='rappel')
+        self.assertEqual(state.next_run_at, timezone.make_aware(timezone.datetime(2026, 3, 25, 8, 0)))
+        self.assertIsNone(state.locked_until)
+
+    def test_lock_keeps_other_workers_out_until_it_expires(self):
+        jobs = [Job('rappel', '0 8 * * *', self._job, lock_seconds=600)]
+        first, second = (Scheduler(jobs, clock=self.clock, worker=name) for name in ('a', 'b'))
+        first.sync()
+        self.clock.advance(minutes=3)
+        # Le worker a réserve la tâche puis s'arrête sans la terminer
+        self.assertEqual(first.due(), ['rappel'])
+        self.assertTrue(first.claim('rappel', self.clock.now()))
+        self.assertIsNone(second.run('rappel'))
+        self.clock.advance(minutes=11)
+        self.assertEqual(second.run('rappel').worker, 'b')
+        self.assertEqual(len(self.calls), 1)
+
+    def test_failed_job_is_recorded_and_rescheduled(self):
+        def failing(now):
+            raise RuntimeError('SMTP indisponible')
+
+        scheduler = Scheduler([Job('rappel', '*/10 * * * *', failing)], clock=self.clock, worker='a')
+        scheduler.sync()
+        self.clock.advance(minutes=2)
+        with self.assertLogs('api.services.scheduler', level='ERROR'):
+            [run] = scheduler.run_pending()
+        self.assertEqual((run.status, run.error), (JobRun.FAILED, 'RuntimeError: SMTP indisponible'))
+        self.assertEqual(ScheduledJob.objects.get(name='rappel').next_run_at.minute, 10)
+
+
+class ScheduledTasksTestCase(TestCase):
+    """Tâches planifiées : votes échus, codes de vérification expirés, rappels de contribution."""
+
+    def test_close_expired_votes(self):
+        now = timezone.now()
+        voters = [User.objects.create_user(username=f'votant{i}', password='pass') for i in range(3)]
+        simple = Vote.objects.create(title='Règle', description='-', type='Règle', end_date=now - timedelta(hours=1))
+        qualified = Vote.objects.create(title='Charte', description='-', type='Modification Charte',
+                                        required_majority='Qualifiée', end_date=now - timedelta(hours=1))
+        open_vote = Vote.objects.create(title='Prêt', description='-', type='Prêt Important', end_date=now + timedelta(days=1))
+        for voter, choice in zip(voters, ('for', 'for', 'against')):
+            VoteRecord.objects.create(vote_proposal=simple, voter=voter, choice=choice)
+        VoteRecord.objects.create(vote_proposal=qualified, voter=voters[0], choice='for')
+        VoteRecord.objects.create(vote_proposal=qualified, voter=voters[1], choice='against')
+
+        self.assertEqual(close_expired_votes(now), {'Approuvé': 1, 'Rejeté': 1})
+        self.assertEqual(Vote.objects.get(pk=simple.pk).status, 'Approuvé')
+        self.assertEqual(Vote.objects.get(pk=qualified.pk).status, 'Rejeté')
+        self.assertEqual(Vote.objects.get(pk=open_vote.pk).status, 'En cours')
+
+    def test_purge_verification_codes(self):
+        stale = User.objects.create_user(username='ancien', password='pass')
+        stale.generate_verification_code()
+        fresh = User.objects.create_user(username='recent', password='pass')
+        fresh.generate_verification_code()
+        User.objects.filter(pk=stale.pk).update(code_generated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(purge_verification_codes(timezone.now()), {'purged': 1})
+        self.assertIsNone(User.objects.get(pk=stale.pk).email_verification_code)
+        self.assertIsNotNone(User.objects.get(pk=fresh.pk).email_verification_code)
+
+    @override_settings(CONTRIBUTION_DUE_DAY=25, CONTRIBUTION_REMINDER_DAYS_BEFORE=1)
+    def test_reminders_go_to_members_who_have_not_paid(self):
+        from django.core import mail
+
+        paid = Member.objects.create(user=User.objects.create_user(username='paye', password='pass', email='paye@example.com'))
+        Member.objects.create(user=User.objects.create_user(username='oubli', password='pass', email='oubli@example.com'))
+        Contribution.objects.create(member=paid, amount=Decimal('5000'), date=date(2026, 3, 10))
+
+        self.assertIn('skipped', remind_contributions(timezone.make_aware(timezone.datetime(2026, 3, 20, 8, 0))))
+        result = remind_contributions(timezone.make_aware(timezone.datetime(2026, 3, 24, 8, 0)))
+        self.assertEqual((result['selected'], result['sent']), (1, 1))
+        self.assertEqual(mail.outbox[0].to, ['oubli@example.com'])
+        # Le lendemain (jour d'échéance) : déjà rappelé, rien n'est renvoyé
+        self.assertEqual(remind_contributions(timezone.make_aware(timezone.datetime(2026, 3, 25, 8, 0)))['selected'], 0)
+
+    def test_command_lists_and_runs_jobs(self):
+        output = io.StringIO()
+        call_command('run_scheduler', '--list', stdout=output)
+        self.assertIn('close_expired_votes', output.getvalue())
+        call_command('run_scheduler', '--run', 'purge_verification_codes', stdout=output)
+        self.assertEqual(JobRun.objects.get().job, 'purge_verification_codes')
+        with self.assertRaises(CommandError):
+            call_command('run_scheduler', '--run', 'inconnue', stdout=output)
+
+
+@override_settings(CONTRIBUTION_DUE_DAY=25, REMINDER_SMTP_CONNECTIONS=3, REMINDER_MAX_ATTEMPTS=2)
+class ContributionReminderTestCase(TestCase):
+    """Rappels en masse : sélection ensembliste, messages personnalisés, statut par destinataire."""
+
+    def setUp(self):
+        berry_rules.invalidate()
+        self.addCleanup(berry_rules.invalidate)
+        self.today = date(2026, 3, 24)
+        users = User.objects.bulk_create([
+            User(username=f'membre{i}', first_name=f'Prénom{i}', email=f'membre{i}@example.com') for i in range(40)
+        ])
+        self.members = Member.objects.bulk_create([Member(user=user) for user in users])
+        Contribution.objects.create(member=self.members[0], amount=Decimal('5000'), date=date(2026, 3, 2))
+        Contribution.objects.create(member=self.members[1], amount=Decimal('5000'), date=date(2026, 2, 24))
+
+    def test_fan_out_is_set_based_and_personalized(self):
+        from django.core import mail
+
+        # Sélection, création, attribution, relecture et statut : indépendants du nombre de membres
+        with self.assertNumQueries(5):
+            summary = ContributionReminderService.send(self.today)
+        self.assertEqual((summary.selected, summary.sent, summary.failed), (39, 39, 0))
+        self.assertEqual(len(mail.outbox), 39)
+        message = next(m for m in mail.outbox if m.to == ['membre1@example.com'])
+        self.assertIn('Bonjour Prénom1', message.body)
+        self.assertIn('24/02/2026', message.body)
+        self.assertIn('15 points Berry', message.body)
+        self.assertIn('Prénom1', message.alternatives[0][0])
+        self.assertEqual(ContributionReminder.objects.filter(status=ContributionReminder.SENT).count(), 39)
+        # Relance : personne n'est rappelé deux fois
+        self.assertEqual(ContributionReminderService.send(self.today).selected, 0)
+
+    def test_overlapping_runs_never_share_a_reminder(self):
+        from django.core import mail
+
+        # Une première passe (tâche planifiée) a réservé les rappels et les envoie encore
+        ContributionReminderService.reserve(self.today.replace(day=1))
+        claimed = ContributionReminderService.claim(self.today.replace(day=1), 'passe-planifiee')
+        self.assertEqual(len(claimed), 39)
+        # La commande lancée en même temps ne trouve rien à envoyer
+        call_command('send_contribution_reminders', '--date', '2026-03-24', stdout=io.StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+        # Passe arrêtée en plein envoi : sa réservation expire et les rappels sont repris
+        ContributionReminder.objects.update(claimed_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(ContributionReminderService.send(self.today).sent, 39)
+        self.assertEqual(len(mail.outbox), 39)
+
+    def test_failures_are_tracked_and_retried(self):
+        from django.core import mail
+        from django.core.mail.backends.locmem import EmailBackend
+
+        send_messages = EmailBackend.send_messages
+
+        def flaky(backend, messages):
+            if messages[0].to == ['membre2@example.com']:
+                raise ConnectionError('boîte indisponible')
+            return send_messages(backend, messages)
+
+        with mock.patch.object(EmailBackend, 'send_messages', flaky):
+            summary = ContributionReminderService.send(self.today)
+        self.assertEqual((summary.sent, summary.failed), (38, 1))
+        failed = ContributionReminder.objects.get(status=ContributionReminder.FAILED)
+        self.assertEqual((failed.member_id, failed.attempts), (self.members[2].pk, 1))
+        self.assertIn('boîte indisponible', failed.error)
+
+        mail.outbox.clear()
+        self.assertEqual(ContributionReminderService.send(self.today).sent, 1)
+        self.assertEqual([m.to for m in mail.outbox], [['membre2@example.com']])
+
+    def test_time_budget_defers_the_rest(self):
+        summary = ContributionReminderService.send(self.today, time_budget=0)
+        self.assertEqual((summary.sent, summary.deferred), (0, 39))
+        # Rendus pour la passe suivante
+        self.assertEqual(ContributionReminder.objects.filter(status=ContributionReminder.PENDING, claimed_by='').count(), 39)
+        # Un membre qui paie avant la passe suivante n'est plus rappelé
+        Contribution.objects.create(member=self.members[5], amount=Decimal('5000'), date=self.today)
+        output = io.StringIO()
+        call_command('send_contribution_reminders', '--date', '2026-03-24', stdout=output)
+        self.assertIn('38 envoyé(s)', output.getvalue())
+
+
+class NotificationChannelsTestCase(SimpleTestCase):
+    """Canaux email / WhatsApp / SMS contre un fournisseur local : parallélisme, keep-alive, reprises sans doublon."""
+
+    def setUp(self):
+        self.provider = StubProviderServer().start()
+        self.addCleanup(self.provider.stop)
+        overrides = override_settings(
+            WHATSAPP_API_URL=f'{self.provider.url}/whatsapp', WHATSAPP_API_TOKEN='jeton',
+            SMS_API_URL=f'{self.provider.url}/sms', SMS_API_TOKEN='',
+            NOTIFICATION_CONCURRENCY={EMAIL: 2, WHATSAPP: 3, SMS: 3},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_channels_run_concurrently_over_kept_alive_connections(self):
+        self.provider.delay = 0.2
+        notifications = [
+            Notification(channel, f'+237 6 99 00 00 {i:02d}', f'Rappel {i}')
+            for channel in (WHATSAPP, SMS) for i in range(6)
+        ]
+        start = time.perf_counter()
+        results = NotificationDispatcher(backoff=0).send_many(notifications)
+        elapsed = time.perf_counter() - start
+        self.assertTrue(all(result.ok for result in results))
+        # 12 envois de 0,2 s : 2,4 s l'un après l'autre, deux vagues de 3 par canal en parallèle
+        self.assertLess(elapsed, 1.2)
+        self.assertLessEqual(self.provider.connections, 6)
+        first = next(r for r in self.provider.requests if r['json']['message'] == 'Rappel 0' and r['path'] == '/whatsapp')
+        self.assertEqual(first['json']['to'], '237699000000')
+        self.assertEqual(first['headers']['Authorization'], 'Bearer jeton')
+
+    def test_transient_failures_are_retried_and_refusals_are_not(self):
+        dispatcher = NotificationDispatcher(backoff=0)
+        self.provider.fail_next(2, status=429)
+        [result] = dispatcher.send_many([Notification(SMS, '237600000001', 'Code 1234')])
+        self.assertEqual((result.ok, result.attempts, result.provider_id), (True, 3, 'msg-1'))
+
+        # 5xx : le message a pu partir, il n'est renvoyé que si le fournisseur dédoublonne
+        self.provider.fail_next(1, status=503)
+        [uncertain] = dispatcher.send_many([Notification(SMS, '237600000001', 'Code 1234')])
+        self.assertEqual((uncertain.ok, uncertain.attempts), (False, 1))
+        with override_settings(SMS_IDEMPOTENCY_HEADER='Idempotency-Key'):
+            self.provider.fail_next(1, status=503)
+            notification = Notification(SMS, '237600000001', 'Code 1234')
+            [result] = NotificationDispatcher(backoff=0).send_many([notification])
+        self.assertEqual((result.ok, result.attempts), (True, 2))
+        self.assertEqual(self.provider.requests[-1]['headers']['Idempotency-Key'], notification.idempotency_key)
+
+        self.provider.fail_next(1, status=400)
+        [refused] = dispatcher.send_many([Notification(SMS, '237600000001', 'Code 1234')])
+        self.assertEqual((refused.ok, refused.attempts), (False, 1))
+        with override_settings(SMS_API_URL=''):
+            [disabled] = NotificationDispatcher().send_many([Notification(SMS, '237600000001', 'Code')])
+        self.assertIn('non configuré', disabled.error)
+
+    def test_smtp_authentication_errors_are_not_retried(self):
+        error = smtplib.SMTPAuthenticationError(535, b'Identifiants invalides')
+        with mock.patch.object(EmailChannel, '_send', side_effect=error) as send:
+            [result] = NotificationDispatcher(backoff=0).send_many([Notification(EMAIL, 'awa@example.com', 'Bienvenue')])
+        self.assertEqual((result.ok, result.attempts, send.call_count), (False, 1, 1))
+        self.assertIn('Authentification SMTP', result.error)
+
+    def test_member_credentials_go_out_by_email_and_whatsapp(self):
+        from django.core import mail
+        from services.notification_service import NotificationService
+
+        results = NotificationService().send_member_credentials({
+            'firstName': 'Awa', 'lastName': 'Ndiaye', 'email': 'awa@example.com', 'phone': '+237 679 42 85 31',
+        })
+        self.assertEqual((results['email_sent'], results['whatsapp_sent'], results['errors']), (True, True, []))
+        self.assertEqual(mail.outbox[0].to, ['awa@example.com'])
+        [message] = self.provider.requests
+        self.assertEqual(message['json']['to'], '237679428531')
+        self.assertIn(results['password'], message['json']['message'])
@@ -1,6 +1,6 @@
 # backend/api/urls.py - VERSION FINALE AVEC ROUTEUR POUR VIEWSETS
 
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -21,6 +21,16 @@ from .views.auth_views import (
     resend_verification_code_view,
     check_verification_status_view
 )
+from .views.event_views import EventTicketAPIView, event_stream_view
+from .views import async_views
+from .views.export_views import ExportAPIView
+from .views.berry_rules_views import BerryRuleSetListAPIView, CurrentBerryRuleSetAPIView
+from .views.report_views import (
+    PeriodReportAPIView, FundHistoryAPIView, TrialBalanceAPIView, AccountStatementAPIView,
+    ShareValuationListAPIView, ShareValuationDetailAPIView, PayoutSimulationAPIView,
+)
+from .services.export_service import EXPORT_DATASETS
+from .services.prometheus_metrics import track_auth_event
 
 # ============================================
 # CONFIGURATION DU ROUTEUR POUR LES VIEWSETS
@@ -36,6 +46,10 @@ router.register(r'votes', views.VoteViewSet, basename='vote')
 # LISTE DES URLS
 # ============================================
 urlpatterns = [
+    # Listes de votes servies en asynchrone (déclarées avant le routeur qui garde le détail et les actions)
+    path('votes/', async_views.AsyncVoteListView.as_view(), name='vote-list'),
+    path('sanctions/', async_views.AsyncSanctionListView.as_view(), name='sanction-list'),
+
     # Inclure les URLs générées par le routeur
     path('', include(router.urls)),
 
@@ -46,7 +60,7 @@ urlpatterns = [
     path('verify-email/', verify_email_view, name='verify_email'),
     path('resend-verification/', resend_verification_code_view, name='resend_verification'),
     path('check-verification-status/', check_verification_status_view, name='check_verification_status'),
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/', track_auth_event('login')(TokenObtainPairView.as_view()), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('auth/', include('rest_framework.urls', namespace='rest_framework')),
 
@@ -65,13 +79,40 @@ urlpatterns = [
     # Autres
     path('committees/', views.CommitteeListCreateAPIView.as_view(), name='committee-list'),
     path('transactions/', views.TransactionLogListCreateAPIView.as_view(), name='transactionlog-list'),
-    path('berry-score/<str:member_id>/', views.BerryScoreAPIView.as_view(), name='berry_score'),
+    path('berry-score/<str:member_id>/', async_views.AsyncBerryScoreView.as_view(), name='berry_score'),
     
     # Profil Utilisateur
-    path('user/profile/', views.UserProfileAPIView.as_view(), name='user-profile'),
+    path('user/profile/', async_views.AsyncUserProfileView.as_view(), name='user-profile'),
     path('user/change-password/', views.ChangePasswordAPIView.as_view(), name='change-password'),
-    path('dashboard-stats/', views.DashboardStatsAPIView.as_view(), name='dashboard-stats'),
+    path('dashboard-stats/', async_views.AsyncDashboardStatsView.as_view(), name='dashboard-stats'),
+
+    # Mises à jour en direct (Server-Sent Events, servies par l'application ASGI)
+    path('events/', event_stream_view, name='event-stream'),
+    path('events/ticket/', EventTicketAPIView.as_view(), name='event-ticket'),
     
+    # Exports CSV / XLSX / PDF générés en flux côté serveur
+    re_path(
+        r'^exports/(?P<dataset>%s)\.(?P<file_format>csv|xlsx|pdf)$' % '|'.join(EXPORT_DATASETS),
+        ExportAPIView.as_view(), name='export',
+    ),
+
+    # Rapports historiques (clôtures mensuelles)
+    path('reports/periods/<str:period>/', PeriodReportAPIView.as_view(), name='period-report'),
+    path('reports/fund-history/', FundHistoryAPIView.as_view(), name='fund-history'),
+
+    # Journal en partie double
+    path('ledger/trial-balance/', TrialBalanceAPIView.as_view(), name='trial-balance'),
+    path('ledger/accounts/<str:code>/statement/', AccountStatementAPIView.as_view(), name='account-statement'),
+
+    # Charte des points Berry (règles lues par le frontend)
+    path('berry-rules/', BerryRuleSetListAPIView.as_view(), name='berry-rule-set-list'),
+    path('berry-rules/current/', CurrentBerryRuleSetAPIView.as_view(), name='berry-rule-set-current'),
+
+    # Évaluation des parts et simulation de distribution
+    path('shares/valuations/', ShareValuationListAPIView.as_view(), name='share-valuation-list'),
+    path('shares/valuations/<int:pk>/', ShareValuationDetailAPIView.as_view(), name='share-valuation-detail'),
+    path('shares/payout-simulation/', PayoutSimulationAPIView.as_view(), name='payout-simulation'),
+
     # Vues fonctionnelles
     path('members/create-with-credentials/', views.create_member_with_credentials, name='create-member-credentials'),
     path('members/<int:member_id>/update-role/', views.update_member_role, name='update-member-role'),
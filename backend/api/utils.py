@@ -2,6 +2,8 @@ import logging
 from django.core.mail import send_mail
 from django.conf import settings
 
+from .services.notification_channels import WHATSAPP, Notification, notify
+
 logger = logging.getLogger(__name__)
 
 def send_password_email(email: str, password: str):
@@ -10,12 +12,13 @@ def send_password_email(email: str, password: str):
     from_email = settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'no-reply@friendlybanks.com'
     try:
         send_mail(subject, message, from_email, [email])
-        logger.info(f'Email sent to {email}')
+        logger.info('Email sent to %s', email)
     except Exception as e:
-        logger.error(f'Failed to send email to {email}: {e}')
+        logger.error('Failed to send email to %s: %s', email, e)
 
 def send_password_whatsapp(phone: str, password: str):
-    # Placeholder for WhatsApp sending logic
-    # Real implementation requires WhatsApp Business API or third-party service
-    logger.info(f'Simulated WhatsApp message to {phone}: Your temporary password is {password}')
-    # You can integrate Twilio or other services here
+    message = f'Bonjour,\n\nVotre compte FriendlyBanks a été créé avec succès.\nVotre mot de passe temporaire est : {password}\nVeuillez le changer dès votre première connexion.\n\nL\'équipe FriendlyBanks'
+    result = notify(Notification(WHATSAPP, phone, message))
+    if result.ok:
+        logger.info('WhatsApp message sent to %s', phone)
+    return result.ok
@@ -23,4 +23,22 @@ from .auth_views import (
     verify_email_view,
     resend_verification_code_view,
     check_verification_status_view,
-)
\ No newline at end of file
+)
+
+# Flux temps réel (ASGI)
+from .event_views import event_stream_view
+
+# Lectures asynchrones (ASGI)
+from .async_views import (
+    AsyncDashboardStatsView,
+    AsyncBerryScoreView,
+    AsyncUserProfileView,
+    AsyncVoteListView,
+    AsyncSanctionListView,
+)
+
+# Exports en flux
+from .export_views import ExportAPIView
+
+# Rapports historiques
+from .report_views import PeriodReportAPIView, FundHistoryAPIView, TrialBalanceAPIView, AccountStatementAPIView
@@ -0,0 +1,200 @@
+# backend/api/views/async_views.py
+"""
+Versions asynchrones (ASGI) des lectures les plus sollicitées.
+
+Sous uvicorn, ces vues n'occupent pas de thread pendant l'attente de la base.
+Seul le GET est asynchrone ; les écritures sont déléguées à la vue DRF
+synchrone correspondante, qui garde sa validation et ses permissions.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from ..authentication import ClaimsUser, has_user_claims
+from ..permissions import has_role_permission
+from ..models import Member, Contribution, LoanRequest, Sanction, SanctionVote, Vote, VoteRecord
+from ..services.statement_service import month_bounds
+from .generic_views import UserProfileAPIView, SanctionViewSet, VoteViewSet
+import asyncio
+import logging
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+def _json(data, status=200):
+    # Même encodeur que DRF pour que les décimaux aient le même format
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+
+async def aget_authenticated_user(request):
+    """Équivalent asynchrone de ClaimsJWTAuthentication : retourne l'utilisateur ou None."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        validated_token = authentication.get_validated_token(raw_token)
+    except InvalidToken:
+        return None
+    if has_user_claims(validated_token):
+        return ClaimsUser(validated_token)
+    try:
+        user = await User.objects.aget(pk=validated_token['user_id'])
+    except (KeyError, User.DoesNotExist):
+        return None
+    return user if user.is_active else None
+
+
+class AsyncReadView(View):
+    """
+    Base des vues de lecture asynchrones.
+    - aget : à implémenter, reçoit l'utilisateur authentifié.
+    - required_permission : permission de la matrice des rôles exigée pour le GET.
+    - write_view : vue DRF synchrone qui traite les autres méthodes HTTP.
+    """
+    required_permission = None
+    write_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # L'API est authentifiée par JWT, comme les vues DRF (exemptées de CSRF)
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def get(self, request, *args, **kwargs):
+        user = await aget_authenticated_user(request)
+        if user is None:
+            return _json({'detail': "Informations d'authentification non fournies."}, status=401)
+        if not has_role_permission(user, self.required_permission):
+            return _json({'detail': "Vous n'avez pas la permission d'effectuer cette action."}, status=403)
+        return await self.aget(request, user, *args, **kwargs)
+
+    async def aget(self, request, user, *args, **kwargs):
+        raise NotImplementedError
+
+    async def _delegate(self, request, *args, **kwargs):
+        # Lu sur la classe : une fonction en attribut d'instance deviendrait une méthode liée
+        write_view = type(self).write_view
+        if write_view is None:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        return await sync_to_async(write_view)(request, *args, **kwargs)
+
+    post = put = patch = delete = _delegate
+
+
+class AsyncUserProfileView(AsyncReadView):
+    write_view = UserProfileAPIView.as_view()
+
+    async def aget(self, request, user):
+        """Récupérer le profil de l'utilisateur connecté"""
+        if isinstance(user, ClaimsUser):
+            # Le nom et l'email ne sont pas dans le jeton
+            user = await user.aload()
+        return _json({
+            'firstName': user.first_name or '',
+            'lastName': user.last_name or '',
+            'email': user.email or '',
+            'phone': user.phone or '',
+        })
+
+
+class AsyncDashboardStatsView(AsyncReadView):
+
+    async def aget(self, request, user):
+        try:
+            today = timezone.now().date()
+
+            async def berry_points():
+                # Si l'utilisateur n'est PAS un superuser, on cherche son profil membre
+                if user.is_superuser:
+                    return 0
+                score = await Member.objects.filter(user_id=user.pk).values_list('berry_score', flat=True).afirst()
+                return score or 0
+
+            # Les agrégats sont indépendants : on les lance ensemble
+            total_fund, monthly, active_members, loans, points = await asyncio.gather(
+                Contribution.objects.aaggregate(total=Sum('amount')),
+                Contribution.objects.filter(date__range=month_bounds(today)).aaggregate(total=Sum('amount')),
+                Member.objects.acount(),
+                LoanRequest.objects.filter(status='approved').acount(),
+                berry_points(),
+            )
+
+            return _json({
+                'berry_points': points,
+                'fund_status': {
+                    'total_fund': total_fund['total'] or 0,
+                    'monthly_contributions': monthly['total'] or 0,
+                    'active_members': active_members,
+                    'loans_in_repayment': loans,
+                    'liquidity_rate': 'Élevé',
+                },
+            })
+
+        except Exception as e:
+            logger.error("Erreur lors de la récupération des stats du dashboard: %s", e)
+            return _json({'error': 'Erreur interne du serveur.'}, status=500)
+
+
+class AsyncBerryScoreView(AsyncReadView):
+    required_permission = 'view_members'
+
+    async def aget(self, request, user, member_id):
+        try:
+            member = await Member.objects.select_related('user').aget(id=int(member_id))
+        except (ValueError, Member.DoesNotExist):
+            return _json({'error': 'Membre non trouvé'}, status=404)
+        return _json({
+            'member_id': member.id,
+            'berry_score': member.berry_score,
+            'member_name': member.user.get_full_name() or member.user.username,
+        })
+
+
+class AsyncVoteListView(AsyncReadView):
+    """Liste des propositions avec décomptes et has_voted calculés en une seule requête."""
+    required_permission = 'view_governance'
+    write_view = VoteViewSet.as_view({'post': 'create'})
+
+    async def aget(self, request, user):
+        queryset = Vote.objects.annotate(
+            votes_for=Count('records', filter=Q(records__choice='for')),
+            votes_against=Count('records', filter=Q(records__choice='against')),
+            has_voted=Exists(VoteRecord.objects.filter(vote_proposal=OuterRef('pk'), voter_id=user.pk)),
+        ).order_by('-created_at').values(
+            'id', 'title', 'description', 'type', 'status',
+            'required_majority', 'end_date', 'votes_for', 'votes_against', 'has_voted', 'version',
+        )
+        return _json([row async for row in queryset])
+
+
+class AsyncSanctionListView(AsyncReadView):
+    """Liste des sanctions avec décomptes et has_voted calculés en une seule requête."""
+    required_permission = 'view_sanctions'
+    write_view = SanctionViewSet.as_view({'post': 'create'})
+
+    async def aget(self, request, user):
+        queryset = Sanction.objects.annotate(
+            votes_for=Count('votes', filter=Q(votes__vote='for')),
+            votes_against=Count('votes', filter=Q(votes__vote='against')),
+            has_voted=Exists(SanctionVote.objects.filter(sanction=OuterRef('pk'), voter_id=user.pk)),
+        ).order_by('-date').values(
+            'id', 'member', 'member__user__first_name', 'member__user__last_name', 'type', 'reason',
+            'amount', 'date', 'status', 'votes_for', 'votes_against', 'has_voted', 'version',
+        )
+        sanctions = []
+        async for row in queryset:
+            first_name = row.pop('member__user__first_name')
+            last_name = row.pop('member__user__last_name')
+            row['member_name'] = f"{first_name} {last_name}".strip()
+            sanctions.append(row)
+        return _json(sanctions)
@@ -7,11 +7,13 @@ from django.contrib.auth import get_user_model
 from django.db import transaction
 from ..models import Member
 from ..services.email_service import EmailVerificationService
+from ..services.prometheus_metrics import track_auth_event
 import logging
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+@track_auth_event('signup')
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def signup_view(request):
@@ -78,7 +80,7 @@ def signup_view(request):
                     'error': "Erreur lors de l'envoi de l'email de vérification. Veuillez réessayer."
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        logger.info(f"Nouvel utilisateur créé: {email}")
+        logger.info("Nouvel utilisateur créé: %s", email)
         
         return Response({
             'message': "Compte créé avec succès ! Un code de vérification a été envoyé à votre email.",
@@ -87,7 +89,7 @@ def signup_view(request):
         }, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        logger.error(f"Erreur lors de l'inscription: {str(e)}")
+        logger.error("Erreur lors de l'inscription: %s", e)
         return Response({
             'error': "Une erreur inattendue s'est produite. Veuillez réessayer."
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -139,7 +141,7 @@ def verify_email_view(request):
             # Envoyer l'email de bienvenue
             EmailVerificationService.send_welcome_email(user)
             
-            logger.info(f"Email vérifié pour l'utilisateur: {email}")
+            logger.info("Email vérifié pour l'utilisateur: %s", email)
             
             return Response({
                 'message': "Email vérifié avec succès ! Votre compte est maintenant actif.",
@@ -158,7 +160,7 @@ def verify_email_view(request):
             }, status=status.HTTP_400_BAD_REQUEST)
             
     except Exception as e:
-        logger.error(f"Erreur lors de la vérification: {str(e)}")
+        logger.error("Erreur lors de la vérification: %s", e)
         return Response({
             'error': "Une erreur inattendue s'est produite. Veuillez réessayer."
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -196,7 +198,7 @@ def resend_verification_code_view(request):
         email_sent = EmailVerificationService.send_verification_email(user)
         
         if email_sent:
-            logger.info(f"Nouveau code envoyé à: {email}")
+            logger.info("Nouveau code envoyé à: %s", email)
             return Response({
                 'message': "Un nouveau code de vérification a été envoyé à votre email."
             }, status=status.HTTP_200_OK)
@@ -206,7 +208,7 @@ def resend_verification_code_view(request):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
     except Exception as e:
-        logger.error(f"Erreur lors du renvoi du code: {str(e)}")
+        logger.error("Erreur lors du renvoi du code: %s", e)
         return Response({
             'error': "Une erreur inattendue s'est produite. Veuillez réessayer."
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,51 @@
+# backend/api/views/berry_rules_views.py
+"""
+Charte des points Berry exposée au frontend : il lit les règles au lieu de les
+dupliquer. La publication d'une nouvelle version est réservée à la gouvernance.
+"""
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..models import BerryRuleSet
+from ..permissions import RoleBasedPermission
+from ..serializers import BerryRuleSetSerializer
+from ..services.berry_rules import berry_rules, publish_rule_set
+from .report_views import _parse_day
+
+
+def _default_rule_set_data():
+    return {**berry_rules.versions()[0].as_dict(), 'description': "Charte d'origine", 'created_at': None}
+
+
+class BerryRuleSetListAPIView(APIView):
+    """
+    GET /api/berry-rules/ : charte d'origine puis versions publiées, par date d'effet.
+    POST /api/berry-rules/ {"effective_from", "due_day", "rules", "description"} : publie une version.
+    """
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': None, 'POST': 'manage_governance'}
+
+    def get(self, request):
+        published = BerryRuleSetSerializer(BerryRuleSet.objects.order_by('effective_from', 'version'), many=True).data
+        return Response([_default_rule_set_data(), *published])
+
+    def post(self, request):
+        serializer = BerryRuleSetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rule_set = publish_rule_set(user=request.user, **serializer.validated_data)
+        return Response(BerryRuleSetSerializer(rule_set).data, status=status.HTTP_201_CREATED)
+
+
+class CurrentBerryRuleSetAPIView(APIView):
+    """GET /api/berry-rules/current/?date=AAAA-MM-JJ : règles en vigueur à la date (aujourd'hui par défaut)."""
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': None}
+
+    def get(self, request):
+        day = _parse_day(request.query_params.get('date'), 'date') or timezone.localdate()
+        rule_set = berry_rules.for_date(day)
+        if rule_set.version == 0:
+            return Response(_default_rule_set_data())
+        return Response(rule_set.as_dict())
@@ -0,0 +1,87 @@
+# backend/api/views/event_views.py
+from django.conf import settings
+from django.core import signing
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from ..permissions import RoleBasedPermission
+from ..services.event_broadcaster import broadcaster
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Commentaire SSE envoyé régulièrement pour garder la connexion ouverte derrière les proxys
+KEEPALIVE_SECONDS = 15
+# Un ticket ne sert qu'à ouvrir le flux d'événements
+EVENT_TICKET_SALT = 'api.event-stream'
+
+
+class EventTicketAPIView(APIView):
+    """
+    POST /api/events/ticket/ : ticket d'accès au flux d'événements.
+
+    EventSource ne permet pas d'en-têtes : le navigateur passe ce ticket en
+    ?ticket= plutôt que son jeton d'accès, qui finirait dans les journaux des
+    proxys. Le ticket n'ouvre que le flux et expire après EVENT_TICKET_TTL_SECONDS.
+    """
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'POST': None}
+
+    def post(self, request):
+        ticket = signing.dumps({'user_id': request.user.pk}, salt=EVENT_TICKET_SALT)
+        return Response({'ticket': ticket, 'expires_in': settings.EVENT_TICKET_TTL_SECONDS})
+
+
+def _authenticate(request):
+    """Vrai si la requête porte un jeton d'accès (en-tête) ou un ticket de flux valides."""
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Bearer '):
+        try:
+            # Validation de la signature uniquement, sans requête en base
+            JWTAuthentication().get_validated_token(header[len('Bearer '):])
+        except InvalidToken:
+            return False
+        return True
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        return False
+    try:
+        signing.loads(ticket, salt=EVENT_TICKET_SALT, max_age=settings.EVENT_TICKET_TTL_SECONDS)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+@require_GET
+async def event_stream_view(request):
+    """
+    Flux Server-Sent Events des mises à jour en direct (votes, sanctions, fonds).
+
+    Vue asynchrone : elle doit être servie par le point d'entrée ASGI (uvicorn)
+    pour qu'une connexion ouverte n'immobilise pas un thread.
+    """
+    if not _authenticate(request):
+        return JsonResponse({'error': 'Jeton ou ticket invalide ou expiré.'}, status=401)
+
+    async def stream():
+        queue = broadcaster.subscribe()
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield message
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,85 @@
+# backend/api/views/export_views.py
+"""
+Téléchargement des exports (contributions, transactions, prêts, membres).
+Le fichier est produit au fil de l'eau par services/export_service.py.
+"""
+import itertools
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from ..permissions import RoleBasedPermission
+from ..services.export_service import EXPORT_DATASETS, ExportService
+
+# Nombre de morceaux produits par aller-retour vers le thread synchrone (ASGI)
+ASYNC_BATCH_SIZE = 64
+
+
+async def _aiter_sync(iterator):
+    """
+    Sous ASGI, Django convertit un itérateur synchrone en liste avant l'envoi.
+    On le consomme donc par lots dans le thread de la requête (connexion DB
+    comprise) pour garder un vrai flux.
+    """
+    def next_batch():
+        return list(itertools.islice(iterator, ASYNC_BATCH_SIZE))
+
+    while batch := await sync_to_async(next_batch)():
+        for chunk in batch:
+            yield chunk
+
+
+class ExportAPIView(APIView):
+    """
+    GET /api/exports/<jeu>.<format>
+    Filtres optionnels : member, date_from, date_to (AAAA-MM-JJ).
+    """
+    permission_classes = [RoleBasedPermission]
+
+    @property
+    def required_permissions(self):
+        return {'GET': EXPORT_DATASETS[self.kwargs['dataset']].permission}
+
+    def perform_content_negotiation(self, request, force=False):
+        # Le fichier n'est pas rendu par DRF : on accepte tout en-tête Accept
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, dataset, file_format):
+        export = EXPORT_DATASETS[dataset]
+        rows = export.rows(**self._filters(request, export))
+        chunks = ExportService.render(file_format, export.title, export.headers, rows)
+        if isinstance(request._request, ASGIRequest):
+            chunks = _aiter_sync(chunks)
+
+        filename = f"{dataset}_{timezone.localdate().isoformat()}.{file_format}"
+        response = StreamingHttpResponse(chunks, content_type=ExportService.CONTENT_TYPES[file_format])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def _filters(request, export):
+        filters = {}
+        member = request.query_params.get('member')
+        if member:
+            if not member.isdigit():
+                raise ValidationError({'member': 'Identifiant de membre invalide.'})
+            filters['member_id'] = int(member)
+        for name in ('date_from', 'date_to'):
+            value = request.query_params.get(name)
+            if not value:
+                continue
+            if export.date_field is None:
+                raise ValidationError({name: "Cet export n'est pas filtrable par date."})
+            try:
+                parsed = parse_date(value)
+            except ValueError:
+                parsed = None
+            if parsed is None:
+                raise ValidationError({name: 'Date invalide (format AAAA-MM-JJ).'})
+            filters[name] = parsed
+        return filters
@@ -2,20 +2,27 @@
 
 from rest_framework import generics, status, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
-from rest_framework.permissions import IsAuthenticated
+from ..permissions import RoleBasedPermission, required_permissions
+from ..concurrency import PreconditionFailed, VersionedObjectMixin, expected_version, format_etag
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from django.db.models import Sum
 from django.utils import timezone
-from ..models import Member, Contribution, LoanRequest, Committee, TransactionLog, Sanction, SanctionVote, Meeting, Vote, VoteRecord
+from ..models import Member, Contribution, LoanRequest, Committee, TransactionLog, Sanction, Meeting, Vote, StaleVersionError
 from ..serializers import (
     UserSerializer, MemberSerializer, ContributionSerializer, 
     LoanRequestSerializer, CommitteeSerializer, TransactionLogSerializer,
     UserProfileSerializer, ChangePasswordSerializer, SanctionSerializer,
     SanctionVoteSerializer,  MeetingSerializer, VoteSerializer
 )
+from ..services.vote_service import VoteCastingService
+from ..services.period_close_service import PeriodCloseError, PeriodCloseService, is_period_closed
+from ..services.event_broadcaster import broadcaster
+from ..services.idempotency_service import idempotent
+from ..services.statement_service import month_bounds
 import logging
 import secrets
 import string
@@ -23,6 +30,34 @@ import string
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+def _parse_pk(pk):
+    """Convertit l'identifiant d'URL en entier (None si invalide, ce qui donne un 404)."""
+    try:
+        return int(pk)
+    except (TypeError, ValueError):
+        return None
+
+def _publish_fund_delta(old=None, new=None):
+    """
+    Diffuse la variation des statistiques du fonds après une écriture de contribution.
+    `old` et `new` sont des couples (montant, date) avant/après l'écriture.
+    """
+    today = timezone.now().date()
+    total_delta = 0
+    monthly_delta = 0
+    for entry, sign in ((old, -1), (new, 1)):
+        if entry is None:
+            continue
+        amount, date = entry
+        total_delta += sign * amount
+        if date.year == today.year and date.month == today.month:
+            monthly_delta += sign * amount
+    if total_delta or monthly_delta:
+        broadcaster.publish_on_commit('fund.stats', {
+            'total_fund_delta': total_delta,
+            'monthly_contributions_delta': monthly_delta,
+        })
+
 def generate_password(length=8):
     """Génère un mot de passe aléatoirement"""
     characters = string.ascii_letters + string.digits
@@ -30,7 +65,8 @@ def generate_password(length=8):
 
 # NOUVELLES VUES POUR LE PROFIL UTILISATEUR
 class UserProfileAPIView(APIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': None, 'PUT': None}
     
     def get(self, request):
         """Récupérer le profil de l'utilisateur connecté"""
@@ -48,7 +84,7 @@ class UserProfileAPIView(APIView):
             return Response(profile_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération du profil: {str(e)}")
+            logger.error("Erreur lors de la récupération du profil: %s", e)
             return Response(
                 {'message': 'Erreur lors de la récupération du profil'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -73,14 +109,15 @@ class UserProfileAPIView(APIView):
                 )
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la mise à jour du profil: {str(e)}")
+            logger.error("Erreur lors de la mise à jour du profil: %s", e)
             return Response(
                 {'message': 'Erreur lors de la mise à jour du profil'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 class ChangePasswordAPIView(APIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'PUT': None}
     
     def put(self, request):
         """Changer le mot de passe de l'utilisateur connecté"""
@@ -109,14 +146,15 @@ class ChangePasswordAPIView(APIView):
                 )
                 
         except Exception as e:
-            logger.error(f"Erreur lors du changement de mot de passe: {str(e)}")
+            logger.error("Erreur lors du changement de mot de passe: %s", e)
             return Response(
                 {'message': 'Erreur lors du changement de mot de passe'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 class DashboardStatsAPIView(APIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': None}
 
     def get(self, request):
         try:
@@ -124,8 +162,9 @@ class DashboardStatsAPIView(APIView):
             
             today = timezone.now().date()
             total_fund_result = Contribution.objects.aggregate(total=Sum('amount'))
+            # Plage de dates (et non date__month) : lecture par l'index sur la date
             monthly_contributions_result = Contribution.objects.filter(
-                date__year=today.year, date__month=today.month
+                date__range=month_bounds(today)
             ).aggregate(total=Sum('amount'))
 
             fund_status = {
@@ -140,7 +179,7 @@ class DashboardStatsAPIView(APIView):
             # Si l'utilisateur n'est PAS un superuser, on essaie de trouver son profil membre
             if not user.is_superuser:
                 try:
-                    member = Member.objects.get(user=user)
+                    member = Member.objects.get(user_id=user.pk)
                     berry_points = member.berry_score
                 except Member.DoesNotExist:
                     # C'est normal si c'est un 'guest' par exemple
@@ -153,26 +192,29 @@ class DashboardStatsAPIView(APIView):
             return Response(data, status=status.HTTP_200_OK)
         
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des stats du dashboard: {str(e)}")
+            logger.error("Erreur lors de la récupération des stats du dashboard: %s", e)
             return Response({'error': 'Erreur interne du serveur.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 # Classes de vues existantes pour les APIs REST
 class UserListCreateAPIView(generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'system_admin', 'POST': 'system_admin'}
 
 # NOUVELLE VERSION AVEC DÉTAIL, MISE À JOUR ET SUPPRESSION
 class MemberListCreateAPIView(generics.ListCreateAPIView):
     queryset = Member.objects.select_related('user').all()
     serializer_class = MemberSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_members', 'POST': 'create_members'}
 
-class MemberDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class MemberDetailAPIView(VersionedObjectMixin, generics.RetrieveUpdateDestroyAPIView):
     """NOUVEAU: Vue pour récupérer, modifier et supprimer un membre spécifique"""
     queryset = Member.objects.all()
     serializer_class = MemberSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_members', 'PUT': 'edit_members', 'PATCH': 'edit_members', 'DELETE': 'delete_members'}
     
     def destroy(self, request, *args, **kwargs):
         """Suppression personnalisée d'un membre"""
@@ -184,7 +226,7 @@ class MemberDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             member.delete()
             user.delete()
             
-            logger.info(f"Membre {member.id} et utilisateur {user.username} supprimés avec succès")
+            logger.info("Membre %s et utilisateur %s supprimés avec succès", member.id, user.username)
             
             return Response(
                 {'message': 'Membre supprimé avec succès'}, 
@@ -192,7 +234,7 @@ class MemberDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             )
             
         except Exception as e:
-            logger.error(f"Erreur lors de la suppression du membre: {str(e)}")
+            logger.error("Erreur lors de la suppression du membre: %s", e)
             return Response(
                 {'error': 'Erreur lors de la suppression du membre'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -201,29 +243,42 @@ class MemberDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
 class ContributionListCreateAPIView(generics.ListCreateAPIView):
     queryset = Contribution.objects.all()
     serializer_class = ContributionSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_contributions', 'POST': 'add_contributions'}
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        contribution = serializer.save()
+        _publish_fund_delta(new=(contribution.amount, contribution.date))
 
 # ✅ CLASSE AJOUTÉE POUR CORRIGER L'ERREUR 404 DELETE CONTRIBUTIONS
 class ContributionDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     """Vue pour récupérer, modifier et supprimer une contribution spécifique"""
     queryset = Contribution.objects.all()
     serializer_class = ContributionSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_contributions', 'PUT': 'edit_contributions', 'PATCH': 'edit_contributions', 'DELETE': 'manage_contributions'}
     
     def destroy(self, request, *args, **kwargs):
         """Suppression personnalisée d'une contribution avec calcul des points Berry"""
         try:
             contribution = self.get_object()
-            member = contribution.member
-            
-            # Réajuster les points Berry du membre avant suppression
-            member.berry_score -= contribution.points_berry
-            member.save()
+
+            if is_period_closed(contribution.date):
+                return Response(
+                    {'error': f"Le mois {contribution.date:%Y-%m} est figé par une clôture."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
-            logger.info(f"Contribution {contribution.id} supprimée - {contribution.points_berry} points retirés du membre {member.id}")
+            # Contribution.delete retire les points Berry et met à jour les compteurs du membre
+            logger.info("Contribution %s supprimée - %s points retirés du membre %s", contribution.id, contribution.points_berry, contribution.member_id)
             
             # Supprimer la contribution
             contribution.delete()
+            _publish_fund_delta(old=(contribution.amount, contribution.date))
             
             return Response(
                 {'message': 'Contribution supprimée avec succès'}, 
@@ -231,7 +286,7 @@ class ContributionDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             )
             
         except Exception as e:
-            logger.error(f"Erreur lors de la suppression de la contribution: {str(e)}")
+            logger.error("Erreur lors de la suppression de la contribution: %s", e)
             return Response(
                 {'error': 'Erreur lors de la suppression de la contribution'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -242,70 +297,74 @@ class ContributionDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         try:
             partial = kwargs.pop('partial', False)
             contribution = self.get_object()
-            member = contribution.member
             
             # Sauvegarder les anciens points pour ajustement
             old_points = contribution.points_berry
+            old_entry = (contribution.amount, contribution.date)
             
             # Mettre à jour la contribution
             serializer = self.get_serializer(contribution, data=request.data, partial=partial)
             if serializer.is_valid():
                 updated_contribution = serializer.save()
                 
-                # Recalculer les points Berry si nécessaire
-                # TODO: Implémenter la logique de calcul des points Berry selon la charte
-                # Pour l'instant, on garde les points existants
-                
-                # Réajuster le score du membre
-                member.berry_score = member.berry_score - old_points + updated_contribution.points_berry
-                member.save()
-                
-                logger.info(f"Contribution {contribution.id} mise à jour - Points ajustés: {updated_contribution.points_berry - old_points}")
+                # Contribution.save recalcule les points Berry et reporte l'écart sur le membre
+                logger.info("Contribution %s mise à jour - Points ajustés: %s", contribution.id, updated_contribution.points_berry - old_points)
+                _publish_fund_delta(old=old_entry, new=(updated_contribution.amount, updated_contribution.date))
                 
                 return Response(serializer.data)
             else:
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la mise à jour de la contribution: {str(e)}")
+            logger.error("Erreur lors de la mise à jour de la contribution: %s", e)
             return Response(
                 {'error': 'Erreur lors de la mise à jour de la contribution'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
 class LoanRequestListCreateAPIView(generics.ListCreateAPIView):
-    queryset = LoanRequest.objects.all()
+    # Garants préchargés : une requête pour toute la liste au lieu d'une par prêt
+    queryset = LoanRequest.objects.prefetch_related('guarantors')
     serializer_class = LoanRequestSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_loans', 'POST': 'add_loan_requests'}
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
 
 # ✅ NOUVELLE CLASSE AJOUTÉE POUR CORRIGER L'ERREUR 404 PATCH LOAN-REQUESTS
-class LoanRequestDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+class LoanRequestDetailAPIView(VersionedObjectMixin, generics.RetrieveUpdateDestroyAPIView):
     """Vue pour récupérer, modifier et supprimer une demande de prêt spécifique"""
     queryset = LoanRequest.objects.all()
     serializer_class = LoanRequestSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_loans', 'PUT': 'approve_loans', 'PATCH': 'approve_loans', 'DELETE': 'manage_loans'}
     
     def update(self, request, *args, **kwargs):
         """Mise à jour personnalisée d'une demande de prêt (changement de statut principalement)"""
+        partial = kwargs.pop('partial', False)
+        # 404 et If-Match manquant (428) remontés tels quels
+        loan_request = self.get_object()
         try:
-            partial = kwargs.pop('partial', False)
-            loan_request = self.get_object()
-            
-            # Mettre à jour la demande de prêt
+            # Mettre à jour la demande de prêt (UPDATE conditionnel sur la version lue)
             serializer = self.get_serializer(loan_request, data=request.data, partial=partial)
             if serializer.is_valid():
                 updated_loan = serializer.save()
                 
                 # Log du changement de statut
                 if 'status' in request.data:
-                    logger.info(f"Demande de prêt {loan_request.id} - Statut changé vers: {updated_loan.status}")
+                    logger.info("Demande de prêt %s - Statut changé vers: %s", loan_request.id, updated_loan.status)
                 
                 return Response(serializer.data)
             else:
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
                 
+        except StaleVersionError:
+            # Un autre membre du comité a statué entre-temps
+            raise PreconditionFailed()
         except Exception as e:
-            logger.error(f"Erreur lors de la mise à jour de la demande de prêt: {str(e)}")
+            logger.error("Erreur lors de la mise à jour de la demande de prêt: %s", e)
             return Response(
                 {'error': 'Erreur lors de la mise à jour de la demande de prêt'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -323,7 +382,7 @@ class LoanRequestDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            logger.info(f"Demande de prêt {loan_request.id} supprimée")
+            logger.info("Demande de prêt %s supprimée", loan_request.id)
             
             # Supprimer la demande de prêt
             loan_request.delete()
@@ -334,7 +393,7 @@ class LoanRequestDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             )
             
         except Exception as e:
-            logger.error(f"Erreur lors de la suppression de la demande de prêt: {str(e)}")
+            logger.error("Erreur lors de la suppression de la demande de prêt: %s", e)
             return Response(
                 {'error': 'Erreur lors de la suppression de la demande de prêt'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -343,14 +402,16 @@ class LoanRequestDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
 class CommitteeListCreateAPIView(generics.ListCreateAPIView):
     queryset = Committee.objects.all()
     serializer_class = CommitteeSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_governance', 'POST': 'manage_governance'}
 
 class TransactionLogListCreateAPIView(generics.ListCreateAPIView):
     queryset = TransactionLog.objects.all()
     serializer_class = TransactionLogSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports', 'POST': 'add_repayments'}
 
-class SanctionViewSet(viewsets.ModelViewSet):
+class SanctionViewSet(VersionedObjectMixin, viewsets.ModelViewSet):
     """
     ViewSet pour gérer les sanctions.
     - list: Récupère la liste de toutes les sanctions.
@@ -360,80 +421,109 @@ class SanctionViewSet(viewsets.ModelViewSet):
     """
     queryset = Sanction.objects.all().order_by('-date')
     serializer_class = SanctionSerializer
-    permission_classes = [IsAuthenticated] # Vous pouvez affiner avec vos permissions custom
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {
+        'list': 'view_sanctions', 'retrieve': 'view_sanctions',
+        'create': 'manage_sanctions', 'update': 'manage_sanctions', 'partial_update': 'manage_sanctions', 'destroy': 'manage_sanctions',
+        'vote': 'participate_in_votes',
+    }
+
+    def perform_create(self, serializer):
+        sanction = serializer.save()
+        broadcaster.publish_on_commit('sanction.created', {
+            'id': sanction.id,
+            'member': sanction.member_id,
+            'member_name': sanction.member.user.get_full_name(),
+            'type': sanction.type,
+            'reason': sanction.reason,
+            'date': sanction.date,
+            'status': sanction.status,
+        })
 
     @action(detail=True, methods=['post'], url_path='vote')
     def vote(self, request, pk=None):
-        sanction = self.get_object()
         user = request.user
 
-        # Vérifier si l'utilisateur a le droit de voter (à affiner selon vos règles)
-        # Par ex: if not user.has_perm('api.can_vote_on_sanction'):
-        # ...
+        serializer = SanctionVoteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Vérifier si la sanction est toujours en cours de vote
-        if sanction.status != 'Vote en cours':
+        # Insertion unique : statut et doublon sont vérifiés par la même requête
+        outcome = VoteCastingService.cast_sanction_vote(_parse_pk(pk), user, serializer.validated_data['vote'])
+        if outcome == VoteCastingService.NOT_FOUND:
+            return Response({'error': 'Sanction non trouvée.'}, status=status.HTTP_404_NOT_FOUND)
+        if outcome == VoteCastingService.CLOSED:
             return Response(
                 {'error': 'Le vote pour cette sanction est clos.'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Vérifier si l'utilisateur a déjà voté
-        if SanctionVote.objects.filter(sanction=sanction, voter=user).exists():
+        if outcome == VoteCastingService.DUPLICATE:
             return Response(
                 {'error': 'Vous avez déjà voté pour cette sanction.'}, 
-                status=status.HTTP_400_BAD_REQUEST
+                status=status.HTTP_409_CONFLICT
             )
 
-        serializer = SanctionVoteSerializer(data=request.data)
-        if serializer.is_valid():
-            SanctionVote.objects.create(
-                sanction=sanction,
-                voter=user,
-                vote=serializer.validated_data['vote']
-            )
-            logger.info(f"Vote de '{user.username}' enregistré pour la sanction #{sanction.id}")
-            return Response({'status': 'Vote enregistré'}, status=status.HTTP_200_OK)
-        else:
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        logger.info("Vote de l'utilisateur #%s enregistré pour la sanction #%s", user.pk, pk)
+        broadcaster.publish_on_commit('vote.tally', {'kind': 'sanction', 'id': int(pk), 'choice': serializer.validated_data['vote']})
+        return Response({'status': 'Vote enregistré'}, status=status.HTTP_200_OK)
 
 class MeetingViewSet(viewsets.ModelViewSet):
     """ViewSet pour lister et créer des réunions."""
     queryset = Meeting.objects.all().order_by('-date', '-time')
     serializer_class = MeetingSerializer
-    permission_classes = [IsAuthenticated] # À affiner
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {
+        'list': 'view_governance', 'retrieve': 'view_governance',
+        'create': 'organize_sessions', 'update': 'organize_sessions', 'partial_update': 'organize_sessions', 'destroy': 'organize_sessions',
+        'close_period': 'organize_sessions',
+    }
+
+    @action(detail=True, methods=['post'], url_path='close-period')
+    def close_period(self, request, pk=None):
+        """Réunion de 'Clôture' : fige les chiffres du mois de la réunion."""
+        meeting = self.get_object()
+        try:
+            period_close = PeriodCloseService.close_period(meeting, user=request.user)
+        except PeriodCloseError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info("Mois %s clôturé par l'utilisateur #%s (réunion #%s)", period_close.period, request.user.pk, meeting.id)
+        return Response(PeriodCloseService.period_report(period_close.period), status=status.HTTP_201_CREATED)
 
-class VoteViewSet(viewsets.ModelViewSet):
+class VoteViewSet(VersionedObjectMixin, viewsets.ModelViewSet):
     """ViewSet pour gérer les propositions de vote."""
     queryset = Vote.objects.all().order_by('-created_at')
     serializer_class = VoteSerializer
-    permission_classes = [IsAuthenticated] # À affiner
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {
+        'list': 'view_governance', 'retrieve': 'view_governance',
+        'create': 'manage_governance', 'update': 'manage_governance', 'partial_update': 'manage_governance', 'destroy': 'manage_governance',
+        'vote': 'participate_in_votes',
+    }
 
     @action(detail=True, methods=['post'], url_path='vote')
     def vote(self, request, pk=None):
-        vote_proposal = self.get_object()
         user = request.user
 
-        if vote_proposal.status != 'En cours':
-            return Response({'error': 'Ce vote est clos.'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        if VoteRecord.objects.filter(vote_proposal=vote_proposal, voter=user).exists():
-            return Response({'error': 'Vous avez déjà voté.'}, status=status.HTTP_400_BAD_REQUEST)
-
         choice = request.data.get('vote')
         if choice not in ['for', 'against']:
             return Response({'error': 'Vote invalide. Choisissez "for" ou "against".'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        VoteRecord.objects.create(
-            vote_proposal=vote_proposal,
-            voter=user,
-            choice=choice
-        )
-        logger.info(f"Vote de '{user.username}' enregistré pour la proposition #{vote_proposal.id}")
+
+        outcome = VoteCastingService.cast_proposal_vote(_parse_pk(pk), user, choice)
+        if outcome == VoteCastingService.NOT_FOUND:
+            return Response({'error': 'Vote non trouvé.'}, status=status.HTTP_404_NOT_FOUND)
+        if outcome == VoteCastingService.CLOSED:
+            return Response({'error': 'Ce vote est clos.'}, status=status.HTTP_400_BAD_REQUEST)
+        if outcome == VoteCastingService.DUPLICATE:
+            return Response({'error': 'Vous avez déjà voté.'}, status=status.HTTP_409_CONFLICT)
+
+        logger.info("Vote de l'utilisateur #%s enregistré pour la proposition #%s", user.pk, pk)
+        broadcaster.publish_on_commit('vote.tally', {'kind': 'vote', 'id': int(pk), 'choice': choice})
         return Response({'status': 'Vote enregistré'}, status=status.HTTP_200_OK)
 
 class BerryScoreAPIView(APIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_members'}
     
     def get(self, request, member_id):
         try:
@@ -450,18 +540,13 @@ class BerryScoreAPIView(APIView):
             )
 
 # Vues fonctionnelles existantes
+@required_permissions({'POST': 'create_members'})
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([RoleBasedPermission])
+@idempotent(redact=('generated_password',))
 def create_member_with_credentials(request):
     """Crée un nouveau membre et envoie automatiquement les identifiants"""
     try:
-        # Vérifier les permissions
-        if not request.user.has_perm('api.add_member'):
-            return Response(
-                {'error': 'Permission denied'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
         data = request.data
         email = data.get('email', '').lower().strip()
         
@@ -526,29 +611,24 @@ def create_member_with_credentials(request):
             'errors': notification_results['errors']
         }
         
-        logger.info(f"Nouveau membre créé: {email} avec mot de passe: {password}")
+        logger.info("Nouveau membre créé: %s (membre #%s)", email, member.id)
         
         return Response(response_data, status=status.HTTP_201_CREATED)
             
     except Exception as e:
-        logger.error(f"Erreur lors de la création du membre: {str(e)}")
+        logger.error("Erreur lors de la création du membre: %s", e)
         return Response(
             {'error': 'Erreur interne du serveur'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@required_permissions({'PUT': 'edit_members'})
 @api_view(['PUT'])
-@permission_classes([IsAuthenticated])
+@permission_classes([RoleBasedPermission])
 def update_member_role(request, member_id):
     """Mettre à jour les informations d'un membre (nom, prénom, rôle)"""
+    version = expected_version(request)
     try:
-        # Vérifier les permissions
-        if not request.user.has_perm('api.change_member'):
-            return Response(
-                {'error': 'Permission denied'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
         member = Member.objects.get(id=member_id)
         user = member.user
         data = request.data
@@ -561,32 +641,41 @@ def update_member_role(request, member_id):
         if 'role' in data:
             user.role = data['role']
         
-        user.save()
+        with transaction.atomic():
+            # UPDATE conditionnel de la version du membre, puis écriture de l'utilisateur
+            member.expected_version = version
+            member.save(update_fields=['version'])
+            user.save()
         
         # Retourner les données mises à jour
         serializer = MemberSerializer(member)
         
-        logger.info(f"Membre {member.id} mis à jour: {user.first_name} {user.last_name} - Rôle: {user.role}")
+        logger.info("Membre %s mis à jour: %s %s - Rôle: %s", member.id, user.first_name, user.last_name, user.role)
         
-        return Response({
+        response = Response({
             'message': 'Membre mis à jour avec succès',
             'member': serializer.data
         }, status=status.HTTP_200_OK)
+        response['ETag'] = format_etag(member.version)
+        return response
         
     except Member.DoesNotExist:
         return Response(
             {'error': 'Membre non trouvé'}, 
             status=status.HTTP_404_NOT_FOUND
         )
+    except StaleVersionError:
+        raise PreconditionFailed()
     except Exception as e:
-        logger.error(f"Erreur lors de la mise à jour du membre: {str(e)}")
+        logger.error("Erreur lors de la mise à jour du membre: %s", e)
         return Response(
             {'error': 'Erreur interne du serveur'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@required_permissions({'POST': 'create_members'})
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@permission_classes([RoleBasedPermission])
 def resend_member_credentials(request, member_id):
     """Renvoie les identifiants d'un membre existant"""
     try:
@@ -631,7 +720,7 @@ def resend_member_credentials(request, member_id):
             status=status.HTTP_404_NOT_FOUND
         )
     except Exception as e:
-        logger.error(f"Erreur lors du renvoi des identifiants: {str(e)}")
+        logger.error("Erreur lors du renvoi des identifiants: %s", e)
         return Response(
             {'error': 'Erreur interne du serveur'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -0,0 +1,26 @@
+# backend/api/views/metrics_views.py
+"""
+GET /metrics : métriques Prometheus (services/prometheus_metrics.py).
+Le scrape doit envoyer `Authorization: Bearer <METRICS_TOKEN>`. Sans jeton
+configuré, l'endpoint n'existe qu'avec DEBUG (404 sinon) : les indicateurs
+métier (prêts en attente, membres...) ne sont jamais publics en production.
+"""
+import secrets
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from ..services.prometheus_metrics import render_latest
+
+
+@require_GET
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    elif not secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(render_latest(), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,167 @@
+# backend/api/views/report_views.py
+"""
+Rapports historiques : lus dans les clôtures mensuelles quand elles existent,
+calculés uniquement pour les mois encore ouverts. Balance et relevés de compte
+du journal en partie double. Évaluations des parts et simulation de distribution.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..permissions import RoleBasedPermission
+from ..models import LedgerAccount, MemberShareValuation, ShareValuation
+from ..services.ledger_service import LedgerService
+from ..services.period_close_service import PeriodCloseService
+from ..services.share_valuation_service import ShareValuationError, ShareValuationService
+from ..services.statement_service import parse_period
+
+# Borne la plage de l'historique (chaque mois ouvert est calculé)
+MAX_HISTORY_MONTHS = 36
+# Évaluations listées (les plus récentes)
+MAX_VALUATIONS_LISTED = 36
+VALUATION_FIELDS = (
+    'id', 'as_of', 'period_close_id', 'created_at', 'total_contributions', 'interest_earned', 'penalties',
+    'fund_value', 'total_shares', 'share_value', 'member_count',
+)
+
+
+def _parse_month(value, name):
+    try:
+        return parse_period(value)
+    except (AttributeError, ValueError):
+        raise ValidationError({name: 'Mois invalide (format AAAA-MM).'})
+
+
+def _parse_day(value, name):
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({name: 'Date invalide (format AAAA-MM-JJ).'})
+    return day
+
+
+class PeriodReportAPIView(APIView):
+    """GET /api/reports/periods/<AAAA-MM>/ : totaux du fonds et situation de chaque membre."""
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports'}
+
+    def get(self, request, period):
+        return Response(PeriodCloseService.period_report(_parse_month(period, 'period')))
+
+
+class FundHistoryAPIView(APIView):
+    """GET /api/reports/fund-history/?from=AAAA-MM&to=AAAA-MM : totaux mensuels du fonds."""
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports'}
+
+    def get(self, request):
+        today = timezone.localdate()
+        last = _parse_month(request.query_params.get('to', f'{today:%Y-%m}'), 'to')
+        first = _parse_month(request.query_params.get('from', f'{today.year - 1}-{today.month:02d}'), 'from')
+        if (last.year - first.year) * 12 + last.month - first.month >= MAX_HISTORY_MONTHS:
+            raise ValidationError({'from': f'Plage limitée à {MAX_HISTORY_MONTHS} mois.'})
+        return Response(PeriodCloseService.fund_history(first, last))
+
+
+class TrialBalanceAPIView(APIView):
+    """GET /api/ledger/trial-balance/?as_of=AAAA-MM-JJ : balance des comptes du journal."""
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports'}
+
+    def get(self, request):
+        return Response(LedgerService.trial_balance(as_of=_parse_day(request.query_params.get('as_of'), 'as_of')))
+
+
+class AccountStatementAPIView(APIView):
+    """GET /api/ledger/accounts/<code>/statement/?from=&to=&member= : lignes d'un compte avec solde courant."""
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports'}
+
+    def get(self, request, code):
+        member = request.query_params.get('member')
+        if member and not member.isdigit():
+            raise ValidationError({'member': 'Identifiant de membre invalide.'})
+        try:
+            statement = LedgerService.account_statement(
+                code,
+                start=_parse_day(request.query_params.get('from'), 'from'),
+                end=_parse_day(request.query_params.get('to'), 'to'),
+                member_id=int(member) if member else None,
+            )
+        except LedgerAccount.DoesNotExist:
+            raise NotFound('Compte inconnu.')
+        return Response(statement)
+
+
+class ShareValuationListAPIView(APIView):
+    """
+    GET /api/shares/valuations/ : historique des évaluations des parts.
+    POST /api/shares/valuations/ {"as_of": "AAAA-MM-JJ"} : évalue maintenant (défaut : aujourd'hui).
+    """
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports', 'POST': 'manage_contributions'}
+
+    def get(self, request):
+        return Response(list(
+            ShareValuation.objects.order_by('-as_of', '-id').values(*VALUATION_FIELDS)[:MAX_VALUATIONS_LISTED]
+        ))
+
+    def post(self, request):
+        valuation = ShareValuationService.value(as_of=_parse_day(request.data.get('as_of'), 'as_of'), user=request.user)
+        return Response(
+            ShareValuation.objects.values(*VALUATION_FIELDS).get(pk=valuation.pk), status=status.HTTP_201_CREATED,
+        )
+
+
+class ShareValuationDetailAPIView(APIView):
+    """GET /api/shares/valuations/<id>/ : totaux et part de chaque membre."""
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports'}
+
+    def get(self, request, pk):
+        valuation = ShareValuation.objects.filter(pk=pk).values(*VALUATION_FIELDS).first()
+        if valuation is None:
+            raise NotFound('Évaluation inconnue.')
+        valuation['members'] = list(
+            MemberShareValuation.objects.filter(valuation_id=pk)
+            .order_by('member_id').values('member_id', 'contributions', 'shares', 'income', 'value')
+        )
+        return Response(valuation)
+
+
+class PayoutSimulationAPIView(APIView):
+    """
+    GET /api/shares/payout-simulation/?amount=X[&valuation=id] : montant reçu par
+    chaque membre si X est distribué, selon la dernière évaluation (ou celle indiquée).
+    """
+    permission_classes = [RoleBasedPermission]
+    required_permissions = {'GET': 'view_reports'}
+
+    def get(self, request):
+        try:
+            amount = Decimal(request.query_params.get('amount', ''))
+        except InvalidOperation:
+            amount = None
+        if amount is None or not amount.is_finite():
+            raise ValidationError({'amount': 'Montant invalide.'})
+        valuation = None
+        valuation_id = request.query_params.get('valuation')
+        if valuation_id:
+            if not valuation_id.isdigit():
+                raise ValidationError({'valuation': "Identifiant d'évaluation invalide."})
+            valuation = ShareValuation.objects.filter(pk=int(valuation_id)).first()
+            if valuation is None:
+                raise NotFound('Évaluation inconnue.')
+        try:
+            return Response(ShareValuationService.simulate_payout(amount, valuation=valuation))
+        except ShareValuationError as exc:
+            raise ValidationError({'amount': str(exc)})
@@ -0,0 +1,8 @@
+# backend/config/gunicorn.conf.py
+# Métriques Prometheus multiprocessus : les fichiers d'un worker arrêté sont
+# marqués pour ne plus compter dans les jauges « live ».
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
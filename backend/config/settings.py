@@ -36,6 +36,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Mesures par requête (SQL, rendu, latence) : en premier pour couvrir toute la chaîne
+    'api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     # Le middleware CORS doit être placé le plus haut possible, juste après WhiteNoise.
@@ -44,6 +46,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Lectures sur la réplique pour les méthodes sûres (sans effet si aucune réplique)
+    'api.db_routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -55,16 +59,61 @@ AUTH_USER_MODEL = 'api.User'
 
 
 # ==============================================================================
-# BASE DE DONNÉES (déjà parfaitement configurée pour la production)
+# BASE DE DONNÉES
 # ==============================================================================
 
+# Connexions : par défaut, une connexion persistante par thread, vérifiée avant
+# réutilisation (CONN_HEALTH_CHECKS : plus d'erreurs 500 après un redémarrage de la base).
+# PostgreSQL : DB_POOL_MAX_SIZE > 0 active le pool psycopg 3 (un pool par processus,
+# soit au plus workers × DB_POOL_MAX_SIZE connexions) ; DB_PGBOUNCER=True derrière
+# un pgbouncer en mode transaction.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # attente max d'une connexion libre (s)
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', 'False') == 'True'
+
+
+def database_config(config):
+    if config.get('ENGINE') == 'django.db.backends.postgresql':
+        if DB_POOL_MAX_SIZE:
+            # Le pool remplace les connexions persistantes ; il vérifie chaque connexion prêtée
+            config['CONN_MAX_AGE'] = 0
+            config.setdefault('OPTIONS', {})['pool'] = {
+                'min_size': min(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+                'max_size': DB_POOL_MAX_SIZE,
+                'timeout': DB_POOL_TIMEOUT,
+                'max_idle': 300,
+            }
+        elif DB_PGBOUNCER:
+            # Les curseurs serveur ne survivent pas au changement de connexion entre transactions
+            config['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return config
+
+
 DATABASES = {
-    'default': dj_database_url.config(
+    'default': database_config(dj_database_url.config(
         default=os.environ.get('DATABASE_URL'),
-        conn_max_age=600
-    )
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+    ))
 }
 
+# Réplique en lecture (optionnelle) : lectures des requêtes GET et des commandes de rapport
+# (api/db_routing.py). Deux bases SQLite locales suffisent pour l'essayer.
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = database_config(dj_database_url.parse(
+        os.environ['DATABASE_REPLICA_URL'], conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True,
+    ))
+    # En test, la « réplique » est la base de test principale
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['api.db_routing.PrimaryReplicaRouter']
+# Après une écriture, les requêtes de l'utilisateur lisent la principale pendant ce délai.
+# Avec plusieurs workers, la marque doit être dans un cache partagé (REPLICA_PIN_CACHE).
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+REPLICA_PIN_CACHE = 'default'
+
 # ==============================================================================
 # FICHIERS STATIQUES ET MÉDIA
 # ==============================================================================
@@ -91,13 +140,113 @@ CORS_ALLOW_CREDENTIALS = True
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT sans requête User par appel : rôle, membre et superuser sont lus dans le jeton
+        'api.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
-        'rest_framework.permissions.IsAuthenticated',
+        # Matrice rôle -> permissions (api/permissions.py), vérifiée sans requête en base
+        'api.permissions.RoleBasedPermission',
     ),
 }
 
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'api.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'api.serializers.ClaimsTokenRefreshSerializer',
+}
+
+# Budgets de requêtes SQL par méthode et nom d'URL (api/middleware.py). Un dépassement est
+# journalisé ; il fait échouer les tests (QueryBudgetTestRunner). Les budgets
+# comptent l'authentification (un ancien jeton sans claims coûte une requête).
+QUERY_BUDGETS = {
+    'GET member-list': 2,
+    'GET member-detail': 2,
+    'GET contribution-list': 1,
+    'GET loanrequest-list': 2,
+    'GET loanrequest-detail': 2,
+    'GET vote-list': 2,
+    'GET sanction-list': 2,
+    'GET dashboard-stats': 6,
+    'GET berry_score': 2,
+    'GET user-profile': 2,
+    'GET trial-balance': 2,
+    'GET period-report': 8,
+    'GET payout-simulation': 2,
+}
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'False') == 'True'
+
+# Validité d'un ticket du flux d'événements (POST /api/events/ticket/), en secondes : il
+# suffit à ouvrir la connexion, EventSource en redemande un à chaque reconnexion
+EVENT_TICKET_TTL_SECONDS = int(os.environ.get('EVENT_TICKET_TTL_SECONDS', 60))
+
+# Jeton exigé pour lire /metrics (vide : /metrics n'est servi qu'avec DEBUG)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+TEST_RUNNER = 'api.testing.QueryBudgetTestRunner'
+
+# Durée de conservation des réponses rejouables (en-tête Idempotency-Key), en secondes
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 24 * 3600))
+
+# Valeur nominale d'une part : Member.shares = contributions versées / SHARE_NOMINAL_VALUE
+SHARE_NOMINAL_VALUE = os.environ.get('SHARE_NOMINAL_VALUE', '5000')
+
+# Charte des points Berry (api/services/berry_rules.py). Jour d'échéance de la charte
+# d'origine : une version publiée (BerryRuleSet) porte le sien.
+CONTRIBUTION_DUE_DAY = int(os.environ.get('CONTRIBUTION_DUE_DAY', 25))
+# Délai maximal avant qu'un processus voie une version publiée par un autre
+BERRY_RULES_REFRESH_SECONDS = int(os.environ.get('BERRY_RULES_REFRESH_SECONDS', 60))
+
+# Pénalités (api/services/penalty_service.py, commande apply_penalties). Un montant ou
+# des points à 0 désactivent la partie correspondante de la règle.
+LATE_CONTRIBUTION_PENALTY = os.environ.get('LATE_CONTRIBUTION_PENALTY', '1000')
+# Le retard d'une contribution coûte déjà des points (Contribution.calculate_impact)
+LATE_CONTRIBUTION_BERRY_PENALTY = int(os.environ.get('LATE_CONTRIBUTION_BERRY_PENALTY', 0))
+OVERDUE_LOAN_PENALTY = os.environ.get('OVERDUE_LOAN_PENALTY', '2500')  # par mois de retard
+OVERDUE_LOAN_BERRY_PENALTY = int(os.environ.get('OVERDUE_LOAN_BERRY_PENALTY', 10))
+OVERDUE_LOAN_GRACE_DAYS = int(os.environ.get('OVERDUE_LOAN_GRACE_DAYS', 0))
+# La tâche planifiée apply_penalties ne remonte qu'au mois précédent, et jamais avant
+# cette date (AAAA-MM-JJ) ; l'historique se rattrape par la commande apply_penalties --since
+PENALTIES_START_DATE = os.environ.get('PENALTIES_START_DATE', '')
+
+# Rappels des contributions non versées (api/services/reminder_service.py) : envoyés à partir
+# de ce nombre de jours avant le jour d'échéance, et jusqu'à ce jour inclus
+CONTRIBUTION_REMINDER_DAYS_BEFORE = int(os.environ.get('CONTRIBUTION_REMINDER_DAYS_BEFORE', 1))
+# Connexions SMTP ouvertes en parallèle pour l'envoi des rappels
+REMINDER_SMTP_CONNECTIONS = int(os.environ.get('REMINDER_SMTP_CONNECTIONS', 4))
+# Durée maximale d'une passe d'envoi, en secondes : le reste part à la passe suivante
+REMINDER_TIME_BUDGET_SECONDS = int(os.environ.get('REMINDER_TIME_BUDGET_SECONDS', 600))
+# Au-delà, la réservation d'une passe arrêtée en plein envoi expire et ses rappels sont repris
+REMINDER_CLAIM_SECONDS = int(os.environ.get('REMINDER_CLAIM_SECONDS', 15 * 60))
+# Au-delà, un rappel en échec n'est plus retenté
+REMINDER_MAX_ATTEMPTS = int(os.environ.get('REMINDER_MAX_ATTEMPTS', 3))
+
+# Planificateur des tâches récurrentes (commande run_scheduler, api/services/scheduled_tasks.py)
+SCHEDULER_TICK_SECONDS = int(os.environ.get('SCHEDULER_TICK_SECONDS', 30))
+# Durée du verrou d'une tâche : passé ce délai, un autre worker peut la reprendre
+SCHEDULER_LOCK_SECONDS = int(os.environ.get('SCHEDULER_LOCK_SECONDS', 15 * 60))
+# Conservation de l'historique des exécutions (JobRun), en jours
+SCHEDULER_HISTORY_DAYS = int(os.environ.get('SCHEDULER_HISTORY_DAYS', 30))
+
+# Notifications WhatsApp et SMS (api/services/notification_channels.py) : fournisseur HTTP
+# appelé en POST JSON. Sans URL, le canal est désactivé.
+WHATSAPP_API_URL = os.environ.get('WHATSAPP_API_URL', '')
+WHATSAPP_API_TOKEN = os.environ.get('WHATSAPP_API_TOKEN', '')
+SMS_API_URL = os.environ.get('SMS_API_URL', '')
+SMS_API_TOKEN = os.environ.get('SMS_API_TOKEN', '')
+# En-tête d'idempotence du fournisseur (ex. 'Idempotency-Key'), vide s'il n'en a pas : sans lui,
+# une requête qui a pu être reçue (délai dépassé, 5xx) n'est pas renvoyée, pour éviter les doublons
+WHATSAPP_IDEMPOTENCY_HEADER = os.environ.get('WHATSAPP_IDEMPOTENCY_HEADER', '')
+SMS_IDEMPOTENCY_HEADER = os.environ.get('SMS_IDEMPOTENCY_HEADER', '')
+# Envois simultanés maximum par canal
+NOTIFICATION_CONCURRENCY = {
+    'email': int(os.environ.get('NOTIFICATION_EMAIL_CONCURRENCY', 4)),
+    'whatsapp': int(os.environ.get('NOTIFICATION_WHATSAPP_CONCURRENCY', 8)),
+    'sms': int(os.environ.get('NOTIFICATION_SMS_CONCURRENCY', 8)),
+}
+NOTIFICATION_HTTP_TIMEOUT = float(os.environ.get('NOTIFICATION_HTTP_TIMEOUT', 10))
+# Tentatives par notification ; le délai entre deux tentatives part de NOTIFICATION_RETRY_BACKOFF
+# secondes et double à chaque fois
+NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', 3))
+NOTIFICATION_RETRY_BACKOFF = float(os.environ.get('NOTIFICATION_RETRY_BACKOFF', 0.5))
+
 
 # ==============================================================================
 # CONFIGURATION DES EMAILS (identifiants lus depuis .env)
@@ -147,29 +296,35 @@ USE_TZ = True
 
 
 # ==============================================================================
-# LOGGING (déjà bien configuré)
+# LOGGING
 # ==============================================================================
+# Les threads de requête ne font que mettre en file (api/log_handlers.py) ;
+# l'écriture (console + fichier à rotation, en JSON) se fait dans un thread dédié.
+
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')  # 'text' pour une console lisible en développement
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
 
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
-    'formatters': {
-        'verbose': {'format': '{levelname} {asctime} {module}: {message}', 'style': '{'},
+    'filters': {
+        'redact_secrets': {'()': 'api.log_handlers.RedactionFilter'},
     },
     'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
-        },
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
+        'queue': {
+            'class': 'api.log_handlers.QueueLogHandler',
+            'filters': ['redact_secrets'],
             'filename': BASE_DIR / 'friendly_banks.log',
-            'formatter': 'verbose',
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
+            'console_format': LOG_FORMAT,
+            # Une ligne par requête HTTP (mesures) : fichier seulement
+            'console_exclude': ['api.requests'],
         },
     },
     'loggers': {
-        'django': {'handlers': ['console', 'file'], 'level': 'INFO', 'propagate': False},
-        'api': {'handlers': ['console', 'file'], 'level': 'INFO', 'propagate': False},
+        'django': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+        'api': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
     },
 }
\ No newline at end of file
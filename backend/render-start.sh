@@ -8,5 +8,15 @@ python manage.py migrate
 echo "Recalculating all Berry Points..."
 python manage.py recalculate_berry_points
 
-echo "Starting Gunicorn server..."
-gunicorn config.wsgi:application
\ No newline at end of file
+# Métriques Prometheus partagées entre workers : répertoire vidé à chaque démarrage
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/friendly_banks_metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Tâches planifiées (votes échus, rappels, pénalités...) : verrou en base, un seul démon
+# exécute chaque tâche même si plusieurs instances démarrent
+echo "Starting scheduler..."
+python manage.py run_scheduler &
+
+echo "Starting Gunicorn server (ASGI workers for the live events stream)..."
+gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker -c config/gunicorn.conf.py
\ No newline at end of file
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useMemo, ChangeEvent, InputHTMLAttributes, SelectHTMLAttributes, ReactNode } from 'react';
 import { useAuth, ApiMember } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
+import { postIdempotent } from '../utils/idempotency';
 
 // --- INTERFACES & CONSTANTES ---
 interface ApiContribution {
@@ -200,11 +201,12 @@ const Contributions: React.FC = () => {
         ? `${API_BASE_URL}/contributions/${editingContribution.id}/`
         : `${API_BASE_URL}/contributions/`;
 
-      const response = await fetch(url, {
+      const init = {
         method,
         headers: { 'Authorization': `Bearer ${user?.token}`, 'Content-Type': 'application/json' },
         body: JSON.stringify(currentContribution),
-      });
+      };
+      const response = editingContribution ? await fetch(url, init) : await postIdempotent(url, init);
 
       if (!response.ok) {
         const errorData = await response.json();
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, ReactNode } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { useNavigate, Link } from 'react-router-dom';
+import { useLiveEvents } from '../utils/liveEvents';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import {
   faUsers, faFileInvoiceDollar, faCalendarAlt, faClock,
@@ -32,6 +33,7 @@ const Dashboard: React.FC = () => {
   const [dashboardData, setDashboardData] = useState<DashboardData | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [refreshKey, setRefreshKey] = useState(0);
 
   // Mettre à jour l'heure
   useEffect(() => {
@@ -67,7 +69,20 @@ const Dashboard: React.FC = () => {
     };
 
     fetchDashboardData();
-  }, [user]);
+  }, [user, refreshKey]);
+
+  // Mises à jour en direct : on applique les variations au lieu de tout recharger
+  useLiveEvents(user?.token, {
+    'fund.stats': (delta) => setDashboardData(prev => prev && {
+      ...prev,
+      fund_status: {
+        ...prev.fund_status,
+        total_fund: Number(prev.fund_status.total_fund) + delta.total_fund_delta,
+        monthly_contributions: Number(prev.fund_status.monthly_contributions) + delta.monthly_contributions_delta,
+      },
+    }),
+    reconnect: () => setRefreshKey(key => key + 1),
+  });
 
   return (
     <>
@@ -93,7 +108,7 @@ const Dashboard: React.FC = () => {
       <section style={styles.quickActions}>
         <ActionCard icon={<FontAwesomeIcon icon={faPlus} />} title="Nouvelle Cotisation" onClick={() => navigate('/contributions')} />
         <ActionCard icon={<FontAwesomeIcon icon={faFileInvoiceDollar} />} title="Demande de Prêt" onClick={() => navigate('/loans')} />
-        {hasPermission('add_member') && (
+        {hasPermission('create_members') && (
           <ActionCard icon={<FontAwesomeIcon icon={faUsers} />} title="Ajouter un Membre" onClick={() => navigate('/members')} />
         )}
       </section>
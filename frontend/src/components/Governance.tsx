@@ -1,6 +1,7 @@
 import React, { useState, useEffect, ChangeEvent } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
+import { useLiveEvents } from '../utils/liveEvents';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faPlus, faCalendarAlt, faBook, faLandmark, faGavel, faHandshake, faUsers, faVoteYea } from '@fortawesome/free-solid-svg-icons';
 
@@ -132,6 +133,19 @@ const Governance: React.FC = () => {
     }
   }, [user?.token, hasPermission]);
 
+  // Les décomptes arrivent en direct : plus besoin de recharger toute la page
+  useLiveEvents(user?.token, {
+    'vote.tally': (event) => {
+      if (event.kind !== 'vote') return;
+      setVotes(prev => prev.map(v => v.id !== event.id ? v : {
+        ...v,
+        votes_for: v.votes_for + (event.choice === 'for' ? 1 : 0),
+        votes_against: v.votes_against + (event.choice === 'against' ? 1 : 0),
+      }));
+    },
+    reconnect: () => fetchData(),
+  });
+
 
   // --- GESTIONNAIRES D'ÉVÉNEMENTS ---
   const handleVote = async (voteId: number, choice: 'for' | 'against') => {
@@ -151,7 +165,8 @@ const Governance: React.FC = () => {
             const errData = await response.json();
             throw new Error(errData.error || 'Erreur lors du vote');
         }
-        await fetchData(); // Recharger les données pour refléter le vote
+        // Le décompte est mis à jour par le flux temps réel
+        setVotes(prev => prev.map(v => v.id === voteId ? { ...v, has_voted: true } : v));
         alert('Votre vote a été enregistré.');
     } catch (err) {
         alert(err instanceof Error ? err.message : 'Une erreur est survenue');
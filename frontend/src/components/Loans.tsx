@@ -3,6 +3,7 @@ import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faPlus, faCheck, faTimes, faMoneyBillWave, faHistory, faCalculator } from '@fortawesome/free-solid-svg-icons';
+import { postIdempotent } from '../utils/idempotency';
 
 // Ajoutez après les imports FontAwesome, avant le hook useWindowSize
 const safeFormatNumber = (value: number | undefined | null): string => {
@@ -36,6 +37,7 @@ interface ApiLoanRequest {
   repayment_due_date: string | null;
   guarantors: number[];
   guarantor_names: string[];
+  version: number; // renvoyée en If-Match pour statuer sur la demande
   
   // Champs calculés pour le remboursement
   total_amount_with_interest: number;
@@ -357,15 +359,23 @@ const Loans: React.FC = () => {
     }
 
     try {
+      const loan = loans.find(l => l.id === id);
       const response = await fetch(`${API_BASE_URL}/loan-requests/${id}/`, {
         method: 'PATCH',
         headers: {
           'Authorization': `Bearer ${user?.token}`,
           'Content-Type': 'application/json',
+          'If-Match': `"v${loan?.version}"`,
         },
         body: JSON.stringify({ status }),
       });
 
+      if (response.status === 412) {
+        // Un autre membre du comité a statué entre-temps
+        await fetchLoans();
+        alert('Cette demande a été modifiée entre-temps. La liste a été actualisée.');
+        return;
+      }
       if (!response.ok) {
         throw new Error('Erreur lors de la mise à jour du statut');
       }
@@ -407,8 +417,7 @@ const Loans: React.FC = () => {
         interest_rate: loanDetails.interestRate
       };
 
-      const response = await fetch(`${API_BASE_URL}/loan-requests/`, {
-        method: 'POST',
+      const response = await postIdempotent(`${API_BASE_URL}/loan-requests/`, {
         headers: {
           'Authorization': `Bearer ${user?.token}`,
           'Content-Type': 'application/json',
@@ -2,6 +2,7 @@ import React, { useState, useEffect, useMemo, ReactNode, InputHTMLAttributes, Se
 import { useAuth, ApiMember, Role } from '../context/AuthContext';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faPlus, faPen, faTrash, faRefresh } from '@fortawesome/free-solid-svg-icons';
+import { postIdempotent } from '../utils/idempotency';
 
 // --- HOOK POUR LA RESPONSIVITÉ ---
 const useWindowSize = () => {
@@ -22,6 +23,7 @@ interface MemberFormData {
   email: string;
   phone: string;
   role: string;
+  version?: number;
 }
 const MOBILE_BREAKPOINT = 1024;
 const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://127.0.0.1:8000/api';
@@ -66,7 +68,7 @@ const Members: React.FC = () => {
       if (!hasPermission('edit_members')) return alert("Permission refusée.");
       setEditingMember({
         id: member.id, firstName: member.user.first_name, lastName: member.user.last_name,
-        email: member.user.email, phone: '', role: member.user.role,
+        email: member.user.email, phone: '', role: member.user.role, version: member.version,
       });
     } else {
       if (!hasPermission('create_members')) return alert("Permission refusée.");
@@ -107,11 +109,18 @@ const Members: React.FC = () => {
         : `${API_BASE_URL}/members/create-with-credentials/`;
       const method = editingMember.id ? 'PUT' : 'POST';
 
-      const response = await fetch(url, {
+      const init = {
         method, headers: { 'Authorization': `Bearer ${user?.token}`, 'Content-Type': 'application/json' },
         body: JSON.stringify(editingMember),
-      });
+      };
+      const response = editingMember.id
+        ? await fetch(url, { ...init, headers: { ...init.headers, 'If-Match': `"v${editingMember.version}"` } })
+        : await postIdempotent(url, init);
 
+      if (response.status === 412) {
+        await fetchMembers();
+        throw new Error('Ce membre a été modifié entre-temps. Rechargez la fiche avant de réessayer.');
+      }
       if (!response.ok) {
         const errorData = await response.json();
         throw new Error(errorData.error || `Erreur lors de la sauvegarde`);
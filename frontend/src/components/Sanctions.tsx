@@ -1,6 +1,7 @@
 import React, { useState, useEffect, ChangeEvent, ReactNode, SelectHTMLAttributes, TextareaHTMLAttributes } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
+import { useLiveEvents } from '../utils/liveEvents';
 import { FontAwesomeIcon } from '@fortawesome/react-fontawesome';
 import { faGavel, faCheck, faTimes } from '@fortawesome/free-solid-svg-icons';
 
@@ -107,6 +108,23 @@ const Sanctions: React.FC = () => {
     }
   }, [user?.token, hasPermission]);
 
+  // Nouvelles sanctions et votes des autres membres reçus en direct
+  useLiveEvents(user?.token, {
+    'sanction.created': (event) => setSanctions(prev => prev.some(s => s.id === event.id) ? prev : [
+      { ...event, type: event.type as ApiSanction['type'], status: event.status as ApiSanction['status'], votes_for: 0, votes_against: 0, has_voted: false },
+      ...prev,
+    ]),
+    'vote.tally': (event) => {
+      if (event.kind !== 'sanction') return;
+      setSanctions(prev => prev.map(s => s.id !== event.id ? s : {
+        ...s,
+        votes_for: s.votes_for + (event.choice === 'for' ? 1 : 0),
+        votes_against: s.votes_against + (event.choice === 'against' ? 1 : 0),
+      }));
+    },
+    reconnect: () => fetchData(),
+  });
+
   // --- GESTIONNAIRES D'ÉVÉNEMENTS ---
   const handleVote = async (id: number, vote: 'for' | 'against') => {
     if (!hasPermission('participate_in_votes') && !hasPermission('manage_sanctions')) {
@@ -16,6 +16,7 @@ export interface ApiMember {
   };
   berry_score: number;
   shares: number;
+  version: number;
 }
 
 interface User {
@@ -54,6 +55,15 @@ const roleDisplayNames: Record<Role, string> = {
   accountant: 'Comptable', member: 'Membre', guest: 'Invité', admin: 'Administrateur'
 };
 
+const decodeTokenClaims = (token: string): { user_id: number; role: string } | null => {
+  try {
+    const payload = token.split('.')[1].replace(/-/g, '+').replace(/_/g, '/');
+    return JSON.parse(atob(payload));
+  } catch {
+    return null;
+  }
+};
+
 const AuthContext = createContext<AuthContextType | undefined>(undefined);
 
 export const AuthProvider = ({ children }: { children: ReactNode }) => {
@@ -106,19 +116,13 @@ export const AuthProvider = ({ children }: { children: ReactNode }) => {
       const accessToken = data.access;
       const refreshToken = data.refresh;
 
-      const userResponse = await fetch(`${API_BASE_URL}/users/`, {
-        headers: { 'Authorization': `Bearer ${accessToken}` },
-      });
-      
-      if (!userResponse.ok) return false;
-      
-      const users = await userResponse.json();
-      const userInfo = users.find((u: any) => u.username === username);
-      if (!userInfo) return false;
+      // Le rôle et l'identifiant sont portés par le jeton (claims) : /users/ est réservé aux admins
+      const claims = decodeTokenClaims(accessToken);
+      if (!claims) return false;
 
       const loggedInUser: User = {
-        id: userInfo.id, username: userInfo.username,
-        role: userInfo.role as Role, token: accessToken,
+        id: claims.user_id, username,
+        role: claims.role as Role, token: accessToken,
       };
 
       localStorage.setItem('friendlybanks_user', JSON.stringify(loggedInUser));
@@ -1,16 +1,56 @@
 /**
- * Utility functions for exporting data to PDF and Excel formats.
- * Placeholder implementations - to be integrated with actual data and UI.
+ * Exports PDF / Excel / CSV générés par le backend (/api/exports/<jeu>.<format>).
+ * Le serveur produit le fichier en flux : le navigateur ne télécharge plus
+ * les listes complètes pour les convertir lui-même.
  */
 
-export function exportToPDF(data: any, filename: string) {
-  // TODO: Implement PDF export using libraries like jsPDF or pdfmake
-  console.log(`Exporting data to PDF: ${filename}`);
-  // Example: jsPDF usage here
+const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://127.0.0.1:8000/api';
+
+export type ExportDataset = 'contributions' | 'transactions' | 'loans' | 'members';
+export type ExportFormat = 'csv' | 'xlsx' | 'pdf';
+
+export interface ExportFilters {
+  member?: number;
+  date_from?: string; // AAAA-MM-JJ
+  date_to?: string;
+}
+
+export async function downloadExport(
+  token: string,
+  dataset: ExportDataset,
+  format: ExportFormat,
+  filters: ExportFilters = {},
+): Promise<void> {
+  const params = new URLSearchParams();
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') params.append(key, String(value));
+  });
+  const query = params.toString();
+
+  const response = await fetch(`${API_BASE_URL}/exports/${dataset}.${format}${query ? `?${query}` : ''}`, {
+    headers: { 'Authorization': `Bearer ${token}` },
+  });
+  if (!response.ok) {
+    throw new Error(`Export impossible (${response.status})`);
+  }
+
+  const disposition = response.headers.get('Content-Disposition') || '';
+  const filename = /filename="([^"]+)"/.exec(disposition)?.[1] || `${dataset}.${format}`;
+
+  const url = URL.createObjectURL(await response.blob());
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = filename;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(url);
+}
+
+export function exportToPDF(token: string, dataset: ExportDataset, filters?: ExportFilters) {
+  return downloadExport(token, dataset, 'pdf', filters);
 }
 
-export function exportToExcel(data: any, filename: string) {
-  // TODO: Implement Excel export using libraries like SheetJS (xlsx)
-  console.log(`Exporting data to Excel: ${filename}`);
-  // Example: SheetJS usage here
+export function exportToExcel(token: string, dataset: ExportDataset, filters?: ExportFilters) {
+  return downloadExport(token, dataset, 'xlsx', filters);
 }
@@ -0,0 +1,29 @@
+/**
+ * Envoi des créations (contributions, prêts, membres) avec un en-tête
+ * Idempotency-Key : la même clé est réutilisée pour chaque nouvelle tentative,
+ * le serveur rejoue alors la première réponse au lieu de créer un doublon.
+ */
+
+const RETRY_DELAYS_MS = [500, 1500];
+
+export function newIdempotencyKey(): string {
+  if (typeof crypto !== 'undefined' && 'randomUUID' in crypto) {
+    return crypto.randomUUID();
+  }
+  return `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
+export async function postIdempotent(url: string, init: RequestInit): Promise<Response> {
+  const headers = new Headers(init.headers);
+  headers.set('Idempotency-Key', newIdempotencyKey());
+
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await fetch(url, { ...init, method: 'POST', headers });
+    } catch (error) {
+      // Erreur réseau uniquement : la requête a pu arriver, on renvoie avec la même clé
+      if (attempt >= RETRY_DELAYS_MS.length) throw error;
+      await new Promise(resolve => setTimeout(resolve, RETRY_DELAYS_MS[attempt]));
+    }
+  }
+}
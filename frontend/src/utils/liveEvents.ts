@@ -0,0 +1,115 @@
+import { useEffect, useRef } from 'react';
+
+const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://127.0.0.1:8000/api';
+
+/**
+ * Événements diffusés par le backend sur /api/events/ (Server-Sent Events).
+ */
+export interface VoteTallyEvent {
+  kind: 'vote' | 'sanction';
+  id: number;
+  choice: 'for' | 'against';
+}
+
+export interface SanctionCreatedEvent {
+  id: number;
+  member: number;
+  member_name: string;
+  type: string;
+  reason: string;
+  date: string;
+  status: string;
+}
+
+export interface FundStatsEvent {
+  total_fund_delta: number;
+  monthly_contributions_delta: number;
+}
+
+export interface LiveEventHandlers {
+  'vote.tally'?: (event: VoteTallyEvent) => void;
+  'sanction.created'?: (event: SanctionCreatedEvent) => void;
+  'fund.stats'?: (event: FundStatsEvent) => void;
+  // Appelé après une reconnexion : les événements manqués doivent être rechargés
+  reconnect?: () => void;
+}
+
+/**
+ * Ticket court du flux (POST /api/events/ticket/) : EventSource ne permet pas
+ * d'envoyer l'en-tête Authorization, et le jeton d'accès ne doit pas passer
+ * dans l'URL (il finirait dans les journaux des proxys).
+ */
+async function fetchEventTicket(token: string): Promise<string> {
+  const response = await fetch(`${API_BASE_URL}/events/ticket/`, {
+    method: 'POST',
+    headers: { 'Authorization': `Bearer ${token}` },
+  });
+  if (!response.ok) throw new Error(`Ticket refusé (${response.status})`);
+  return (await response.json()).ticket;
+}
+
+const RECONNECT_DELAY_MS = 5000;
+
+/**
+ * Abonne le composant au flux temps réel tant que `token` est défini.
+ * Le ticket expire vite : à chaque coupure, la connexion est rouverte avec un
+ * nouveau ticket (au lieu de la reconnexion automatique d'EventSource).
+ */
+export function useLiveEvents(token: string | undefined, handlers: LiveEventHandlers) {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+
+  useEffect(() => {
+    if (!token || typeof EventSource === 'undefined') return;
+
+    let source: EventSource | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+    let hasOpened = false;
+
+    const scheduleReconnect = () => {
+      if (!closed) retryTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+    };
+
+    const listen = (target: EventSource, name: 'vote.tally' | 'sanction.created' | 'fund.stats') => {
+      target.addEventListener(name, (event) => {
+        const handler = handlersRef.current[name] as ((data: any) => void) | undefined;
+        handler?.(JSON.parse((event as MessageEvent).data));
+      });
+    };
+
+    async function connect() {
+      let ticket: string;
+      try {
+        ticket = await fetchEventTicket(token as string);
+      } catch {
+        scheduleReconnect();
+        return;
+      }
+      if (closed) return;
+
+      const current = new EventSource(`${API_BASE_URL}/events/?ticket=${encodeURIComponent(ticket)}`);
+      source = current;
+      current.onopen = () => {
+        // Les événements manqués pendant la coupure doivent être rechargés
+        if (hasOpened) handlersRef.current.reconnect?.();
+        hasOpened = true;
+      };
+      current.onerror = () => {
+        current.close();
+        scheduleReconnect();
+      };
+      listen(current, 'vote.tally');
+      listen(current, 'sanction.created');
+      listen(current, 'fund.stats');
+    }
+
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      source?.close();
+    };
+  }, [token]);
+}